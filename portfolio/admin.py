@@ -1,8 +1,14 @@
 from django.contrib import admin
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.html import format_html
 from django import forms
 from .models import (Profile, Project, Book, Paper, BlogPost, ContactMessage, 
-                     SiteSettings, StudyNote, StudyChapter, AppointmentType, Appointment, Skill)
+                     SiteSettings, StudyNote, StudyChapter, AppointmentType, Appointment, Skill,
+                     OutboundEmail, ResponsiveImage, Tag, ProjectTechnology, BlogPostTag)
+from .exports import streaming_export
+from .images import queue_images
 
 
 class ProfileAdminForm(forms.ModelForm):
@@ -14,6 +20,19 @@ class ProfileAdminForm(forms.ModelForm):
         }
 
 
+class ExportActionsMixin:
+    """Admin actions streaming the selected rows as CSV or JSONL"""
+    actions = ['export_csv', 'export_jsonl']
+
+    @admin.action(description='Export selected as CSV')
+    def export_csv(self, request, queryset):
+        return streaming_export(queryset, 'csv')
+
+    @admin.action(description='Export selected as JSONL')
+    def export_jsonl(self, request, queryset):
+        return streaming_export(queryset, 'jsonl')
+
+
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
     list_display = ['name', 'category', 'proficiency_level', 'years_experience', 'is_featured', 'order']
@@ -64,9 +83,10 @@ class AppointmentTypeAdmin(admin.ModelAdmin):
 
 
 @admin.register(Appointment)
-class AppointmentAdmin(admin.ModelAdmin):
+class AppointmentAdmin(ExportActionsMixin, admin.ModelAdmin):
     list_display = ['client_name', 'appointment_type', 'client_email', 'status', 'scheduled_date', 'created_at']
     list_filter = ['status', 'appointment_type', 'created_at']
+    list_select_related = ['appointment_type']
     search_fields = ['client_name', 'client_email', 'company', 'purpose']
     list_editable = ['status']
     ordering = ['-created_at']
@@ -122,13 +142,15 @@ class StudyNoteAdmin(admin.ModelAdmin):
     search_fields = ['book_title', 'book_author']
     list_editable = ['featured']
     inlines = [StudyChapterInline]
+    readonly_fields = ['total_chapters', 'completed_chapters']
     
     fieldsets = (
         ('Book Information', {
             'fields': ('book_title', 'book_author', 'book_description', 'book_cover_url')
         }),
         ('Progress Tracking', {
-            'fields': ('total_chapters', 'completed_chapters')
+            'fields': ('total_chapters', 'completed_chapters'),
+            'description': 'Counted automatically from the chapters below'
         }),
         ('Display Options', {
             'fields': ('featured',)
@@ -151,11 +173,46 @@ class StudyNoteAdmin(admin.ModelAdmin):
 class StudyChapterAdmin(admin.ModelAdmin):
     list_display = ['study_note', 'chapter_number', 'title', 'status', 'order']
     list_filter = ['status', 'study_note']
+    list_select_related = ['study_note']
     search_fields = ['title', 'study_note__book_title']
     list_editable = ['status', 'order']
     ordering = ['study_note', 'order', 'chapter_number']
 
 
+def _tag_usage(link_model):
+    """Per-tag row count of ``link_model``, 0 for unused tags"""
+    counts = link_model.objects.filter(tag=OuterRef('pk')).order_by().values('tag').annotate(count=Count('pk'))
+    return Coalesce(Subquery(counts.values('count')), 0)
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug', 'project_count', 'post_count']
+    search_fields = ['name']
+    ordering = ['name']
+    # Names are matched against the comma-separated fields on projects and posts
+    readonly_fields = ['name']
+
+    def get_queryset(self, request):
+        # Usage counts come from the page query, not one COUNT per row. One
+        # subquery per link table; joining both multiplies their rows
+        return super().get_queryset(request).annotate(
+            project_count=_tag_usage(ProjectTechnology),
+            post_count=_tag_usage(BlogPostTag),
+        )
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.display(description='Projects', ordering='project_count')
+    def project_count(self, obj):
+        return obj.project_count
+
+    @admin.display(description='Blog posts', ordering='post_count')
+    def post_count(self, obj):
+        return obj.post_count
+
+
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
     list_display = ['title', 'featured', 'order', 'created_at']
@@ -262,7 +319,7 @@ class BlogPostAdmin(admin.ModelAdmin):
 
 
 @admin.register(ContactMessage)
-class ContactMessageAdmin(admin.ModelAdmin):
+class ContactMessageAdmin(ExportActionsMixin, admin.ModelAdmin):
     list_display = ['subject', 'sender_email', 'is_read', 'created_at']
     list_filter = ['is_read', 'created_at']
     search_fields = ['subject', 'sender_email', 'message']
@@ -274,6 +331,42 @@ class ContactMessageAdmin(admin.ModelAdmin):
         return False  # Prevent manual addition of contact messages
 
 
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'recipients', 'status', 'attempts', 'next_attempt_at', 'created_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['subject', 'recipients']
+    readonly_fields = ['subject', 'body', 'from_email', 'recipients', 'attempts', 'last_error',
+                       'created_at', 'sent_at']
+    ordering = ['-created_at']
+    actions = ['retry_now']
+    
+    def has_add_permission(self, request):
+        return False  # Emails are queued by the contact and appointment forms
+    
+    @admin.action(description='Retry selected emails now')
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(status='pending', attempts=0, next_attempt_at=timezone.now())
+        self.message_user(request, f'{updated} email(s) queued for another attempt.')
+
+
+@admin.register(ResponsiveImage)
+class ResponsiveImageAdmin(admin.ModelAdmin):
+    list_display = ['source', 'status', 'width', 'height', 'updated_at']
+    list_filter = ['status']
+    search_fields = ['source']
+    readonly_fields = ['source', 'status', 'width', 'height', 'variants', 'last_error', 'created_at', 'updated_at']
+    actions = ['regenerate']
+
+    def has_add_permission(self, request):
+        return False  # Queued when a model with an image field is saved
+
+    @admin.action(description='Regenerate derivatives')
+    def regenerate(self, request, queryset):
+        queue_images(queryset.values_list('source', flat=True), force=True)
+        self.message_user(request, f'{queryset.count()} image(s) queued for processing.')
+
+
 @admin.register(SiteSettings)
 class SiteSettingsAdmin(admin.ModelAdmin):
     list_display = ['site_title', 'updated_at']
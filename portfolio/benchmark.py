@@ -0,0 +1,278 @@
+"""
+Benchmark every public route at a chosen data scale.
+
+``seed_synthetic(scale)`` fills the content models with ``scale``
+deterministic rows each. The rows are written with ``bulk_create``, and
+``rows_seeded`` keeps tags, the search index and the study note counters in
+step. ``run()`` then times each route in ``ROUTES``, either in-process
+through the test client or over HTTP against a running server such as
+gunicorn. It returns throughput and p50 / p99 latency per route, for
+``manage.py benchmark`` to write as JSON and compare between commits.
+"""
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+import django
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import (Appointment, AppointmentType, BlogPost, Book, ContactMessage, Paper, Profile, Project,
+                     SiteSettings, Skill, StudyChapter, StudyNote, Tag)
+from .seeding import rows_seeded
+
+BATCH_SIZE = 1000
+# The study notes page lists every note unpaginated, so the scale goes into
+# chapters beyond this many notes
+MAX_STUDY_NOTES = 100
+
+WORDS = ('python', 'django', 'postgres', 'kafka', 'redis', 'rust', 'kubernetes', 'latency', 'caching',
+         'storage', 'compiler', 'networking', 'consensus', 'indexing', 'profiling', 'security')
+TECHNOLOGIES = ('Python', 'Django', 'PostgreSQL', 'Redis', 'Kafka', 'Go', 'Rust', 'AWS', 'Docker',
+                'Kubernetes', 'React', 'TypeScript', 'gRPC', 'Celery', 'Elasticsearch', 'Terraform')
+
+
+def _text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def _create(model, rows):
+    created = model.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    rows_seeded.send(sender=model, created=created, updated=[])
+    return created
+
+
+def seed_synthetic(scale, seed=0):
+    """Add ``scale`` synthetic rows to every content model; returns {model name: rows}"""
+    rng = random.Random(seed)
+    today = date.today()
+    counts = {}
+
+    def add(model, rows):
+        counts[model.__name__] = len(_create(model, rows))
+
+    if not Profile.objects.exists():
+        add(Profile, [Profile(name='Benchmark', title='Engineer', bio=_text(rng, 80), email='bench@example.com')])
+    if not SiteSettings.objects.exists():
+        add(SiteSettings, [SiteSettings()])
+
+    add(Project, [
+        Project(title=f'Project {i} {_text(rng, 2)}', description=_text(rng, 60),
+                github_url=f'https://github.com/bench/{i}', technologies=', '.join(rng.sample(TECHNOLOGIES, 4)),
+                featured=i % 10 == 0, order=i % 50)
+        for i in range(scale)
+    ])
+    add(Book, [
+        Book(title=f'Book {i} {_text(rng, 2)}', author=f'Author {i % 97}',
+             goodreads_url=f'https://example.com/book/{i}', category=rng.choice(Book.CATEGORY_CHOICES)[0],
+             rating=rng.randint(1, 5), review=_text(rng, 40), featured=i % 10 == 0, order=i % 50)
+        for i in range(scale)
+    ])
+    add(Paper, [
+        Paper(title=f'Paper {i} {_text(rng, 3)}', authors=f'Author {i % 89}',
+              paper_url=f'https://example.com/paper/{i}', category=rng.choice(Paper.CATEGORY_CHOICES)[0],
+              summary=_text(rng, 60), key_insights=_text(rng, 30), featured=i % 10 == 0, order=i % 50)
+        for i in range(scale)
+    ])
+    add(BlogPost, [
+        BlogPost(title=f'Post {i} {_text(rng, 3)}', description=_text(rng, 60),
+                 medium_url=f'https://medium.com/bench/{i}', tags=', '.join(rng.sample(TECHNOLOGIES, 3)),
+                 published_date=today - timedelta(days=i % 3650), featured=i % 10 == 0, order=i % 50)
+        for i in range(scale)
+    ])
+    add(Skill, [
+        Skill(name=f'Skill {i}', category=Skill.CATEGORY_CHOICES[i % len(Skill.CATEGORY_CHOICES)][0],
+              proficiency_level=rng.randint(1, 4), years_experience=rng.randint(1, 10), is_featured=i % 4 == 0,
+              order=i % 20)
+        for i in range(scale)
+    ])
+    appointment_types = _create(AppointmentType, [
+        AppointmentType(name=f'Session {i}', description=_text(rng, 20), duration=30, order=i)
+        for i in range(scale)
+    ])
+    counts['AppointmentType'] = len(appointment_types)
+    add(Appointment, [
+        Appointment(appointment_type=appointment_types[i], client_name=f'Client {i}',
+                    client_email=f'client{i}@example.com', purpose=_text(rng, 20))
+        for i in range(scale)
+    ])
+    add(ContactMessage, [
+        ContactMessage(sender_email=f'sender{i}@example.com', subject=f'Hello {i}', message=_text(rng, 30))
+        for i in range(scale)
+    ])
+    notes = _create(StudyNote, [
+        StudyNote(book_title=f'Study {i}', book_author=f'Author {i}', book_description=_text(rng, 40))
+        for i in range(max(1, min(scale, MAX_STUDY_NOTES)))
+    ])
+    counts['StudyNote'] = len(notes)
+    add(StudyChapter, [
+        StudyChapter(study_note=notes[i % len(notes)], chapter_number=i // len(notes) + 1,
+                     title=f'Chapter {i}', description=_text(rng, 20),
+                     status=rng.choice(StudyChapter.STATUS_CHOICES)[0], order=i // len(notes))
+        for i in range(scale)
+    ])
+    return counts
+
+
+@dataclass
+class Route:
+    """One URL pattern in ``portfolio.urls`` and how to exercise it"""
+    name: str
+    method: str = 'GET'
+    params: dict = field(default_factory=dict)
+
+    def path(self):
+        kwargs = {}
+        if self.name in ('projects_by_technology', 'blog_by_tag'):
+            kwargs['slug'] = Tag.objects.order_by('pk').values_list('slug', flat=True).first()
+        elif self.name == 'study_note':
+            kwargs['pk'] = StudyNote.objects.order_by('pk').values_list('pk', flat=True).first()
+        return reverse(f'portfolio:{self.name}', kwargs=kwargs)
+
+    def bodies(self, run_id, count):
+        """JSON bodies for ``count`` requests, unique so none is replayed as a duplicate submission"""
+        if self.name == 'contact_submit':
+            return [{'sender': f'bench-{run_id}-{i}@example.com', 'subject': f'Benchmark {run_id} {i}',
+                     'message': 'Hello'} for i in range(count)]
+        if self.name == 'appointment_submit':
+            appointment_type = AppointmentType.objects.filter(is_active=True).values_list('pk', flat=True).first()
+            return [{'appointment_type': appointment_type, 'client_name': 'Benchmark',
+                     'client_email': f'bench-{run_id}-{i}@example.com', 'purpose': f'Benchmark {run_id} {i}'}
+                    for i in range(count)]
+        return [None] * count
+
+
+ROUTES = [
+    Route('home'),
+    Route('projects'),
+    Route('projects_by_technology'),
+    Route('books'),
+    Route('papers'),
+    Route('blog'),
+    Route('blog_by_tag'),
+    Route('study_notes'),
+    Route('study_note'),
+    Route('search', params={'q': 'django'}),
+    Route('search_api', params={'q': 'django'}),
+    Route('appointments'),
+    Route('appointment_submit', method='POST'),
+    Route('contact_submit', method='POST'),
+]
+
+
+class ClientTransport:
+    """Requests through Django's test client, in this process"""
+
+    def __init__(self):
+        self.client = Client()
+
+    def __call__(self, method, path, params, body, ip):
+        if method == 'POST':
+            response = self.client.post(path, json.dumps(body), content_type='application/json', REMOTE_ADDR=ip)
+        else:
+            response = self.client.get(path, params)
+        return response.status_code
+
+
+class HTTPTransport:
+    """Requests over HTTP to a running server, e.g. ``gunicorn portfolio_project.wsgi``"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def __call__(self, method, path, params, body, ip):
+        url = self.base_url + path
+        if params:
+            url += '?' + urllib.parse.urlencode(params)
+        data = json.dumps(body).encode() if body is not None else None
+        # Counted per client by a server with DJANGO_CLIENT_IP_HEADER=X-Real-IP
+        headers = {'Content-Type': 'application/json', 'X-Real-IP': ip}
+        request = urllib.request.Request(url, data=data, method=method, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as error:
+            return error.code
+
+
+def _percentile(sorted_values, fraction):
+    # Nearest-rank percentile
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def bench_route(transport, route, requests, warmup=0, concurrency=1, run_id=''):
+    """Time ``requests`` calls of one route; returns its result dict"""
+    if requests < 1:
+        raise ValueError('requests must be at least 1')
+    path = route.path()
+    bodies = route.bodies(run_id, warmup + requests)
+
+    def call(i):
+        start = time.perf_counter()
+        status = transport(route.method, path, route.params, bodies[i], f'10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}')
+        return status, time.perf_counter() - start
+
+    for i in range(warmup):
+        call(i)
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(call, range(warmup, warmup + requests)))
+    else:
+        results = [call(i) for i in range(warmup, warmup + requests)]
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(duration * 1000 for _, duration in results)
+    statuses = {}
+    for status, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        'method': route.method,
+        'path': path,
+        'requests': requests,
+        'errors': sum(count for status, count in statuses.items() if not status.startswith('2')),
+        'status': statuses,
+        'throughput_rps': round(requests / elapsed, 2),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'p50_ms': round(_percentile(latencies, 0.50), 3),
+        'p99_ms': round(_percentile(latencies, 0.99), 3),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(transport, routes=None, requests=50, warmup=5, concurrency=1, metadata=None):
+    """Benchmark ``routes`` (default: all) and return the report dict"""
+    run_id = f'{int(time.time())}'
+    results = {}
+    for route in routes or ROUTES:
+        results[route.name] = bench_route(transport, route, requests, warmup=warmup,
+                                          concurrency=concurrency, run_id=run_id)
+    return {
+        **(metadata or {}),
+        'commit': _git_commit(),
+        'created_at': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'requests_per_route': requests,
+        'concurrency': concurrency,
+        'routes': results,
+    }
@@ -0,0 +1,442 @@
+"""
+Per-page CSS and JS bundles pruned to what each page type uses.
+
+``manage.py build_bundles`` collects, for each bundle in ``BUNDLES``, the
+element names, classes, ids and attributes the pages of that type can
+produce. They come from:
+
+- the rendered pages
+- every template the pages extend or include
+- string literals in their scripts, for classes that scripts add
+- ``Skill.icon_class``, since icon classes live in the database
+
+A template class such as ``badge-{{ category }}`` counts as every class
+starting with ``badge-``.
+
+The pruning covers ``css/style.css`` and the self-hosted copies of the CDN
+stylesheets (see ``vendor_assets``). Rules whose selectors cannot match any
+of those names are dropped, along with media queries that end up empty and
+keyframes that no remaining rule animates. The rules matching the header
+and the start of ``<main>`` are also written as the page's critical CSS.
+``js/script.js`` is split into sections, each opened by a
+``// @requires <selector>`` line and closed by ``// @end``, and a section is
+kept only where its selector can match. Every block directly inside the
+script's outer ``DOMContentLoaded`` handler must sit in a section:
+``script_sections()`` rejects unmarked blocks and unbalanced markers, and
+the build warns about sections no page can use. The results are minified
+into ``static/bundles/``, where collectstatic picks them up. Templates link
+local scripts only through ``{% bundle_static 'js' %}``.
+
+``{% stylesheets %}`` inlines a page's critical CSS and loads its bundle
+without blocking rendering, and ``{% bundle_static %}`` links the script.
+Both fall back to the CDN stylesheets and full source files in DEBUG or
+when the bundle has not been built.
+"""
+import logging
+import os
+import posixpath
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.template.loader import get_template
+from django.templatetags.static import static
+from django.urls import NoReverseMatch
+
+from . import vendor_assets
+from .cache import build_fingerprint
+from .models import Skill
+from .static_export import ExportPage, export_pages, render_page
+
+# kind -> the full source file in STATICFILES_DIRS
+SOURCES = {'css': 'css/style.css', 'js': 'js/script.js'}
+BUNDLE_DIR = 'bundles'
+# <main> elements, in document order, counted as above the fold
+CRITICAL_ELEMENTS = 40
+
+
+@dataclass(frozen=True)
+class Bundle:
+    name: str
+    url_names: tuple
+    templates: tuple
+
+    def path(self, kind):
+        file = f'{self.name}.critical.css' if kind == 'critical' else f'{self.name}.min.{kind}'
+        return f'{BUNDLE_DIR}/{file}'
+
+
+BUNDLES = (
+    Bundle('home', ('home',), ('portfolio/index.html',)),
+    Bundle('lists', ('projects', 'projects_by_technology', 'books', 'papers', 'blog', 'blog_by_tag',
+                     'study_notes', 'study_note', 'search'),
+           ('portfolio/projects.html', 'portfolio/books.html', 'portfolio/papers.html', 'portfolio/blog.html',
+            'portfolio/study_notes.html', 'portfolio/study_note.html', 'portfolio/search.html')),
+    Bundle('appointments', ('appointments',), ('portfolio/appointments.html',)),
+)
+BUNDLE_BY_URL_NAME = {url_name: bundle for bundle in BUNDLES for url_name in bundle.url_names}
+
+logger = logging.getLogger(__name__)
+
+
+def asset_path(url_name, kind):
+    """
+    Static path of the ``kind`` asset to link from the page named
+    ``url_name``; for 'critical' there is no fallback and this is None.
+    """
+    bundle = BUNDLE_BY_URL_NAME.get(url_name)
+    if bundle is None or settings.DEBUG or not _is_built(bundle.path(kind), build_fingerprint()):
+        return SOURCES.get(kind)
+    return bundle.path(kind)
+
+
+@lru_cache(maxsize=None)
+def _is_built(path, build):
+    # A new build means a new deploy; until then the answer can't change
+    return staticfiles_storage.exists(path)
+
+
+@lru_cache(maxsize=16)
+def _read_critical(path, location, mtime):
+    # Inlined into the page, so relative font URLs must become static URLs
+    def absolute_urls(piece):
+        return re.sub(
+            r'url\((?![\'"]?(?:[a-z]+:|/|#))([^)\'"]+)\)',
+            lambda match: f'url({static(posixpath.join(posixpath.dirname(path), match.group(1)))})',
+            piece,
+        )
+    pieces = re.split(f'({STRING})', Path(location).read_text())
+    css = ''.join(piece if i % 2 else absolute_urls(piece) for i, piece in enumerate(pieces))
+    # "<\/" is still "</" inside CSS strings, but cannot end the <style> element
+    return css.replace('</', '<\\/')
+
+
+def critical_css(url_name):
+    """The above-the-fold CSS to inline into the page named ``url_name``, or ''"""
+    path = asset_path(url_name, 'critical')
+    if path is None:
+        return ''
+    location = staticfiles_storage.path(path)
+    return _read_critical(path, location, os.stat(location).st_mtime_ns)
+
+
+@dataclass
+class UsedNames:
+    """Names a page type can put in its DOM"""
+    tags: set = field(default_factory=set)
+    classes: set = field(default_factory=set)
+    ids: set = field(default_factory=set)
+    attributes: set = field(default_factory=set)
+    animations: set = field(default_factory=set)
+    # From partly dynamic class and id values; match classes and ids alike
+    prefixes: set = field(default_factory=set)
+
+    def has(self, kind, name):
+        names = {'.': self.classes, '#': self.ids, '': self.tags}[kind]
+        if kind == '':
+            return name.lower() in names
+        return name in names or any(name.startswith(prefix) for prefix in self.prefixes)
+
+
+STRING = r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''
+TEMPLATE_TAG = re.compile(r'{%.*?%}|{#.*?#}', re.S)
+TEMPLATE_VARIABLE = re.compile(r'{{.*?}}', re.S)
+DYNAMIC = '\x00'
+ATTRIBUTE = re.compile(r'\s([a-zA-Z_:][\w:.-]*)(?:\s*=\s*("[^"]*"|\'[^\']*\'|[^\s>]+))?')
+ELEMENT = re.compile(r'<([a-zA-Z][\w-]*)([^<>]*)>')
+SCRIPT = re.compile(r'<script\b[^>]*>(.*?)</script>', re.S | re.I)
+NAME = re.compile(r'-?[_a-zA-Z][\w-]*')
+ANIMATION = re.compile(r'animation(?:-name)?\s*:([^;}"\'<]*)')
+
+
+def _scan_attributes(attributes, used):
+    for name, value in ATTRIBUTE.findall(attributes):
+        name = name.lower()
+        used.attributes.add(name)
+        if name not in ('class', 'id'):
+            continue
+        names = used.classes if name == 'class' else used.ids
+        for token in value.strip('\'"').split():
+            if DYNAMIC not in token:
+                names.add(token)
+            elif token.split(DYNAMIC)[0]:
+                used.prefixes.add(token.split(DYNAMIC)[0])
+
+
+def scan_script(script, used):
+    """Add every name in the string literals of ``script`` to ``used``"""
+    # Scripts may add any class, id, attribute or animation they name
+    words = set(NAME.findall(' '.join(re.findall(STRING + r'|`[^`]*`', script))))
+    used.classes |= words
+    used.ids |= words
+    used.attributes |= words
+    used.animations |= words
+    return used
+
+
+def scan_html(text, used):
+    """Add the names in ``text``, rendered HTML or template source, to ``used``"""
+    # Template tags can take attributes too: {% responsive_image ... class="x" %}
+    for tag in TEMPLATE_TAG.finditer(text):
+        _scan_attributes(' ' + tag.group()[2:-2], used)
+    text = TEMPLATE_VARIABLE.sub(DYNAMIC, TEMPLATE_TAG.sub(' ', text))
+    for script in SCRIPT.findall(text):
+        scan_script(script, used)
+    for tag, attributes in ELEMENT.findall(text):
+        used.tags.add(tag.lower())
+        _scan_attributes(attributes, used)
+    # Inline <style> blocks and style="" attributes may run stylesheet keyframes
+    for value in ANIMATION.findall(text):
+        used.animations |= set(NAME.findall(value))
+    return used
+
+
+def _template_sources(names):
+    # The named templates and everything they extend or include
+    seen, pending = {}, list(names)
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen[name] = get_template(name).template.source
+        pending += re.findall(r'{%\s*(?:extends|include)\s+["\']([^"\']+)["\']', seen[name])
+    return seen.values()
+
+
+def above_the_fold(html):
+    """``html`` up to the end of the first CRITICAL_ELEMENTS elements of its <main>"""
+    main = html.find('<main')
+    if main == -1:
+        return html
+    elements = list(ELEMENT.finditer(html, main))[:CRITICAL_ELEMENTS + 1]
+    return html[:elements[-1].end()]
+
+
+def used_names(bundle):
+    """
+    ``(used, above the fold)`` names of the pages of ``bundle``, from their
+    templates and from the pages rendered with the current data.
+    """
+    used, critical = UsedNames(), UsedNames()
+    for source in _template_sources(bundle.templates):
+        scan_html(source, used)
+    # Icon classes are stored on the rows, not in the templates
+    for icon_class in Skill.objects.exclude(icon_class='').values_list('icon_class', flat=True):
+        used.classes.update(icon_class.split())
+    pages = [page for page in export_pages() if page.url_name in bundle.url_names]
+    exported = {page.url_name for page in pages}
+    for url_name in bundle.url_names:
+        if url_name in exported:
+            continue
+        page = ExportPage(url_name, '', ())
+        try:
+            page.path
+        except NoReverseMatch:
+            # Needs a slug or pk and there is no row to give it
+            continue
+        pages.append(page)
+    for page in pages:
+        html = render_page(page).decode()
+        scan_html(html, used)
+        scan_html(above_the_fold(html), critical)
+    return used, critical
+
+
+def selector_matches(selector, used):
+    """False only when no element on the page can match ``selector``"""
+    # Pseudo-class arguments (:not(), :is(), ...) are not checked
+    while re.search(r'\([^()]*\)', selector):
+        selector = re.sub(r'\([^()]*\)', '', selector)
+    if any(name.lower() not in used.attributes for name in re.findall(r'\[\s*([\w:-]+)', selector)):
+        return False
+    selector = re.sub(r'\[[^\]]*\]|::?[\w-]+', '', selector)
+    return all(used.has(kind, name) for kind, name in re.findall(r'([.#]?)(-?[_a-zA-Z][\w-]*)', selector))
+
+
+def _split_outside(text, separator):
+    parts, depth, start = [], 0, 0
+    for match in re.finditer(STRING + r'|[()\[\]]|' + re.escape(separator), text):
+        token = match.group()
+        if token in '([':
+            depth += 1
+        elif token in ')]':
+            depth -= 1
+        elif token == separator and depth == 0:
+            parts.append(text[start:match.start()])
+            start = match.end()
+    return parts + [text[start:]]
+
+
+def _strip_comments(css):
+    return re.sub(f'({STRING})|/\\*.*?\\*/', lambda match: match.group(1) or '', css, flags=re.S)
+
+
+def _blocks(css):
+    """
+    Top-level ``(prelude, body)`` pairs; ``body`` is None for statements
+    such as @import. As in browsers, a ; outside an at-rule does not end
+    anything, so stray declarations become part of the next prelude.
+    """
+    items, depth, start, prelude_end = [], 0, 0, 0
+    for match in re.finditer(STRING + r'|[{};]', css):
+        token = match.group()
+        if token == '{':
+            if depth == 0:
+                prelude_end = match.start()
+            depth += 1
+        elif token == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                items.append((css[start:prelude_end].strip(), css[prelude_end + 1:match.start()]))
+                start = match.end()
+        elif token == ';' and depth == 0 and css[start:match.start()].lstrip().startswith('@'):
+            items.append((css[start:match.start()].strip(), None))
+            start = match.end()
+    return items
+
+
+def _minify(text, punctuation=';:,{}'):
+    # Collapse whitespace outside strings and drop it around ``punctuation``
+    def squeeze(piece):
+        piece = re.sub(r'\s+', ' ', piece)
+        if punctuation:
+            piece = re.sub(rf'\s*([{re.escape(punctuation)}])\s*', r'\1', piece)
+        return piece.replace(';}', '}')
+    pieces = re.split(f'({STRING})', text)
+    return ''.join(piece if i % 2 else squeeze(piece) for i, piece in enumerate(pieces)).strip().rstrip(';')
+
+
+# At-rules whose body holds rules to prune; others are kept whole
+CONTAINER_AT_RULES = ('@media', '@supports', '@layer', '@container')
+
+
+def _prune(css, used):
+    output = []
+    for prelude, body in _blocks(css):
+        if body is None:
+            # @import is only valid at the top of a file, and a bundle
+            # concatenates several; @charset is implied by the UTF-8 output
+            if not prelude.startswith(('@import', '@charset')):
+                output.append(_minify(prelude) + ';')
+        elif prelude.startswith(CONTAINER_AT_RULES):
+            inner = _prune(body, used)
+            if inner:
+                output.append(f'{_minify(prelude, "")}{{{inner}}}')
+        elif prelude.startswith('@'):
+            output.append(f'{_minify(prelude, "")}{{{_minify(body)}}}')
+        elif not re.search('[};]', prelude):
+            # A stray } or declaration makes the selector invalid, and
+            # browsers skip the rule
+            selectors = [s.strip() for s in _split_outside(prelude, ',') if selector_matches(s.strip(), used)]
+            if selectors and body.strip():
+                output.append(f'{_minify(",".join(selectors), ",>+~")}{{{_minify(body)}}}')
+    return ''.join(output)
+
+
+def _drop_unused_keyframes(css, used):
+    keyframes = set(re.findall(r'@(?:-webkit-)?keyframes ([\w-]+)\{', css))
+    animated = used.animations | {name for value in ANIMATION.findall(css) for name in NAME.findall(value)}
+    for name in keyframes - animated:
+        # Keyframes bodies nest one level: @keyframes x{from{...}to{...}}
+        css = re.sub(rf'@(?:-webkit-)?keyframes {re.escape(name)}\{{(?:[^{{}}]*\{{[^{{}}]*\}})*[^{{}}]*\}}', '', css)
+    return css
+
+
+def prune_css(css, used):
+    """``css`` without the rules ``used`` cannot match, minified"""
+    return _drop_unused_keyframes(_prune(_strip_comments(css), used), used)
+
+
+def script_sections(js):
+    """
+    Split ``js`` into (selector, code lines) sections; the selector is None
+    for code outside ``// @requires`` ... ``// @end``.
+
+    Raises ValueError for a marker without its pair and for unmarked code
+    directly inside the outer handler, which would ship to every page.
+    """
+    sections, selector, depth = [(None, [])], None, 0
+    for number, line in enumerate(js.splitlines(), start=1):
+        stripped = line.strip()
+        directive = re.match(r'// @(requires|end)\b\s*(.*)', stripped)
+        if directive:
+            kind, argument = directive.groups()
+            if kind == 'requires' and (selector is not None or not argument):
+                raise ValueError(f'Line {number}: @requires needs a selector and the previous section closed')
+            if kind == 'end' and selector is None:
+                raise ValueError(f'Line {number}: @end without an open @requires section')
+            selector = argument if kind == 'requires' else None
+            sections.append((selector, []))
+            continue
+        if not stripped or stripped.startswith('//'):
+            continue
+        code = re.sub(STRING, '""', stripped)
+        if selector is None and depth - len(code) + len(code.lstrip('}')) == 1:
+            raise ValueError(f'Line {number} is not in a // @requires section, so it would ship to every page')
+        depth += code.count('{') - code.count('}')
+        sections[-1][1].append(stripped)
+    if selector is not None:
+        raise ValueError(f'The @requires {selector} section has no // @end')
+    return sections
+
+
+def _section_needed(selector, used):
+    return selector is None or any(selector_matches(s.strip(), used) for s in _split_outside(selector, ','))
+
+
+def prune_js(js, used):
+    """
+    ``js`` without the sections (see ``script_sections``) ``used`` cannot
+    match, minified.
+
+    Only whole-line comments are stripped, and lines stay separate, so
+    automatic semicolon insertion is unaffected.
+    """
+    output = [line for selector, lines in script_sections(js) if _section_needed(selector, used) for line in lines]
+    return '\n'.join(output) + '\n'
+
+
+def build(output_dir):
+    """
+    Write every bundle, its critical CSS and the fonts they use into ``output_dir``.
+
+    Returns {bundle or font file: {kind: (source bytes, output bytes)}}.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # Vendor stylesheets first, in the order base.html used to link them
+    stylesheets = {**vendor_assets.stylesheets(), 'style': Path(finders.find(SOURCES['css'])).read_text()}
+    js = Path(finders.find(SOURCES['js'])).read_text()
+    source_css = sum(len(css.encode()) for css in stylesheets.values())
+    unused_sections = {selector for selector, _ in script_sections(js) if selector}
+    sizes, codepoints = {}, {}
+    for bundle in BUNDLES:
+        used, critical = used_names(bundle)
+        unused_sections = {selector for selector in unused_sections if not _section_needed(selector, used)}
+        # The kept script sections may add classes of their own
+        bundle_js = prune_js(js, used)
+        scan_script(bundle_js, used)
+        scan_script(bundle_js, critical)
+        bundle_css = {name: prune_css(css, used) for name, css in stylesheets.items()}
+        for name, css in bundle_css.items():
+            codepoints.setdefault(name, set()).update(vendor_assets.icon_codepoints(css))
+        outputs = {
+            'css': (source_css, ''.join(bundle_css.values())),
+            'critical': (source_css, ''.join(prune_css(css, critical) for css in stylesheets.values())),
+            'js': (len(js.encode()), bundle_js),
+        }
+        sizes[bundle.name] = {}
+        for kind, (source_size, content) in outputs.items():
+            (output_dir / Path(bundle.path(kind)).name).write_text(content)
+            sizes[bundle.name][kind] = (source_size, len(content.encode()))
+    for selector in sorted(unused_sections):
+        # Dead code, or a selector with a typo that drops a feature everywhere
+        logger.warning('No page can match "// @requires %s"; that section of %s is in no bundle',
+                       selector, SOURCES['js'])
+    for file, font_sizes in vendor_assets.subset_fonts(output_dir, codepoints).items():
+        sizes[file] = {'font': font_sizes}
+    return sizes
@@ -0,0 +1,138 @@
+"""
+Content-versioned caching for the public portfolio pages.
+
+Every admin edit to homepage content bumps a single version number stored in
+the shared cache. Rendered pages are stored under keys that embed that
+version, so a bump makes every old entry unreachable without having to know
+which keys exist.
+
+The same version scopes the HTTP validators: ``conditional_page`` derives an
+ETag and Last-Modified from ``COUNT(*)`` and ``MAX(updated_at)`` of the
+models a page renders, computes them once per content version, and lets
+``condition()`` answer repeat visits with 304 before the view runs.
+
+Both also embed a fingerprint of the deployed templates and static manifest,
+so a deploy that changes the markup or the asset URLs never serves, or
+answers 304 for, pages rendered by the previous release.
+"""
+import hashlib
+import json
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
+
+CONTENT_VERSION_KEY = 'portfolio:content_version'
+
+
+def get_content_version():
+    """Return the current content version, initialising it if needed"""
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        # Seed from the clock rather than 1 so that an evicted version key
+        # can never resurrect pages cached under an older number.
+        cache.add(CONTENT_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CONTENT_VERSION_KEY)
+    return version
+
+
+def template_fingerprint():
+    """Hash of every template under the ``TEMPLATES`` directories"""
+    digest = hashlib.sha256()
+    for template_dir in settings.TEMPLATES[0]['DIRS']:
+        for path in sorted(Path(template_dir).rglob('*.html')):
+            digest.update(str(path.relative_to(template_dir)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def build_fingerprint():
+    """
+    Short hash of the templates and the collected static manifest.
+
+    Computed once per process; a deploy restarts the workers.
+    """
+    read_manifest = getattr(staticfiles_storage, 'read_manifest', None)
+    static_manifest = (read_manifest() if read_manifest else None) or ''
+    return hashlib.sha256((template_fingerprint() + static_manifest).encode()).hexdigest()[:12]
+
+
+def bump_content_version(**kwargs):
+    """Invalidate every content-versioned cache entry"""
+    try:
+        return cache.incr(CONTENT_VERSION_KEY)
+    except ValueError:
+        cache.set(CONTENT_VERSION_KEY, time.time_ns(), timeout=None)
+        return cache.get(CONTENT_VERSION_KEY)
+
+
+def process_local_cache():
+    """True when the cache lives in this process only, so a bump here reaches no web worker"""
+    return isinstance(caches['default'], LocMemCache)
+
+
+def page_cache_key(name, version=None):
+    """
+    Cache key for a rendered page at the given content version.
+
+    Callers should compute the key once, before reading any content, and use
+    it for both the lookup and the store. A bump that lands mid-render then
+    leaves the fresh page under the stale key, never the other way round.
+    """
+    if version is None:
+        version = get_content_version()
+    return f'portfolio:page:{name}:{build_fingerprint()}:v{version}'
+
+
+def cache_page_content(key, content):
+    cache.set(key, content, settings.PAGE_CACHE_TIMEOUT)
+
+
+def content_fingerprints(models):
+    """{model label: (row count, latest updated_at)} for change detection"""
+    fingerprints = {}
+    for model in models:
+        state = model._default_manager.order_by().aggregate(count=Count('pk'), updated=Max('updated_at'))
+        fingerprints[model._meta.label] = (state['count'], state['updated'])
+    return fingerprints
+
+
+def page_validators(name, models):
+    """(etag, last_modified) for a page that renders ``models``"""
+    build = build_fingerprint()
+    key = f'portfolio:validators:{name}:{build}:v{get_content_version()}'
+    validators = cache.get(key)
+    if validators is None:
+        fingerprints = content_fingerprints(models)
+        # The count catches deletions, which never move MAX(updated_at)
+        digest = hashlib.sha256(json.dumps([name, build, fingerprints], default=str, sort_keys=True).encode())
+        updated = [updated for _, updated in fingerprints.values() if updated is not None]
+        validators = (digest.hexdigest()[:32], max(updated, default=None))
+        cache.set(key, validators, settings.PAGE_CACHE_TIMEOUT)
+    return validators
+
+
+def conditional_page(name, *models):
+    """
+    View decorator adding ETag / Last-Modified and 304 responses.
+
+    ``models`` must cover everything the page renders; the validators change
+    whenever a row of one of them is added, edited or deleted.
+    """
+    def validators(request):
+        # condition() asks for the ETag and Last-Modified separately
+        if not hasattr(request, '_page_validators'):
+            request._page_validators = page_validators(name, models)
+        return request._page_validators
+
+    return condition(
+        etag_func=lambda request, *args, **kwargs: validators(request)[0],
+        last_modified_func=lambda request, *args, **kwargs: validators(request)[1],
+    )
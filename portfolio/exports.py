@@ -0,0 +1,105 @@
+"""
+Streaming CSV / JSONL export of the contact and appointment inboxes.
+
+Rows are read with ``values_list().iterator(chunk_size=...)`` and written one
+line at a time, so memory stays flat however many rows are exported. The
+appointment type is joined into the same query rather than fetched per row.
+
+Every text field comes from the public forms, so CSV cells that a
+spreadsheet would evaluate as a formula are prefixed with a quote.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .models import Appointment, ContactMessage
+
+CHUNK_SIZE = 2000
+
+# Leading characters that make spreadsheets treat a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# model -> (column name, queryset field) pairs
+EXPORT_COLUMNS = {
+    ContactMessage: [
+        ('id', 'id'),
+        ('created_at', 'created_at'),
+        ('sender_email', 'sender_email'),
+        ('subject', 'subject'),
+        ('message', 'message'),
+        ('is_read', 'is_read'),
+    ],
+    Appointment: [
+        ('id', 'id'),
+        ('created_at', 'created_at'),
+        ('status', 'status'),
+        ('appointment_type', 'appointment_type__name'),
+        ('duration', 'appointment_type__duration'),
+        ('client_name', 'client_name'),
+        ('client_email', 'client_email'),
+        ('client_phone', 'client_phone'),
+        ('company', 'company'),
+        ('purpose', 'purpose'),
+        ('preferred_date', 'preferred_date'),
+        ('scheduled_date', 'scheduled_date'),
+        ('notes', 'notes'),
+    ],
+}
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to the caller"""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset):
+    """Column names and a lazy iterator over the queryset's export rows"""
+    columns = EXPORT_COLUMNS[queryset.model]
+    rows = queryset.values_list(*(field for _, field in columns)).iterator(chunk_size=CHUNK_SIZE)
+    return [name for name, _ in columns], rows
+
+
+def _csv_cell(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(queryset):
+    names, rows = export_rows(queryset)
+    writer = csv.writer(_Echo())
+    yield writer.writerow(names)
+    for row in rows:
+        yield writer.writerow([_csv_cell(value) for value in row])
+
+
+def iter_jsonl(queryset):
+    names, rows = export_rows(queryset)
+    for row in rows:
+        yield json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+EXPORTERS = {
+    'csv': iter_csv,
+    'jsonl': iter_jsonl,
+}
+
+
+def streaming_export(queryset, fmt):
+    """StreamingHttpResponse downloading ``queryset`` as CSV or JSONL"""
+    filename = f'{queryset.model._meta.model_name}-{timezone.now():%Y%m%d-%H%M%S}.{fmt}'
+    response = StreamingHttpResponse(EXPORTERS[fmt](queryset), content_type=CONTENT_TYPES[fmt])
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,122 @@
+"""
+Homepage data loader.
+
+The homepage shows a profile, the site settings and four featured content
+slices. Loading them one queryset at a time costs six round trips, so
+instead every slice becomes one branch of a single
+``UNION ALL`` query. Each branch selects a row kind and a JSON object of the
+row's concrete fields; rows are rebuilt into model instances here and put
+back into each model's ``Meta.ordering``.
+
+Branches are limited through ``pk IN (SELECT ... LIMIT n)`` rather than by
+slicing the branch itself, because SQLite does not allow LIMIT on the
+members of a compound statement.
+
+Featured skills come precomputed from ``portfolio.skills`` and usually cost
+no query at all.
+"""
+from dataclasses import dataclass, field
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Subquery, Value
+from django.db.models.functions import JSONObject
+from django.utils import timezone
+
+from .models import BlogPost, Book, Paper, Profile, Project, SiteSettings, Skill
+from .skills import get_skills_by_category
+
+
+@dataclass(frozen=True)
+class HomepageSnapshot:
+    """Immutable view of everything the homepage template renders"""
+    profile: Profile = None
+    site_settings: SiteSettings = None
+    projects: tuple = ()
+    books: tuple = ()
+    papers: tuple = ()
+    blog_posts: tuple = ()
+    skills_by_category: dict = field(default_factory=dict)
+
+    def as_context(self):
+        return {
+            'profile': self.profile,
+            'site_settings': self.site_settings,
+            'projects': self.projects,
+            'books': self.books,
+            'papers': self.papers,
+            'blog_posts': self.blog_posts,
+            'skills_by_category': self.skills_by_category,
+        }
+
+
+# (kind, model, base queryset, limit)
+HOMEPAGE_SLICES = [
+    ('profile', Profile, lambda: Profile.objects.order_by('pk'), 1),
+    ('site_settings', SiteSettings, lambda: SiteSettings.objects.order_by('pk'), 1),
+    ('projects', Project, lambda: Project.objects.filter(featured=True), 4),
+    ('books', Book, lambda: Book.objects.filter(featured=True), 3),
+    ('papers', Paper, lambda: Paper.objects.filter(featured=True), 6),
+    ('blog_posts', BlogPost, lambda: BlogPost.objects.filter(featured=True), 3),
+]
+
+
+# Every model whose rows appear on the homepage
+HOMEPAGE_MODELS = (*(model for _, model, _, _ in HOMEPAGE_SLICES), Skill)
+
+
+def _branch(kind, model, queryset, limit):
+    fields = model._meta.concrete_fields
+    queryset = model._default_manager.filter(pk__in=Subquery(queryset.values('pk')[:limit]))
+    return queryset.order_by().values(
+        kind=Value(kind),
+        payload=JSONObject(**{f.attname: f.attname for f in fields}),
+    )
+
+
+def _instance(model, payload, using):
+    fields = model._meta.concrete_fields
+    values = []
+    for f in fields:
+        value = payload.get(f.attname)
+        if value is not None:
+            value = f.to_python(value)
+            # SQLite serialises datetimes into JSON without an offset
+            if isinstance(f, models.DateTimeField) and settings.USE_TZ and timezone.is_naive(value):
+                value = timezone.make_aware(value, dt_timezone.utc)
+        values.append(value)
+    return model.from_db(using, [f.attname for f in fields], values)
+
+
+def _apply_ordering(instances, ordering):
+    """Sort instances in place by a Meta.ordering list"""
+    for name in reversed(ordering):
+        descending = name.startswith('-')
+        attname = name.lstrip('-')
+        instances.sort(key=lambda obj: getattr(obj, attname), reverse=descending)
+    return instances
+
+
+def load_homepage(using='default'):
+    """Fetch all homepage content in at most one database round trip"""
+    branches = [_branch(kind, model, get_queryset(), limit)
+                for kind, model, get_queryset, limit in HOMEPAGE_SLICES]
+    query = branches[0].union(*branches[1:], all=True).using(using)
+
+    model_for_kind = {kind: model for kind, model, _, _ in HOMEPAGE_SLICES}
+    rows = {kind: [] for kind in model_for_kind}
+    for row in query:
+        rows[row['kind']].append(_instance(model_for_kind[row['kind']], row['payload'], using))
+    for kind, model in model_for_kind.items():
+        _apply_ordering(rows[kind], model._meta.ordering or ['pk'])
+
+    return HomepageSnapshot(
+        profile=rows['profile'][0] if rows['profile'] else None,
+        site_settings=rows['site_settings'][0] if rows['site_settings'] else None,
+        projects=tuple(rows['projects']),
+        books=tuple(rows['books']),
+        papers=tuple(rows['papers']),
+        blog_posts=tuple(rows['blog_posts']),
+        skills_by_category=get_skills_by_category(),
+    )
@@ -0,0 +1,124 @@
+"""
+Duplicate-submission protection for the public forms.
+
+A submission is identified by the client's ``Idempotency-Key`` header and
+by a hash of the fields that make it unique within a short time bucket. The
+first request claims those keys with an INSERT into a unique index inside
+the view's transaction, and its response is stored on the claimed rows. A
+repeat finds the row and gets the stored response back, so double-clicks and
+client retries create no new rows and queue no new mail.
+"""
+import hashlib
+import json
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
+from .models import IdempotencyRecord
+
+REPLAY_HEADER = 'Idempotent-Replayed'
+
+
+def _digest(*parts):
+    return hashlib.sha256('\0'.join(parts).encode()).hexdigest()
+
+
+def submission_keys(request, fields):
+    """
+    Keys a submission is known by, as (claims, lookups).
+
+    ``claims`` are (key, lifetime in seconds) pairs to record for a new
+    submission: the client's Idempotency-Key, if sent, and a hash of the
+    identifying fields in the current time bucket. The content hash is kept
+    even when a header is sent, so a second submit handler or a client that
+    regenerates its key is still caught. ``lookups`` also include the
+    previous bucket, so two clicks either side of a boundary still match.
+    """
+    claims, lookups = [], []
+    header = request.headers.get('Idempotency-Key', '').strip()
+    if header:
+        key = _digest('header', header)
+        claims.append((key, settings.IDEMPOTENCY_KEY_TTL))
+        lookups.append(key)
+
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        content = json.dumps([str(data.get(field, '')).strip() for field in fields])
+        window = settings.IDEMPOTENCY_WINDOW
+        bucket = int(time.time() // window)
+        current, previous = (_digest('content', str(b), content) for b in (bucket, bucket - 1))
+        claims.append((current, window * 2))
+        lookups += [current, previous]
+    return claims, lookups
+
+
+def _replay(record):
+    if record is None or record.status_code is None:
+        # Claimed but unfinished; the claim and the response are written in
+        # one transaction, so this is only a safety net
+        response = JsonResponse({
+            'success': False,
+            'message': 'This submission is already being processed.'
+        }, status=409)
+    else:
+        response = HttpResponse(record.body, status=record.status_code, content_type=record.content_type)
+    response[REPLAY_HEADER] = 'true'
+    return response
+
+
+def idempotent(scope, fields):
+    """
+    Replay the stored response for a repeated submission.
+
+    ``fields`` are the JSON body fields whose values identify a submission
+    alongside any Idempotency-Key header; list every field the view reads,
+    so a corrected resubmission is not mistaken for a repeat. Only 2xx
+    responses are stored. Apply it outside ``rate_limit``, so a replay
+    doesn't use up a rate limit slot.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            claims, lookups = submission_keys(request, fields)
+            if not claims:
+                return view(request, *args, **kwargs)
+
+            now = timezone.now()
+            with transaction.atomic():
+                IdempotencyRecord.objects.filter(expires_at__lte=now).delete()
+                existing = IdempotencyRecord.objects.filter(scope=scope, key__in=lookups).first()
+                if existing is not None:
+                    return _replay(existing)
+                try:
+                    with transaction.atomic():
+                        records = IdempotencyRecord.objects.bulk_create([
+                            IdempotencyRecord(scope=scope, key=key, expires_at=now + timedelta(seconds=ttl))
+                            for key, ttl in claims
+                        ])
+                except IntegrityError:
+                    # A concurrent duplicate claimed the key and has committed
+                    return _replay(IdempotencyRecord.objects.filter(scope=scope, key__in=lookups).first())
+
+                response = view(request, *args, **kwargs)
+                claimed = IdempotencyRecord.objects.filter(pk__in=[record.pk for record in records])
+                if not 200 <= response.status_code < 300:
+                    # Only a completed submission is replayed; a rejected or
+                    # failed one can be corrected and sent again
+                    claimed.delete()
+                else:
+                    claimed.update(
+                        status_code=response.status_code,
+                        content_type=response.get('Content-Type', ''),
+                        body=response.content.decode(response.charset),
+                    )
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,167 @@
+"""
+Responsive derivatives of uploaded images.
+
+Saving a model with an image field queues its file in ``ResponsiveImage``.
+``manage.py process_images`` picks up the queue outside the request path and
+writes resized copies next to the original: AVIF when Pillow can encode it,
+WebP, and a JPEG (or PNG, for images with transparency) fallback, at every
+``IMAGE_DERIVATIVE_WIDTHS`` width narrower than the original.
+
+``{% responsive_image %}`` then renders a ``<picture>`` whose sources list
+those derivatives in a ``srcset``, so browsers pick the smallest file for
+the layout. The template tag reads the list of derivatives from the cache,
+falling back to one database read, and serves the original only while an
+image is still queued.
+"""
+import hashlib
+import io
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from .cache import bump_content_version
+from .models import BlogPost, Book, Profile, Project, ResponsiveImage
+
+try:
+    # Optional AVIF encoder for Pillow < 11
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+logger = logging.getLogger(__name__)
+
+# model -> image fields whose uploads get derivatives
+IMAGE_FIELDS = {
+    Profile: ['profile_image'],
+    Project: ['image'],
+    Book: ['cover_image'],
+    BlogPost: ['image'],
+}
+
+# format -> (Pillow encoder, MIME type), best compression first
+FORMATS = {
+    'avif': ('AVIF', 'image/avif'),
+    'webp': ('WEBP', 'image/webp'),
+    'jpeg': ('JPEG', 'image/jpeg'),
+    'png': ('PNG', 'image/png'),
+}
+# Served through <source> elements; the others are the <img> fallback
+MODERN_FORMATS = ('avif', 'webp')
+
+# Seconds to remember that an image has no derivatives yet
+PENDING_CACHE_TIMEOUT = 60
+
+
+def supported_formats(has_alpha=False):
+    """Formats to generate for one image, given the encoders Pillow has"""
+    Image.init()
+    fallback = 'png' if has_alpha else 'jpeg'
+    return [fmt for fmt in (*MODERN_FORMATS, fallback) if FORMATS[fmt][0] in Image.SAVE]
+
+
+def derivative_name(source, width, fmt):
+    # Keep the source extension, so same.jpg and same.png don't share derivatives
+    return f'{source}.{width}w.{fmt}'
+
+
+def _cache_key(source):
+    return f'portfolio:image:{hashlib.sha256(source.encode()).hexdigest()[:32]}'
+
+
+def queue_images(sources, force=False):
+    """
+    Queue ``sources`` that have no derivatives yet; with ``force``, queue
+    them all again.
+    """
+    sources = [source for source in dict.fromkeys(sources) if source]
+    if not sources:
+        return
+    ResponsiveImage.objects.bulk_create([ResponsiveImage(source=source) for source in sources],
+                                        ignore_conflicts=True)
+    if force:
+        ResponsiveImage.objects.filter(source__in=sources).exclude(status='pending').update(status='pending')
+        cache.delete_many([_cache_key(source) for source in sources])
+
+
+def images_changed(sender, instance=None, raw=False, created=(), updated=(), **kwargs):
+    """post_save / rows_seeded receiver for the models in IMAGE_FIELDS"""
+    # A replaced upload gets a new storage name, so known names need no work
+    if raw:
+        return
+    objects = [instance] if instance is not None else [*created, *updated]
+    queue_images([getattr(obj, name).name for obj in objects for name in IMAGE_FIELDS[sender]])
+
+
+def _resize(image, width):
+    if width >= image.width:
+        return image
+    height = max(1, round(image.height * width / image.width))
+    return image.resize((width, height), Image.LANCZOS)
+
+
+def _encode(image, fmt):
+    encoder = FORMATS[fmt][0]
+    if encoder == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    buffer = io.BytesIO()
+    options = {} if encoder == 'PNG' else {'quality': settings.IMAGE_DERIVATIVE_QUALITY}
+    image.save(buffer, encoder, optimize=True, **options)
+    return buffer.getvalue()
+
+
+def generate_derivatives(record, storage=default_storage):
+    """Write every derivative of ``record.source`` and record what was written"""
+    with storage.open(record.source) as f:
+        image = ImageOps.exif_transpose(Image.open(f))
+        image.load()
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    widths = sorted({min(width, image.width) for width in settings.IMAGE_DERIVATIVE_WIDTHS})
+    variants = {}
+    for fmt in supported_formats(has_alpha):
+        for width in widths:
+            name = derivative_name(record.source, width, fmt)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(_encode(_resize(image, width), fmt)))
+        variants[fmt] = widths
+    record.width, record.height = image.width, image.height
+    record.variants = variants
+    return record
+
+
+def process_queued(batch_size=20):
+    """Generate derivatives for queued images; returns (done, failed)"""
+    done = failed = 0
+    for record in ResponsiveImage.objects.filter(status='pending').order_by('updated_at')[:batch_size]:
+        try:
+            generate_derivatives(record)
+            record.status, record.last_error = 'ready', ''
+            done += 1
+        except Exception as exc:
+            logger.exception('Could not generate derivatives for %s', record.source)
+            record.status, record.last_error = 'failed', str(exc)
+            failed += 1
+        record.save()
+        cache.delete(_cache_key(record.source))
+    if done:
+        # Cached pages still point at the originals
+        bump_content_version()
+        transaction.on_commit(bump_content_version)
+    return done, failed
+
+
+def image_variants(source):
+    """The ready ResponsiveImage for ``source``, or None while it is queued"""
+    key = _cache_key(source)
+    record = cache.get(key)
+    if record is None:
+        record = ResponsiveImage.objects.filter(source=source, status='ready').first() or False
+        cache.set(key, record, None if record else PENDING_CACHE_TIMEOUT)
+    return record or None
@@ -0,0 +1,113 @@
+"""
+Email backends for the portfolio.
+
+``PooledSMTPEmailBackend`` keeps authenticated SMTP connections open between
+sends so that each message doesn't pay for a new TCP + TLS handshake and
+login. Select it with ``EMAIL_BACKEND`` in ``email_settings.py``.
+"""
+import smtplib
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail.backends import smtp
+
+
+class SMTPConnectionPool:
+    """Per-process pool of idle SMTP connections, keyed by server and login"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle = {}
+
+    def acquire(self, key, max_idle):
+        """Return a warm connection for ``key``, or None if none is fresh enough"""
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                connection, released_at = idle.pop()
+                if now - released_at <= max_idle:
+                    return connection
+                _quit(connection)
+        return None
+
+    def release(self, key, connection, max_size):
+        """Return a connection to the pool; False if it was closed instead"""
+        if getattr(connection, 'sock', None) is None:
+            return False
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < max_size:
+                idle.append((connection, time.monotonic()))
+                return True
+        _quit(connection)
+        return False
+
+    def clear(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection, _ in connections:
+                _quit(connection)
+
+
+def _quit(connection):
+    try:
+        connection.quit()
+    except (smtplib.SMTPException, OSError):
+        connection.close()
+
+
+pool = SMTPConnectionPool()
+
+
+class PooledSMTPEmailBackend(smtp.EmailBackend):
+    """
+    SMTP backend that reuses connections across backend instances.
+
+    ``close()`` hands the connection back to the pool instead of sending
+    QUIT, and ``open()`` takes a pooled connection before dialling a new
+    one. Servers drop idle clients, so a send that finds its connection gone
+    reconnects and tries once more.
+    """
+
+    @property
+    def pool_key(self):
+        return (self.host, self.port, self.username, self.use_tls, self.use_ssl)
+
+    def open(self):
+        if self.connection:
+            return False
+        connection = pool.acquire(self.pool_key, settings.EMAIL_POOL_MAX_IDLE)
+        if connection is not None:
+            self.connection = connection
+            return True
+        return super().open()
+
+    def close(self):
+        if self.connection is None:
+            return
+        connection, self.connection = self.connection, None
+        pool.release(self.pool_key, connection, settings.EMAIL_POOL_SIZE)
+
+    def _reconnect(self):
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            connection.close()
+        super().open()
+
+    def _send(self, email_message):
+        fail_silently, self.fail_silently = self.fail_silently, False
+        try:
+            try:
+                return super()._send(email_message)
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                self._reconnect()
+                return super()._send(email_message)
+        except (smtplib.SMTPException, OSError):
+            if not fail_silently:
+                raise
+            return False
+        finally:
+            self.fail_silently = fail_silently
@@ -0,0 +1,130 @@
+import json
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import (override_settings, setup_databases, setup_test_environment,
+                               teardown_databases, teardown_test_environment)
+
+from portfolio.benchmark import ROUTES, ClientTransport, HTTPTransport, run, seed_synthetic
+
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'portfolio-benchmark',
+    }
+}
+
+
+class Command(BaseCommand):
+    help = ('Benchmark every portfolio route and write throughput and p50/p99 latency as JSON. '
+            'Without --url, a throwaway test database and a private cache are used and requests go '
+            'through the test client. With --url, the contact and appointment routes POST real '
+            'submissions that are saved and queue real outbox mail; point it at a staging server.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale',
+            type=int,
+            default=10,
+            help='Synthetic rows per model, e.g. 10, 1000 or 100000 (default: 10)'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Timed requests per route (default: 50)'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=5,
+            help='Untimed requests per route before timing starts (default: 5)'
+        )
+        parser.add_argument(
+            '--route',
+            action='append',
+            dest='routes',
+            choices=[route.name for route in ROUTES],
+            help='Only benchmark this route; repeat for several'
+        )
+        parser.add_argument(
+            '--url',
+            help='Benchmark a running server at this base URL, e.g. http://127.0.0.1:8000, '
+                 'instead of the test client. Seed its database first with --seed-only. Form routes '
+                 'create real messages and appointments there and queue their notification mail.'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help='Parallel requests, with --url only (default: 1)'
+        )
+        parser.add_argument(
+            '--seed-only',
+            action='store_true',
+            help='Add the synthetic rows to the configured database and exit'
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the JSON report to this file instead of stdout'
+        )
+
+    def handle(self, *args, **options):
+        scale = options['scale']
+        if scale < 1:
+            raise CommandError('--scale must be at least 1')
+        if options['requests'] < 1:
+            raise CommandError('--requests must be at least 1')
+        if options['warmup'] < 0:
+            raise CommandError('--warmup cannot be negative')
+        if options['concurrency'] < 1:
+            raise CommandError('--concurrency must be at least 1')
+        routes = [route for route in ROUTES if not options['routes'] or route.name in options['routes']]
+
+        if options['seed_only']:
+            with transaction.atomic():
+                counts = seed_synthetic(scale)
+            for model, count in counts.items():
+                self.stdout.write(f'  {model}: {count}')
+            self.stdout.write(self.style.SUCCESS(f'Seeded {sum(counts.values())} row(s)'))
+            return
+
+        if options['url']:
+            report = run(HTTPTransport(options['url']), routes, requests=options['requests'],
+                         warmup=options['warmup'], concurrency=options['concurrency'],
+                         metadata={'mode': 'http', 'url': options['url']})
+        else:
+            if options['concurrency'] != 1:
+                raise CommandError('--concurrency needs --url; the test client runs requests one at a time')
+            report = self.run_offline(routes, scale, options)
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            for name, result in report['routes'].items():
+                self.stdout.write(f"  {name}: {result['throughput_rps']} req/s, "
+                                  f"p50 {result['p50_ms']} ms, p99 {result['p99_ms']} ms, {result['errors']} error(s)")
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+    def run_offline(self, routes, scale, options):
+        # Same isolation as the test runner: locmem mail and a throwaway
+        # database, plus a cache of its own so the configured one, possibly
+        # shared with production, keeps its pages and rate limit counters
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        try:
+            with override_settings(DEBUG=False, CACHES=BENCHMARK_CACHES):
+                try:
+                    with transaction.atomic():
+                        seed_synthetic(scale)
+                    return run(ClientTransport(), routes, requests=options['requests'],
+                               warmup=options['warmup'], metadata={'mode': 'test-client', 'scale': scale})
+                finally:
+                    cache.clear()
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
@@ -0,0 +1,50 @@
+import urllib.error
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio import vendor_assets
+from portfolio.cache import bump_content_version
+from portfolio.bundles import BUNDLE_DIR, build
+
+
+class Command(BaseCommand):
+    help = ('Write per-page CSS and JS bundles, pruned to the selectors and scripts each page type uses, '
+            'with self-hosted vendor stylesheets and fonts and inlined critical CSS')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=str(Path(settings.STATICFILES_DIRS[0]) / BUNDLE_DIR),
+            help='Directory to write the bundles to; it must be collected as static/bundles/ '
+                 '(default: bundles/ in the first STATICFILES_DIRS entry)'
+        )
+        parser.add_argument(
+            '--refresh-vendor',
+            action='store_true',
+            help='Download the vendor stylesheets and fonts again instead of using VENDOR_ASSET_CACHE'
+        )
+
+    def handle(self, *args, **options):
+        if vendor_assets.font_subset is None:
+            raise CommandError('fontTools is not installed; pip install -r requirements.txt to subset the fonts')
+        try:
+            fetched = vendor_assets.fetch(force=options['refresh_vendor'])
+        except (urllib.error.URLError, OSError) as exc:
+            raise CommandError(
+                f'Could not download the vendor stylesheets into {settings.VENDOR_ASSET_CACHE}: {exc}'
+            )
+        if fetched:
+            self.stdout.write(f'Fetched {", ".join(fetched)} into {settings.VENDOR_ASSET_CACHE}')
+
+        sizes = build(options['output'])
+        # Cached pages still link the previous stylesheets
+        bump_content_version()
+        for name, kinds in sizes.items():
+            self.stdout.write(f'{name}: ' + ', '.join(
+                f'{kind} {source / 1024:.1f} KB -> {output / 1024:.1f} KB' for kind, (source, output) in kinds.items()
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f'Bundles written to {options["output"]}; run collectstatic to publish them'
+        ))
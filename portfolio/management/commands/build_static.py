@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from portfolio.static_export import build
+
+
+class Command(BaseCommand):
+    help = 'Pre-render the public pages and hashed static assets into a directory nginx can serve'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=str(settings.STATIC_SITE_ROOT),
+            help='Directory to write the site to (default: STATIC_SITE_ROOT)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-render every page instead of only those whose content changed'
+        )
+
+    def handle(self, *args, **options):
+        rendered, skipped, removed = build(
+            options['output'],
+            force=options['force'],
+            stdout=self.stdout if options['verbosity'] > 1 else None,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Static site built in {options["output"]}: '
+            f'{rendered} rendered, {skipped} unchanged, {removed} removed'
+        ))
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from portfolio.exports import EXPORTERS
+from portfolio.models import Appointment, ContactMessage
+
+MODELS = {
+    'contact': ContactMessage,
+    'appointment': Appointment,
+}
+
+
+class Command(BaseCommand):
+    help = 'Stream contact messages or appointments to a CSV or JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'inbox',
+            choices=sorted(MODELS),
+            help='Which inbox to export'
+        )
+        parser.add_argument(
+            '--format',
+            choices=sorted(EXPORTERS),
+            default='csv',
+            help='Output format (default: csv)'
+        )
+        parser.add_argument(
+            '--output',
+            help='File to write to (default: stdout)'
+        )
+        parser.add_argument(
+            '--since',
+            help='Only export rows created on or after this date (YYYY-MM-DD)'
+        )
+        parser.add_argument(
+            '--status',
+            help='Only export appointments with this status'
+        )
+
+    def handle(self, *args, **options):
+        model = MODELS[options['inbox']]
+        queryset = model.objects.all()
+        if options['since']:
+            try:
+                since = datetime.strptime(options['since'], '%Y-%m-%d')
+            except ValueError:
+                raise CommandError('--since must be a date in YYYY-MM-DD format')
+            queryset = queryset.filter(created_at__gte=timezone.make_aware(since))
+        if options['status']:
+            if model is not Appointment:
+                raise CommandError('--status only applies to appointments')
+            queryset = queryset.filter(status=options['status'])
+
+        lines = EXPORTERS[options['format']](queryset)
+        if options['output']:
+            count = 0
+            with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+                for line in lines:
+                    output.write(line)
+                    count += 1
+            rows = count - 1 if options['format'] == 'csv' else count
+            self.stderr.write(self.style.SUCCESS(f'Exported {rows} row(s) to {options["output"]}'))
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
@@ -1,18 +1,27 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from portfolio.models import (Profile, Project, Book, Paper, BlogPost, SiteSettings, 
                              StudyNote, StudyChapter, AppointmentType)
+from portfolio.seeding import SeedSpec, seed
 from datetime import date
 
 
 class Command(BaseCommand):
     help = 'Populate the database with initial portfolio data'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sync',
+            action='store_true',
+            help='Reset existing rows to the seeded values instead of only creating missing ones'
+        )
+
     def handle(self, *args, **options):
         self.stdout.write('Populating database with initial data...')
 
-        # Create Profile
-        profile, created = Profile.objects.get_or_create(
-            defaults={
+        # Profile (only created if none exists)
+        profile_data = [
+            {
                 'name': 'Neha Pandey',
                 'title': 'Senior Software Engineer',
                 'bio': '''<p>Senior Software Engineer with 5+ years of experience designing and delivering scalable backend systems and cloud-native architectures.</p>
@@ -27,97 +36,83 @@ class Command(BaseCommand):
                 'medium_url': 'https://medium.com/@nehapandey408',
                 'resume_url': 'https://drive.google.com/file/d/1yKUeSk6wJWc3ajlMoTA7jpVVM09-lz4O/view?usp=drive_link'
             }
-        )
-        if created:
-            self.stdout.write(self.style.SUCCESS('Profile created'))
+        ]
 
-        # Create CPython Study Notes
-        cpython_study, created = StudyNote.objects.get_or_create(
-            book_title='CPython Internals',
-            defaults={
+        # CPython Study Notes
+        study_notes_data = [
+            {
+                'book_title': 'CPython Internals',
                 'book_author': 'Anthony Shaw',
                 'book_description': '''<p>A comprehensive guide to understanding how Python works under the hood. From the lexical analysis to bytecode execution, this book covers the complete journey of Python code execution.</p>
                 
                 <p>Perfect for Python developers who want to understand the internals of the language and contribute to CPython development.</p>''',
                 'book_cover_url': 'https://images-na.ssl-images-amazon.com/images/I/41J9XjNbXzL._SX331_BO1,204,203,200_.jpg',
-                'total_chapters': 8,
-                'completed_chapters': 3,
                 'featured': True
             }
-        )
-        if created:
-            self.stdout.write(self.style.SUCCESS('CPython study notes created'))
-
-            # Create chapters for CPython study
-            chapters_data = [
-                {
-                    'chapter_number': 1,
-                    'title': 'Introduction to CPython',
-                    'description': 'Overview of Python\'s architecture, the role of CPython, and how it differs from other Python implementations. Understanding the compilation pipeline from source to bytecode.',
-                    'status': 'completed',
-                    'notes_url': 'https://medium.com/@nehapandey408/cpython-interpreter-from-source-code-to-execution-36f9084705e0',
-                    'order': 1
-                },
-                {
-                    'chapter_number': 2,
-                    'title': 'Lexical Analysis & Parsing',
-                    'description': 'Deep dive into how Python source code is tokenized and parsed. Understanding the Grammar file, AST generation, and the role of the parser in the compilation process.',
-                    'status': 'completed',
-                    'order': 2
-                },
-                {
-                    'chapter_number': 3,
-                    'title': 'The Compiler',
-                    'description': 'How the AST is compiled into bytecode. Understanding the compilation phases, optimization passes, and the bytecode instruction set.',
-                    'status': 'completed',
-                    'order': 3
-                },
-                {
-                    'chapter_number': 4,
-                    'title': 'The Interpreter Loop',
-                    'description': 'The heart of CPython - the bytecode interpreter. Understanding the evaluation loop, stack operations, and how Python executes bytecode instructions.',
-                    'status': 'in_progress',
-                    'order': 4
-                },
-                {
-                    'chapter_number': 5,
-                    'title': 'Objects & Types',
-                    'description': 'Deep dive into Python\'s object model. Understanding PyObject, reference counting, type objects, and how Python manages memory for different data types.',
-                    'status': 'planned',
-                    'order': 5
-                },
-                {
-                    'chapter_number': 6,
-                    'title': 'Memory Management',
-                    'description': 'Understanding Python\'s memory management, garbage collection, reference counting, and how CPython handles memory allocation and deallocation.',
-                    'status': 'planned',
-                    'order': 6
-                },
-                {
-                    'chapter_number': 7,
-                    'title': 'Concurrency & Threading',
-                    'description': 'The Global Interpreter Lock (GIL), threading in Python, and how CPython handles concurrent execution. Understanding the trade-offs and limitations.',
-                    'status': 'planned',
-                    'order': 7
-                },
-                {
-                    'chapter_number': 8,
-                    'title': 'Extending CPython',
-                    'description': 'Building C extensions, understanding the Python C API, and how to extend CPython with native code for performance-critical applications.',
-                    'status': 'planned',
-                    'order': 8
-                }
-            ]
+        ]
 
-            for chapter_data in chapters_data:
-                StudyChapter.objects.create(
-                    study_note=cpython_study,
-                    **chapter_data
-                )
-            
-            self.stdout.write(self.style.SUCCESS('CPython chapters created'))
+        # Chapters for CPython study
+        chapters_data = [
+            {
+                'chapter_number': 1,
+                'title': 'Introduction to CPython',
+                'description': 'Overview of Python\'s architecture, the role of CPython, and how it differs from other Python implementations. Understanding the compilation pipeline from source to bytecode.',
+                'status': 'completed',
+                'notes_url': 'https://medium.com/@nehapandey408/cpython-interpreter-from-source-code-to-execution-36f9084705e0',
+                'order': 1
+            },
+            {
+                'chapter_number': 2,
+                'title': 'Lexical Analysis & Parsing',
+                'description': 'Deep dive into how Python source code is tokenized and parsed. Understanding the Grammar file, AST generation, and the role of the parser in the compilation process.',
+                'status': 'completed',
+                'order': 2
+            },
+            {
+                'chapter_number': 3,
+                'title': 'The Compiler',
+                'description': 'How the AST is compiled into bytecode. Understanding the compilation phases, optimization passes, and the bytecode instruction set.',
+                'status': 'completed',
+                'order': 3
+            },
+            {
+                'chapter_number': 4,
+                'title': 'The Interpreter Loop',
+                'description': 'The heart of CPython - the bytecode interpreter. Understanding the evaluation loop, stack operations, and how Python executes bytecode instructions.',
+                'status': 'in_progress',
+                'order': 4
+            },
+            {
+                'chapter_number': 5,
+                'title': 'Objects & Types',
+                'description': 'Deep dive into Python\'s object model. Understanding PyObject, reference counting, type objects, and how Python manages memory for different data types.',
+                'status': 'planned',
+                'order': 5
+            },
+            {
+                'chapter_number': 6,
+                'title': 'Memory Management',
+                'description': 'Understanding Python\'s memory management, garbage collection, reference counting, and how CPython handles memory allocation and deallocation.',
+                'status': 'planned',
+                'order': 6
+            },
+            {
+                'chapter_number': 7,
+                'title': 'Concurrency & Threading',
+                'description': 'The Global Interpreter Lock (GIL), threading in Python, and how CPython handles concurrent execution. Understanding the trade-offs and limitations.',
+                'status': 'planned',
+                'order': 7
+            },
+            {
+                'chapter_number': 8,
+                'title': 'Extending CPython',
+                'description': 'Building C extensions, understanding the Python C API, and how to extend CPython with native code for performance-critical applications.',
+                'status': 'planned',
+                'order': 8
+            }
+        ]
 
-        # Create Projects
+        # Projects
         projects_data = [
             {
                 'title': 'AWS Kinesis Data Tools',
@@ -153,15 +148,8 @@ class Command(BaseCommand):
             }
         ]
 
-        for project_data in projects_data:
-            project, created = Project.objects.get_or_create(
-                title=project_data['title'],
-                defaults=project_data
-            )
-            if created:
-                self.stdout.write(f'Project "{project.title}" created')
 
-        # Create Books
+        # Books
         books_data = [
             {
                 'title': 'CPython Internals',
@@ -193,15 +181,8 @@ class Command(BaseCommand):
             }
         ]
 
-        for book_data in books_data:
-            book, created = Book.objects.get_or_create(
-                title=book_data['title'],
-                defaults=book_data
-            )
-            if created:
-                self.stdout.write(f'Book "{book.title}" created')
 
-        # Create Papers
+        # Papers
         papers_data = [
             {
                 'title': 'Bigtable: A Distributed Storage System for Structured Data',
@@ -245,15 +226,8 @@ class Command(BaseCommand):
             }
         ]
 
-        for paper_data in papers_data:
-            paper, created = Paper.objects.get_or_create(
-                title=paper_data['title'],
-                defaults=paper_data
-            )
-            if created:
-                self.stdout.write(f'Paper "{paper.title}" created')
 
-        # Create Blog Posts
+        # Blog Posts
         blog_posts_data = [
             {
                 'title': 'CPython Interpreter: From Source Code to Execution',
@@ -284,26 +258,17 @@ class Command(BaseCommand):
             }
         ]
 
-        for blog_data in blog_posts_data:
-            blog_post, created = BlogPost.objects.get_or_create(
-                title=blog_data['title'],
-                defaults=blog_data
-            )
-            if created:
-                self.stdout.write(f'Blog post "{blog_post.title}" created')
 
-        # Create Site Settings
-        site_settings, created = SiteSettings.objects.get_or_create(
-            defaults={
+        # Site Settings (only created if none exist)
+        site_settings_data = [
+            {
                 'site_title': 'Neha Pandey | Portfolio',
                 'meta_description': 'Senior Software Engineer with 5+ years of experience designing and delivering scalable backend systems and cloud-native architectures.',
                 'footer_text': 'All rights reserved.'
             }
-        )
-        if created:
-            self.stdout.write(self.style.SUCCESS('Site settings created'))
+        ]
 
-        # Create Appointment Types
+        # Appointment Types
         appointment_types_data = [
             {
                 'name': 'Technical Consultation',
@@ -347,12 +312,28 @@ class Command(BaseCommand):
             }
         ]
 
-        for apt_data in appointment_types_data:
-            appointment_type, created = AppointmentType.objects.get_or_create(
-                name=apt_data['name'],
-                defaults=apt_data
-            )
-            if created:
-                self.stdout.write(f'Appointment type "{appointment_type.name}" created')
 
-        self.stdout.write(self.style.SUCCESS('Database populated successfully!'))
\ No newline at end of file
+        sync = options['sync']
+        with transaction.atomic():
+            results = seed([
+                SeedSpec(Profile, (), profile_data),
+                SeedSpec(StudyNote, ('book_title',), study_notes_data),
+            ], sync=sync)
+            cpython_study = StudyNote.objects.get(book_title='CPython Internals')
+            for chapter_data in chapters_data:
+                chapter_data['study_note'] = cpython_study
+            results += seed([
+                SeedSpec(StudyChapter, ('study_note', 'chapter_number'), chapters_data),
+                SeedSpec(Project, ('title',), projects_data),
+                SeedSpec(Book, ('title',), books_data),
+                SeedSpec(Paper, ('title',), papers_data),
+                SeedSpec(BlogPost, ('title',), blog_posts_data),
+                SeedSpec(SiteSettings, (), site_settings_data),
+                SeedSpec(AppointmentType, ('name',), appointment_types_data),
+            ], sync=sync)
+
+        for result in results:
+            self.stdout.write(
+                f'{result.label.title()}: {len(result.created)} created, {len(result.updated)} updated'
+            )
+        self.stdout.write(self.style.SUCCESS('Database populated'))
@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from portfolio.cache import process_local_cache
+from portfolio.images import IMAGE_FIELDS, process_queued, queue_images
+
+
+class Command(BaseCommand):
+    help = 'Generate responsive WebP/AVIF/JPEG derivatives for queued image uploads'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=20,
+            help='Maximum number of images to process per batch'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Queue every image already uploaded before processing, e.g. after changing the widths'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and poll for new uploads instead of exiting once the queue is empty'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds to sleep between polls when the queue is empty (with --loop)'
+        )
+
+    def handle(self, *args, **options):
+        if process_local_cache():
+            self.stderr.write(self.style.WARNING(
+                'The cache is local to this process, so running web workers keep serving pages without '
+                'the new images until PAGE_CACHE_TIMEOUT. Set DJANGO_CACHE_URL to a shared cache.'
+            ))
+        if options['all']:
+            for model, fields in IMAGE_FIELDS.items():
+                for name in fields:
+                    queue_images(model._default_manager.exclude(**{name: ''}).values_list(name, flat=True),
+                                 force=True)
+
+        total_done = total_failed = 0
+        while True:
+            done, failed = process_queued(batch_size=options['batch_size'])
+            total_done += done
+            total_failed += failed
+            if done or failed:
+                self.stdout.write(f'Processed {done} image(s), {failed} failed')
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Image queue drained: {total_done} processed, {total_failed} failed')
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from portfolio.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Regenerate the full-text search documents for every project, book, paper and blog post'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} document(s)'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from portfolio.study_progress import reconcile_progress
+
+
+class Command(BaseCommand):
+    help = 'Recount the total and completed chapters of every study note'
+
+    def handle(self, *args, **options):
+        count = reconcile_progress()
+        self.stdout.write(self.style.SUCCESS(f'Corrected {count} study note(s)'))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from portfolio.metrics import BUCKETS, histograms, percentile, reset
+
+
+def _format(metric, bound):
+    # Percentiles are bucket upper bounds
+    return f'>{BUCKETS[metric][-1]}' if bound is None else f'<={bound}'
+
+
+class Command(BaseCommand):
+    help = 'Show latency, query and template time percentiles per view from the sampled request metrics'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'views',
+            nargs='*',
+            help='View names to show, e.g. portfolio:home (default: every view with samples)'
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Clear the recorded histograms'
+        )
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            reset(options['views'] or None)
+            self.stdout.write(self.style.SUCCESS('Request metrics cleared'))
+            return
+
+        data = histograms(options['views'] or None)
+        if not data:
+            self.stdout.write('No samples recorded; set REQUEST_METRICS_SAMPLE_RATE above 0')
+            return
+
+        header = ('view', 'samples', 'p50 ms', 'p95 ms', 'p99 ms', 'p95 queries', 'p95 db ms', 'p95 tpl ms')
+        rows = []
+        for view, metrics in sorted(data.items()):
+            total = metrics['total_ms']
+            rows.append((
+                view,
+                str(sum(total)),
+                *(_format('total_ms', percentile('total_ms', total, q)) for q in (0.5, 0.95, 0.99)),
+                *(_format(metric, percentile(metric, metrics[metric], 0.95))
+                  for metric in ('queries', 'db_ms', 'template_ms')),
+            ))
+        widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+        for row in [header, *rows]:
+            self.stdout.write('  '.join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
@@ -0,0 +1,195 @@
+"""
+Per-request query and timing metrics.
+
+``RequestMetricsMiddleware`` samples ``REQUEST_METRICS_SAMPLE_RATE`` of the
+requests. For a sampled request it:
+
+- counts the queries and their time with ``connection.execute_wrapper``
+- times template rendering
+- adds a ``Server-Timing`` header
+- folds the numbers into per-view histograms in the shared cache
+
+``python manage.py request_metrics`` prints percentiles from the histograms.
+With the rate at 0 the middleware removes itself at startup. Otherwise an
+unsampled request pays for one ``random()`` call.
+
+Each histogram is a fixed set of bucket counters, so recording a request
+costs a few cache increments and needs no locking between workers.
+"""
+import bisect
+import random
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import Template
+from django.urls import URLResolver, get_resolver
+
+# Upper bounds of each metric's buckets; a final open bucket holds the rest
+BUCKETS = {
+    'total_ms': (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+    'db_ms': (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+    'template_ms': (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+    'queries': (0, 1, 2, 3, 5, 10, 20, 50, 100, 200),
+}
+# Requests that did not resolve to a named URL pattern
+OTHER_VIEW = '<other>'
+KEY_PREFIX = 'portfolio:metrics'
+
+_active = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Query and template timings for one request; also the execute wrapper"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.rendering = False
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+def _timed_render(render):
+    @wraps(render)
+    def wrapper(self, *args, **kwargs):
+        metrics = _active.get()
+        # Only time the outermost render so nested render_to_string calls
+        # are not counted twice
+        if metrics is None or metrics.rendering:
+            return render(self, *args, **kwargs)
+        metrics.rendering = True
+        start = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            metrics.template_time += time.perf_counter() - start
+            metrics.rendering = False
+    wrapper.times_requests = True
+    return wrapper
+
+
+def install_template_timer():
+    if not getattr(Template.render, 'times_requests', False):
+        Template.render = _timed_render(Template.render)
+
+
+def histogram_key(view, metric, index):
+    return f'{KEY_PREFIX}:{view}:{metric}:{index}'
+
+
+def _incr(key):
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def record(view, values):
+    """Count one request's ``{metric: value}`` in the view's histograms"""
+    for metric, value in values.items():
+        _incr(histogram_key(view, metric, bisect.bisect_left(BUCKETS[metric], value)))
+
+
+def view_names(resolver=None, namespace=None):
+    """Every named URL pattern, as ``namespace:name``"""
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            nested = ':'.join(filter(None, [namespace, pattern.namespace])) or None
+            yield from view_names(pattern, nested)
+        elif pattern.name:
+            yield f'{namespace}:{pattern.name}' if namespace else pattern.name
+
+
+def histograms(views=None):
+    """{view: {metric: [bucket counts]}} for views with at least one sample"""
+    views = list(dict.fromkeys(views or [*view_names(), OTHER_VIEW]))
+    keys = [histogram_key(view, metric, index)
+            for view in views for metric, bounds in BUCKETS.items() for index in range(len(bounds) + 1)]
+    counts = cache.get_many(keys)
+    result = {}
+    for view in views:
+        view_histograms = {
+            metric: [counts.get(histogram_key(view, metric, index), 0) for index in range(len(bounds) + 1)]
+            for metric, bounds in BUCKETS.items()
+        }
+        if any(view_histograms['total_ms']):
+            result[view] = view_histograms
+    return result
+
+
+def percentile(metric, counts, fraction):
+    """Upper bound of the bucket holding the given fraction of samples; None if it is the open bucket"""
+    target = fraction * sum(counts)
+    seen = 0
+    for bound, count in zip(BUCKETS[metric], counts):
+        seen += count
+        if seen >= target:
+            return bound
+    return None
+
+
+def reset(views=None):
+    cache.delete_many([
+        histogram_key(view, metric, index)
+        for view in (views or [*view_names(), OTHER_VIEW])
+        for metric, bounds in BUCKETS.items() for index in range(len(bounds) + 1)
+    ])
+
+
+class RequestMetricsMiddleware:
+    """Sample request timings into Server-Timing headers and per-view histograms"""
+
+    def __init__(self, get_response):
+        self.sample_rate = settings.REQUEST_METRICS_SAMPLE_RATE
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        install_template_timer()
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _active.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _active.reset(token)
+        total = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = match.view_name if match and match.url_name else OTHER_VIEW
+        values = {
+            'total_ms': total * 1000,
+            'db_ms': metrics.db_time * 1000,
+            'template_ms': metrics.template_time * 1000,
+            'queries': metrics.queries,
+        }
+        # Template time includes any queries the template runs lazily
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={values["db_ms"]:.1f};desc="{metrics.queries} queries"',
+            f'tpl;dur={values["template_ms"]:.1f}',
+            f'total;dur={values["total_ms"]:.1f}',
+        ])
+        record(view, values)
+        return response
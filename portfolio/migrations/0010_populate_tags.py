@@ -0,0 +1,67 @@
+from django.db import migrations
+from django.utils.text import slugify
+
+
+def split(value):
+    names = []
+    for name in (value or '').split(','):
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def populate_tags(apps, schema_editor):
+    Tag = apps.get_model('portfolio', 'Tag')
+    Project = apps.get_model('portfolio', 'Project')
+    ProjectTechnology = apps.get_model('portfolio', 'ProjectTechnology')
+    BlogPost = apps.get_model('portfolio', 'BlogPost')
+    BlogPostTag = apps.get_model('portfolio', 'BlogPostTag')
+
+    projects = {pk: split(value) for pk, value in Project.objects.values_list('pk', 'technologies')}
+    posts = {pk: split(value) for pk, value in BlogPost.objects.values_list('pk', 'tags')}
+
+    tags = {tag.name: tag for tag in Tag.objects.all()}
+    taken = {tag.slug for tag in tags.values()}
+    new_tags = []
+    for names in [*projects.values(), *posts.values()]:
+        for name in names:
+            if name in tags:
+                continue
+            base = slugify(name)[:110] or 'tag'
+            slug, suffix = base, 2
+            while slug in taken:
+                slug, suffix = f'{base}-{suffix}', suffix + 1
+            taken.add(slug)
+            tags[name] = Tag(name=name, slug=slug)
+            new_tags.append(tags[name])
+    Tag.objects.bulk_create(new_tags)
+    tags = {tag.name: tag for tag in Tag.objects.all()}
+
+    ProjectTechnology.objects.bulk_create([
+        ProjectTechnology(project_id=pk, tag=tags[name], position=position)
+        for pk, names in projects.items()
+        for position, name in enumerate(names)
+    ])
+    BlogPostTag.objects.bulk_create([
+        BlogPostTag(post_id=pk, tag=tags[name], position=position)
+        for pk, names in posts.items()
+        for position, name in enumerate(names)
+    ])
+
+
+def clear_links(apps, schema_editor):
+    apps.get_model('portfolio', 'ProjectTechnology').objects.all().delete()
+    apps.get_model('portfolio', 'BlogPostTag').objects.all().delete()
+    apps.get_model('portfolio', 'Tag').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0009_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_tags, clear_links),
+    ]
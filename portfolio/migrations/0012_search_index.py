@@ -0,0 +1,96 @@
+from django.db import migrations
+from django.utils.html import strip_tags
+
+FTS_TABLE = 'portfolio_searchdocument_fts'
+DOCUMENT_TABLE = 'portfolio_searchdocument'
+
+SQLITE_FORWARD = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, body, content='{DOCUMENT_TABLE}', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+]
+
+SQLITE_REVERSE = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+# model -> (document kind, body fields, link field); mirrors portfolio.search.SEARCHABLE
+SEARCHABLE = {
+    'Project': ('project', ['description', 'technologies'], 'github_url'),
+    'Book': ('book', ['author', 'review'], 'goodreads_url'),
+    'Paper': ('paper', ['authors', 'summary', 'key_insights'], 'paper_url'),
+    'BlogPost': ('blog_post', ['description', 'tags'], 'medium_url'),
+}
+
+
+def _gin_index():
+    # Must match portfolio.search.search_vector() for the planner to use it
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+    return GinIndex(
+        SearchVector('title', weight='A', config='english') + SearchVector('body', weight='B', config='english'),
+        name='searchdocument_vector_idx',
+    )
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                # search() falls back to icontains without the FTS5 table
+                return
+        for statement in SQLITE_FORWARD:
+            schema_editor.execute(statement)
+    elif vendor == 'postgresql':
+        schema_editor.add_index(apps.get_model('portfolio', 'SearchDocument'), _gin_index())
+
+
+def drop_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for statement in SQLITE_REVERSE:
+            schema_editor.execute(statement)
+    elif vendor == 'postgresql':
+        schema_editor.remove_index(apps.get_model('portfolio', 'SearchDocument'), _gin_index())
+
+
+def populate_documents(apps, schema_editor):
+    SearchDocument = apps.get_model('portfolio', 'SearchDocument')
+    documents = []
+    for model_name, (kind, body_fields, url_field) in SEARCHABLE.items():
+        for obj in apps.get_model('portfolio', model_name).objects.all():
+            body = '\n'.join(strip_tags(getattr(obj, name) or '') for name in body_fields)
+            documents.append(SearchDocument(kind=kind, object_id=obj.pk, title=obj.title,
+                                            body=body.strip(), url=getattr(obj, url_field)))
+    SearchDocument.objects.bulk_create(documents)
+
+
+def clear_documents(apps, schema_editor):
+    apps.get_model('portfolio', 'SearchDocument').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0011_searchdocument'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+        migrations.RunPython(populate_documents, clear_documents),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-18 20:17
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def count_chapters(apps, schema_editor):
+    StudyNote = apps.get_model('portfolio', 'StudyNote')
+    notes = list(StudyNote.objects.annotate(
+        total=Count('chapters'),
+        completed=Count('chapters', filter=Q(chapters__status='completed')),
+    ))
+    for note in notes:
+        note.total_chapters, note.completed_chapters = note.total, note.completed
+    StudyNote.objects.bulk_update(notes, ['total_chapters', 'completed_chapters'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0014_idempotencyrecord'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='studynote',
+            name='completed_chapters',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='studynote',
+            name='total_chapters',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_chapters, migrations.RunPython.noop),
+    ]
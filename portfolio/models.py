@@ -1,6 +1,6 @@
 from django.db import models
 from django.urls import reverse
-from django.db import models
+from django.utils import timezone
 
 
 class Profile(models.Model):
@@ -58,6 +58,11 @@ class Skill(models.Model):
     class Meta:
         ordering = ['category', 'order', 'name']
         unique_together = ['name', 'category']
+        indexes = [
+            models.Index(fields=['category', 'order', 'name'], name='skill_order_idx'),
+            models.Index(fields=['category', 'order', 'name'], condition=models.Q(is_featured=True),
+                         name='skill_featured_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_category_display()})"
@@ -127,11 +132,27 @@ class Appointment(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='appointment_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.client_name} - {self.appointment_type.name}"
 
 
+class Tag(models.Model):
+    """A technology or topic shared by projects and blog posts"""
+    name = models.CharField(max_length=100, unique=True)
+    slug = models.SlugField(max_length=120, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
 class Project(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -139,6 +160,7 @@ class Project(models.Model):
     live_url = models.URLField(blank=True, null=True)
     image = models.ImageField(upload_to='projects/', blank=True, null=True)
     technologies = models.CharField(max_length=500, help_text="Comma-separated list of technologies")
+    technology_tags = models.ManyToManyField(Tag, through='ProjectTechnology', related_name='projects', blank=True)
     featured = models.BooleanField(default=False)
     order = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -146,6 +168,12 @@ class Project(models.Model):
 
     class Meta:
         ordering = ['order', '-created_at']
+        # Trailing -id matches the tie-breaker used by keyset pagination
+        indexes = [
+            models.Index(fields=['order', '-created_at', '-id'], name='project_order_idx'),
+            models.Index(fields=['order', '-created_at', '-id'], condition=models.Q(featured=True),
+                         name='project_featured_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -153,6 +181,28 @@ class Project(models.Model):
     def get_technologies_list(self):
         return [tech.strip() for tech in self.technologies.split(',') if tech.strip()]
 
+    def get_technology_tags(self):
+        """Technology tags in display order, from prefetched links when available"""
+        links = self.technology_links.all()
+        if 'technology_links' not in getattr(self, '_prefetched_objects_cache', {}):
+            links = links.select_related('tag')
+        return [link.tag for link in links]
+
+
+class ProjectTechnology(models.Model):
+    """Link between a project and one of its technologies, kept in sync with Project.technologies"""
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='technology_links')
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='project_links')
+    position = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        ordering = ['position']
+        # Tag first, so "projects using X" is answered from this index
+        unique_together = ['tag', 'project']
+
+    def __str__(self):
+        return f"{self.project} - {self.tag}"
+
 
 class Book(models.Model):
     CATEGORY_CHOICES = [
@@ -179,6 +229,12 @@ class Book(models.Model):
 
     class Meta:
         ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(fields=['order', '-created_at', '-id'], name='book_order_idx'),
+            models.Index(fields=['category', 'order', '-created_at', '-id'], name='book_category_order_idx'),
+            models.Index(fields=['order', '-created_at', '-id'], condition=models.Q(featured=True),
+                         name='book_featured_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.author}"
@@ -191,13 +247,15 @@ class StudyNote(models.Model):
         ('in_progress', 'In Progress'),
         ('planned', 'Planned'),
     ]
+    COUNTER_FIELDS = ('total_chapters', 'completed_chapters')
 
     book_title = models.CharField(max_length=200)
     book_author = models.CharField(max_length=200)
     book_description = models.TextField(blank=True)
     book_cover_url = models.URLField(blank=True, help_text="URL to book cover image")
-    total_chapters = models.IntegerField(default=0)
-    completed_chapters = models.IntegerField(default=0)
+    # Maintained from the chapters by portfolio.study_progress
+    total_chapters = models.IntegerField(default=0, editable=False)
+    completed_chapters = models.IntegerField(default=0, editable=False)
     featured = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -208,6 +266,14 @@ class StudyNote(models.Model):
     def __str__(self):
         return f"{self.book_title} - Study Notes"
 
+    def save(self, *args, **kwargs):
+        # Chapter saves adjust the counters in place; writing back this
+        # instance's copy could undo a change made since it was loaded
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [field.name for field in self._meta.concrete_fields
+                                       if not field.primary_key and field.name not in self.COUNTER_FIELDS]
+        super().save(*args, **kwargs)
+
     def get_progress_percentage(self):
         if self.total_chapters == 0:
             return 0
@@ -265,6 +331,12 @@ class Paper(models.Model):
 
     class Meta:
         ordering = ['order', '-created_at']
+        indexes = [
+            models.Index(fields=['order', '-created_at', '-id'], name='paper_order_idx'),
+            models.Index(fields=['category', 'order', '-created_at', '-id'], name='paper_category_order_idx'),
+            models.Index(fields=['order', '-created_at', '-id'], condition=models.Q(featured=True),
+                         name='paper_featured_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -276,6 +348,7 @@ class BlogPost(models.Model):
     medium_url = models.URLField()
     image = models.ImageField(upload_to='blog/', blank=True, null=True)
     tags = models.CharField(max_length=300, help_text="Comma-separated list of tags")
+    tag_set = models.ManyToManyField(Tag, through='BlogPostTag', related_name='blog_posts', blank=True)
     featured = models.BooleanField(default=False)
     published_date = models.DateField()
     order = models.IntegerField(default=0)
@@ -284,6 +357,11 @@ class BlogPost(models.Model):
 
     class Meta:
         ordering = ['order', '-published_date']
+        indexes = [
+            models.Index(fields=['order', '-published_date', '-id'], name='blogpost_order_idx'),
+            models.Index(fields=['order', '-published_date', '-id'], condition=models.Q(featured=True),
+                         name='blogpost_featured_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -291,6 +369,28 @@ class BlogPost(models.Model):
     def get_tags_list(self):
         return [tag.strip() for tag in self.tags.split(',') if tag.strip()]
 
+    def get_tag_objects(self):
+        """Tags in display order, from prefetched links when available"""
+        links = self.tag_links.all()
+        if 'tag_links' not in getattr(self, '_prefetched_objects_cache', {}):
+            links = links.select_related('tag')
+        return [link.tag for link in links]
+
+
+class BlogPostTag(models.Model):
+    """Link between a blog post and one of its tags, kept in sync with BlogPost.tags"""
+    post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='tag_links')
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='blog_post_links')
+    position = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        ordering = ['position']
+        # Tag first, so "posts tagged X" is answered from this index
+        unique_together = ['tag', 'post']
+
+    def __str__(self):
+        return f"{self.post} - {self.tag}"
+
 
 class ContactMessage(models.Model):
     sender_email = models.EmailField()
@@ -301,6 +401,9 @@ class ContactMessage(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='contactmessage_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.subject} - {self.sender_email}"
@@ -321,4 +424,106 @@ class SiteSettings(models.Model):
         verbose_name_plural = "Site Settings"
 
     def __str__(self):
-        return "Site Settings"
\ No newline at end of file
+        return "Site Settings"
+
+
+class OutboundEmail(models.Model):
+    """Outgoing email queued by the request path and delivered by send_queued_mail"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['next_attempt_at'], condition=models.Q(status='pending'),
+                         name='outboundemail_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)}"
+
+
+class SearchDocument(models.Model):
+    """Searchable text of one project, book, paper or blog post, maintained by portfolio.search"""
+    KIND_CHOICES = [
+        ('project', 'Project'),
+        ('book', 'Book'),
+        ('paper', 'Paper'),
+        ('blog_post', 'Blog Post'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=300)
+    body = models.TextField(blank=True)
+    url = models.URLField(max_length=500)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['kind', 'object_id']
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
+
+
+class IdempotencyRecord(models.Model):
+    """Stored response of a form submission, replayed for repeats of the same submission"""
+    scope = models.CharField(max_length=50)
+    key = models.CharField(max_length=64, help_text="SHA-256 of the Idempotency-Key header or of the submitted content")
+    status_code = models.PositiveSmallIntegerField(blank=True, null=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    body = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at']
+        unique_together = ['scope', 'key']
+        indexes = [
+            models.Index(fields=['expires_at'], name='idempotency_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}:{self.key[:12]}"
+
+
+class ResponsiveImage(models.Model):
+    """Resized WebP/AVIF/JPEG copies of an uploaded image, written by process_images"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
+    source = models.CharField(max_length=255, unique=True, help_text="Storage name of the original upload")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    width = models.PositiveIntegerField(blank=True, null=True)
+    height = models.PositiveIntegerField(blank=True, null=True)
+    variants = models.JSONField(default=dict, help_text="Format -> widths written next to the original")
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-updated_at']
+        indexes = [
+            models.Index(fields=['updated_at'], condition=models.Q(status='pending'),
+                         name='responsiveimage_pending_idx'),
+        ]
+
+    def __str__(self):
+        return self.source
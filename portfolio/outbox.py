@@ -0,0 +1,115 @@
+"""
+Database-backed outbox for outgoing email.
+
+Views call ``enqueue()``, which writes every message in a single INSERT and
+returns immediately. The ``send_queued_mail`` management command drains the
+queue with ``deliver_due()``, retrying failed sends with exponential backoff
+until ``EMAIL_OUTBOX_MAX_ATTEMPTS`` is reached.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(*messages):
+    """Queue EmailMessage objects for background delivery"""
+    rows = []
+    for message in messages:
+        # Building the MIME message validates the headers, so BadHeaderError
+        # still reaches the caller instead of surfacing later in the worker.
+        message.message()
+        rows.append(OutboundEmail(
+            subject=message.subject,
+            body=message.body,
+            from_email=message.from_email or settings.DEFAULT_FROM_EMAIL,
+            recipients=list(message.to),
+        ))
+    return OutboundEmail.objects.bulk_create(rows)
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt, after ``attempts`` failed sends"""
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_RETRY_DELAY))
+
+
+def claim_due(batch_size):
+    """
+    Lease up to ``batch_size`` due messages to this worker.
+
+    Claimed rows have their next attempt pushed past the lease so that a
+    concurrent worker skips them, and a worker that dies mid-send releases
+    them once the lease runs out.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due = (OutboundEmail.objects
+               .select_for_update(skip_locked=True)
+               .filter(status='pending', next_attempt_at__lte=now)
+               .order_by('next_attempt_at')[:batch_size])
+        ids = list(due.values_list('id', flat=True))
+        OutboundEmail.objects.filter(id__in=ids).update(
+            attempts=F('attempts') + 1,
+            next_attempt_at=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE),
+        )
+    return list(OutboundEmail.objects.filter(id__in=ids).order_by('next_attempt_at', 'id'))
+
+
+def _mark_failed_attempt(outbound, error):
+    outbound.last_error = str(error)
+    if outbound.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        outbound.status = 'failed'
+        logger.error('Giving up on outbound email %s after %s attempts: %s',
+                     outbound.pk, outbound.attempts, error)
+    else:
+        outbound.next_attempt_at = timezone.now() + retry_delay(outbound.attempts)
+    outbound.save(update_fields=['status', 'last_error', 'next_attempt_at'])
+
+
+def deliver_due(batch_size=50, connection=None):
+    """Send one batch of due messages; returns (sent, failed) counts"""
+    batch = claim_due(batch_size)
+    if not batch:
+        return 0, 0
+
+    sent = failed = 0
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        for outbound in batch:
+            _mark_failed_attempt(outbound, e)
+        return 0, len(batch)
+
+    try:
+        for outbound in batch:
+            message = EmailMessage(
+                subject=outbound.subject,
+                body=outbound.body,
+                from_email=outbound.from_email,
+                to=outbound.recipients,
+                connection=connection,
+            )
+            try:
+                connection.send_messages([message])
+            except Exception as e:
+                _mark_failed_attempt(outbound, e)
+                failed += 1
+            else:
+                outbound.status = 'sent'
+                outbound.sent_at = timezone.now()
+                outbound.last_error = ''
+                outbound.save(update_fields=['status', 'sent_at', 'last_error'])
+                sent += 1
+    finally:
+        connection.close()
+    return sent, failed
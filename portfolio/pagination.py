@@ -0,0 +1,146 @@
+"""
+Keyset (cursor) pagination for the public list pages.
+
+OFFSET pagination makes the database walk past every earlier row, so deep
+pages get slower as the catalogue grows. A keyset page instead filters on the
+ordering columns of the row at the page boundary, which an index on those
+columns can answer directly for any page.
+
+Cursors are opaque to clients: a URL-safe base64 encoding of the boundary
+row's ordering values and the direction to read in. Ordering fields must be
+non-nullable; the primary key is appended as a tie-breaker so that every
+row has a unique position.
+"""
+import base64
+import datetime
+import decimal
+import json
+
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _json_default(value):
+    # Full precision: DjangoJSONEncoder truncates datetimes to milliseconds,
+    # which would make the boundary comparison skip or repeat rows.
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    raise TypeError(f'Cannot encode {type(value).__name__} in a cursor')
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+class KeysetPaginator:
+    def __init__(self, queryset, per_page, ordering=None):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.model = queryset.model
+        ordering = list(ordering or queryset.query.order_by or self.model._meta.ordering)
+        if not any(name.lstrip('-') in ('pk', self.model._meta.pk.name) for name in ordering):
+            ordering.append('-pk' if ordering and ordering[-1].startswith('-') else 'pk')
+        # (field name, descending) pairs
+        self.ordering = [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+
+    def _field(self, name):
+        if name == 'pk':
+            return self.model._meta.pk
+        return self.model._meta.get_field(name)
+
+    def encode_cursor(self, obj, direction):
+        values = [getattr(obj, name) for name, _ in self.ordering]
+        payload = json.dumps({'d': direction, 'k': values}, default=_json_default, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            direction, values = payload['d'], payload['k']
+            if direction not in ('next', 'prev') or len(values) != len(self.ordering):
+                raise InvalidCursor('Cursor does not match this ordering.')
+            keys = [self._field(name).to_python(value) for (name, _), value in zip(self.ordering, values)]
+        except InvalidCursor:
+            raise
+        except Exception as e:
+            raise InvalidCursor('Malformed cursor.') from e
+        return direction, keys
+
+    def _after(self, keys, ordering):
+        """Q matching rows strictly after the given keys in ``ordering``"""
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(ordering, keys):
+            lookup = f'{name}__lt' if descending else f'{name}__gt'
+            condition |= equal & Q(**{lookup: value})
+            equal &= Q(**{name: value})
+        return condition
+
+    @staticmethod
+    def _order_by(ordering):
+        return [f'-{name}' if descending else name for name, descending in ordering]
+
+    def page(self, cursor=None):
+        """Return the page a cursor points to, raising InvalidCursor if it is bad"""
+        if not cursor:
+            rows = list(self.queryset.order_by(*self._order_by(self.ordering))[:self.per_page + 1])
+            has_next, has_previous = len(rows) > self.per_page, False
+            rows = rows[:self.per_page]
+        else:
+            direction, keys = self.decode_cursor(cursor)
+            if direction == 'next':
+                ordering = self.ordering
+            else:
+                ordering = [(name, not descending) for name, descending in self.ordering]
+            queryset = self.queryset.filter(self._after(keys, ordering))
+            rows = list(queryset.order_by(*self._order_by(ordering))[:self.per_page + 1])
+            more = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            if direction == 'next':
+                has_next, has_previous = more, True
+            else:
+                rows.reverse()
+                has_next, has_previous = True, more
+
+        return KeysetPage(
+            rows,
+            next_cursor=self.encode_cursor(rows[-1], 'next') if rows and has_next else None,
+            previous_cursor=self.encode_cursor(rows[0], 'prev') if rows and has_previous else None,
+        )
+
+    def get_page(self, cursor=None):
+        """Like page(), but fall back to the first page for a bad cursor"""
+        try:
+            return self.page(cursor)
+        except InvalidCursor:
+            return self.page()
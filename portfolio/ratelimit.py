@@ -0,0 +1,142 @@
+"""
+Sliding-window rate limiting for the public form endpoints.
+
+Each limit keeps two fixed-window counters in the cache, one for the current
+window and one for the previous window. The previous count is weighted by how
+much of it still overlaps the sliding window, which approximates a true
+sliding log at the cost of one increment and one read per limit. The
+increment comes first and the decision is made from the count it returns,
+so concurrent workers can't all read the same count and all get through; a
+rejected request takes its increment back.
+
+Limits come from ``settings.RATE_LIMITS``, per endpoint and per key:
+
+    RATE_LIMITS = {'contact': {'ip': (5, 600), 'email': (3, 3600)}}
+
+means at most 5 requests per client IP per 10 minutes, and 3 per submitted
+email address per hour. Use a shared cache backend in production so that
+every worker counts against the same windows.
+"""
+import hashlib
+import json
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+
+
+def client_ip(request):
+    """Client address from ``RATE_LIMIT_IP_META``; set it to the proxy's header behind nginx"""
+    value = request.META.get(settings.RATE_LIMIT_IP_META) or request.META.get('REMOTE_ADDR', '')
+    # A proxy appends the address it saw to X-Forwarded-For; the entries
+    # before it come from the client and can be forged
+    return value.split(',')[-1].strip()
+
+
+class Limit:
+    """One sliding-window limit applied to one key value"""
+
+    def __init__(self, scope, kind, value, limit, window):
+        self.limit = limit
+        self.window = window
+        digest = hashlib.sha256(value.encode()).hexdigest()[:32]
+        self.prefix = f'portfolio:ratelimit:{scope}:{kind}:{window}:{digest}'
+
+    def _key(self, index):
+        return f'{self.prefix}:{index}'
+
+    def hit(self, now):
+        """
+        Count one request; returns 0 if it fits in the window, else seconds
+        until it would. A rejected request must be taken back with release().
+        """
+        index, elapsed = divmod(now, self.window)
+        index = int(index)
+        key = self._key(index)
+        # Counters must outlive the following window to be read as "previous"
+        if cache.add(key, 1, timeout=self.window * 2):
+            count = 1
+        else:
+            try:
+                count = cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, timeout=self.window * 2)
+                count = 1
+        previous = cache.get(self._key(index - 1), 0)
+        if previous * (1 - elapsed / self.window) + count <= self.limit:
+            return 0
+        # Requests counted before this one
+        current = count - 1
+        if current + 1 > self.limit:
+            # Wait for the next window, then for this window's weight to decay
+            wait = (self.window - elapsed) + self.window * (1 - (self.limit - 1) / current)
+        else:
+            wait = self.window * (1 - (self.limit - current - 1) / previous) - elapsed
+        return max(1, math.ceil(wait))
+
+    def release(self, now):
+        try:
+            cache.decr(self._key(int(now // self.window)))
+        except ValueError:
+            # Expired in between; nothing left to take back
+            pass
+
+
+def check(limits, now=None):
+    """
+    Count a request against every limit, unless one of them is exhausted.
+
+    Returns 0 if the request is allowed, otherwise the number of seconds
+    until it would be. Rejected requests are not counted.
+    """
+    now = time.time() if now is None else now
+    retry_after = max((limit.hit(now) for limit in limits), default=0)
+    if retry_after:
+        for limit in limits:
+            limit.release(now)
+    return retry_after
+
+
+def _submitted_email(request, field):
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return ''
+    value = data.get(field) if isinstance(data, dict) else None
+    return value.strip().lower() if isinstance(value, str) else ''
+
+
+def rate_limit(scope, email_field=None):
+    """
+    Reject requests over the ``RATE_LIMITS[scope]`` limits with a 429.
+
+    The check runs before the view, so a throttled request saves nothing and
+    sends no mail. ``email_field`` names the JSON body field holding the
+    submitter's address for the ``email`` limit.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            limits = settings.RATE_LIMITS.get(scope, {})
+            keys = {'ip': client_ip(request)}
+            if email_field and 'email' in limits:
+                keys['email'] = _submitted_email(request, email_field)
+
+            retry_after = check([
+                Limit(scope, kind, keys[kind], limit, window)
+                for kind, (limit, window) in limits.items()
+                if keys.get(kind)
+            ])
+            if retry_after:
+                response = JsonResponse({
+                    'success': False,
+                    'message': 'Too many requests. Please try again later.'
+                }, status=429)
+                response['Retry-After'] = str(retry_after)
+                return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,148 @@
+"""
+Full-text search over projects, books, papers and blog posts.
+
+Every searchable row is mirrored into a ``SearchDocument`` (title plus a
+plain-text body) on save, seed and delete. The documents carry a real
+full-text index, created by migration 0012 for the database in use:
+
+* SQLite: an FTS5 external-content table kept in step by triggers, ranked
+  with ``bm25()``.
+* PostgreSQL: a GIN index on the weighted ``tsvector`` expression below,
+  ranked with ``ts_rank``.
+
+Both answer a query from the index and only rank the matching rows, so
+latency tracks the number of hits rather than the size of the corpus. Other
+databases fall back to ``icontains`` scans.
+"""
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.utils.html import strip_tags
+
+from .models import BlogPost, Book, Paper, Project, SearchDocument
+
+FTS_TABLE = 'portfolio_searchdocument_fts'
+# Title matches count for more than body matches
+TITLE_WEIGHT, BODY_WEIGHT = 10.0, 1.0
+SEARCH_CONFIG = 'english'
+
+# model -> (document kind, body fields, link field)
+SEARCHABLE = {
+    Project: ('project', ['description', 'technologies'], 'github_url'),
+    Book: ('book', ['author', 'review'], 'goodreads_url'),
+    Paper: ('paper', ['authors', 'summary', 'key_insights'], 'paper_url'),
+    BlogPost: ('blog_post', ['description', 'tags'], 'medium_url'),
+}
+
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def search_vector():
+    """The tsvector expression the PostgreSQL GIN index is built on"""
+    from django.contrib.postgres.search import SearchVector
+    return (SearchVector('title', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('body', weight='B', config=SEARCH_CONFIG))
+
+
+def build_document(obj):
+    kind, body_fields, url_field = SEARCHABLE[type(obj)]
+    body = '\n'.join(strip_tags(getattr(obj, name) or '') for name in body_fields)
+    return SearchDocument(kind=kind, object_id=obj.pk, title=obj.title, body=body.strip(),
+                          url=getattr(obj, url_field))
+
+
+def index_objects(objects):
+    """Create or refresh the documents for ``objects`` in one statement"""
+    documents = [build_document(obj) for obj in objects if obj.pk is not None]
+    SearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=['kind', 'object_id'],
+        update_fields=['title', 'body', 'url', 'updated_at'],
+    )
+
+
+def remove_object(obj):
+    kind = SEARCHABLE[type(obj)][0]
+    SearchDocument.objects.filter(kind=kind, object_id=obj.pk).delete()
+
+
+def rebuild_index():
+    """Drop and regenerate every document; returns the number indexed"""
+    SearchDocument.objects.all().delete()
+    count = 0
+    for model in SEARCHABLE:
+        objects = list(model._default_manager.all())
+        index_objects(objects)
+        count += len(objects)
+    connection = connections[SearchDocument.objects.db]
+    if _backend(connection) == 'fts5':
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return count
+
+
+# (alias, database name) -> backend, so the FTS5 table check runs once
+_backends = {}
+
+
+def _backend(connection):
+    key = (connection.alias, connection.settings_dict['NAME'])
+    if key not in _backends:
+        if connection.vendor == 'postgresql':
+            _backends[key] = 'postgresql'
+        elif connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names():
+            _backends[key] = 'fts5'
+        else:
+            _backends[key] = None
+    return _backends[key]
+
+
+def _fts5_query(tokens):
+    # Quote every token so user input can't use FTS5 operators, and let the
+    # last one match as a prefix for search-as-you-type.
+    quoted = ['"{}"'.format(token.replace('"', '')) for token in tokens]
+    return ' '.join(quoted) + '*'
+
+
+def search(query, limit=20):
+    """Return up to ``limit`` SearchDocuments matching ``query``, best first"""
+    tokens = _TOKEN_RE.findall(query or '')
+    if not tokens:
+        return []
+
+    connection = connections[SearchDocument.objects.db]
+    backend = _backend(connection)
+    if backend == 'fts5':
+        table = SearchDocument._meta.db_table
+        return list(SearchDocument.objects.raw(
+            f'SELECT d.*, bm25({FTS_TABLE}, %s, %s) AS rank '
+            f'FROM {FTS_TABLE} JOIN {table} d ON d.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s ORDER BY rank, d.id LIMIT %s',
+            [TITLE_WEIGHT, BODY_WEIGHT, _fts5_query(tokens), limit],
+        ))
+    if backend == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+        search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+        return list(SearchDocument.objects
+                    .annotate(vector=search_vector())
+                    .filter(vector=search_query)
+                    .annotate(rank=SearchRank(search_vector(), search_query))
+                    .order_by('-rank', 'id')[:limit])
+
+    documents = SearchDocument.objects.all()
+    for token in tokens:
+        documents = documents.filter(Q(title__icontains=token) | Q(body__icontains=token))
+    return list(documents.order_by('kind', 'title')[:limit])
+
+
+def content_changed(sender, instance=None, raw=False, created=(), updated=(), **kwargs):
+    """post_save / rows_seeded receiver for the searchable models"""
+    if raw:
+        return
+    index_objects([instance] if instance is not None else [*created, *updated])
+
+
+def content_deleted(sender, instance, **kwargs):
+    remove_object(instance)
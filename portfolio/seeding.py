@@ -0,0 +1,116 @@
+"""
+Declarative, idempotent seeding.
+
+Each ``SeedSpec`` lists the rows a model should contain and the fields that
+identify a row. ``seed()`` reads the matching rows with one query per spec,
+then creates whatever is missing with ``bulk_create`` and, when syncing,
+rewrites drifted rows with ``bulk_update`` -- all inside one transaction.
+
+Bulk writes do not send ``post_save``, so ``rows_seeded`` is sent once per
+spec instead for receivers that keep caches and derived data up to date.
+"""
+from dataclasses import dataclass, field
+from functools import reduce
+from operator import or_
+
+from django.db import models, transaction
+from django.db.models import Q
+from django.dispatch import Signal
+from django.utils import timezone
+
+# Sent with sender=model, created=[...], updated=[...] after each spec is applied
+rows_seeded = Signal()
+
+
+@dataclass
+class SeedSpec:
+    model: type
+    # Fields identifying a row; empty for singletons such as Profile
+    lookup: tuple
+    rows: list
+
+
+@dataclass
+class SeedResult:
+    model: type
+    created: list = field(default_factory=list)
+    updated: list = field(default_factory=list)
+
+    @property
+    def label(self):
+        return self.model._meta.verbose_name_plural
+
+
+def _comparable(model, name, value):
+    """Normalise a row value so it compares equal to what the database returns"""
+    model_field = model._meta.get_field(name)
+    if model_field.is_relation:
+        return value.pk if isinstance(value, models.Model) else value
+    return model_field.to_python(value)
+
+
+def _current(obj, name):
+    model_field = obj._meta.get_field(name)
+    return getattr(obj, model_field.attname if model_field.is_relation else name)
+
+
+def _existing(spec):
+    queryset = spec.model._default_manager.all()
+    if not spec.lookup:
+        return {(): obj for obj in queryset[:1]}
+    condition = reduce(or_, (Q(**{name: row[name] for name in spec.lookup}) for row in spec.rows))
+    return {tuple(_current(obj, name) for name in spec.lookup): obj
+            for obj in queryset.filter(condition)}
+
+
+def apply_spec(spec, sync=False):
+    result = SeedResult(spec.model)
+    if not spec.rows:
+        return result
+
+    existing = _existing(spec)
+    to_create, to_update, changed_fields = [], [], set()
+    for row in spec.rows:
+        key = tuple(_comparable(spec.model, name, row[name]) for name in spec.lookup)
+        obj = existing.get(key)
+        if obj is None:
+            to_create.append(spec.model(**row))
+            continue
+        if not sync:
+            continue
+        changed = [name for name, value in row.items()
+                   if _current(obj, name) != _comparable(spec.model, name, value)]
+        if changed:
+            for name in changed:
+                setattr(obj, name, row[name])
+            to_update.append(obj)
+            changed_fields.update(changed)
+
+    if to_create:
+        result.created = spec.model._default_manager.bulk_create(to_create)
+    if to_update:
+        # bulk_update() bypasses save(), so auto_now fields need setting by hand
+        now = timezone.now()
+        for model_field in spec.model._meta.concrete_fields:
+            if getattr(model_field, 'auto_now', False):
+                for obj in to_update:
+                    setattr(obj, model_field.attname, now)
+                changed_fields.add(model_field.name)
+        spec.model._default_manager.bulk_update(to_update, sorted(changed_fields))
+        result.updated = to_update
+
+    if result.created or result.updated:
+        rows_seeded.send(sender=spec.model, created=result.created, updated=result.updated)
+    return result
+
+
+def seed(specs, sync=False):
+    """
+    Apply seed specs in order inside one transaction.
+
+    Existing rows are left untouched unless ``sync`` is true, so admin edits
+    survive routine deploys; with ``sync`` every seeded field is reset to
+    the declared value.
+    """
+    with transaction.atomic():
+        return [apply_spec(spec, sync=sync) for spec in specs]
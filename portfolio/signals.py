@@ -0,0 +1,53 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+
+from .cache import bump_content_version
+from .models import BlogPost, Book, Paper, Profile, Project, SiteSettings, Skill, StudyChapter, Tag
+from .images import IMAGE_FIELDS, images_changed
+from .search import SEARCHABLE, content_changed, content_deleted
+from .seeding import rows_seeded
+from .skills import skills_changed
+from .study_progress import chapter_deleted, chapter_saved, chapters_seeded, remember_state
+from .tags import TAGGED_FIELDS, tags_changed
+
+# Models whose rows are rendered on the cached public pages
+CACHED_CONTENT_MODELS = [Profile, SiteSettings, Project, Book, Paper, BlogPost, Skill, Tag]
+
+
+def invalidate_content(**kwargs):
+    # Bump immediately so this request sees fresh pages, and again on commit:
+    # a page rendered by another request before the commit became visible
+    # would otherwise be cached under the new version with the old content.
+    bump_content_version()
+    transaction.on_commit(bump_content_version)
+
+
+for model in CACHED_CONTENT_MODELS:
+    post_save.connect(invalidate_content, sender=model,
+                      dispatch_uid=f'invalidate_content_save_{model.__name__}')
+    post_delete.connect(invalidate_content, sender=model,
+                        dispatch_uid=f'invalidate_content_delete_{model.__name__}')
+    rows_seeded.connect(invalidate_content, sender=model,
+                        dispatch_uid=f'invalidate_content_seed_{model.__name__}')
+
+post_save.connect(skills_changed, sender=Skill, dispatch_uid='skills_changed_save')
+post_delete.connect(skills_changed, sender=Skill, dispatch_uid='skills_changed_delete')
+rows_seeded.connect(skills_changed, sender=Skill, dispatch_uid='skills_changed_seed')
+
+for model in TAGGED_FIELDS:
+    post_save.connect(tags_changed, sender=model, dispatch_uid=f'tags_changed_save_{model.__name__}')
+    rows_seeded.connect(tags_changed, sender=model, dispatch_uid=f'tags_changed_seed_{model.__name__}')
+
+for model in SEARCHABLE:
+    post_save.connect(content_changed, sender=model, dispatch_uid=f'search_index_save_{model.__name__}')
+    post_delete.connect(content_deleted, sender=model, dispatch_uid=f'search_index_delete_{model.__name__}')
+    rows_seeded.connect(content_changed, sender=model, dispatch_uid=f'search_index_seed_{model.__name__}')
+
+post_init.connect(remember_state, sender=StudyChapter, dispatch_uid='study_progress_init')
+post_save.connect(chapter_saved, sender=StudyChapter, dispatch_uid='study_progress_save')
+post_delete.connect(chapter_deleted, sender=StudyChapter, dispatch_uid='study_progress_delete')
+rows_seeded.connect(chapters_seeded, sender=StudyChapter, dispatch_uid='study_progress_seed')
+
+for model in IMAGE_FIELDS:
+    post_save.connect(images_changed, sender=model, dispatch_uid=f'images_changed_save_{model.__name__}')
+    rows_seeded.connect(images_changed, sender=model, dispatch_uid=f'images_changed_seed_{model.__name__}')
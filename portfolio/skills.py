@@ -0,0 +1,73 @@
+"""
+Precomputed skills section for the homepage.
+
+The featured skills, grouped by category label in display order, are built
+once per Skill write and stored in the shared cache. Each process also keeps
+the last copy it loaded and only re-reads it when the shared version number
+moves, so a homepage render costs one small cache read instead of a Skill
+scan and a Python grouping loop.
+"""
+import time
+from typing import NamedTuple, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Skill
+
+SKILLS_KEY = 'portfolio:skills_by_category'
+SKILLS_VERSION_KEY = 'portfolio:skills_by_category:version'
+
+# Last structure this process loaded: (version, skills_by_category)
+_local = (None, None)
+
+
+class SkillEntry(NamedTuple):
+    name: str
+    icon_class: str
+    proficiency: str
+    years_experience: Optional[int]
+
+
+def build_skills_by_category():
+    """Group featured skills by category label, in display order"""
+    categories = dict(Skill.CATEGORY_CHOICES)
+    skills_by_category = {}
+    rows = (Skill.objects.filter(is_featured=True)
+            .order_by('category', 'order', 'name')
+            .values_list('category', 'name', 'icon_class', 'proficiency_level', 'years_experience'))
+    for category, name, icon_class, level, years in rows:
+        proficiency = Skill(proficiency_level=level).get_proficiency_display_text()
+        skills_by_category.setdefault(categories.get(category, category), []).append(
+            SkillEntry(name, icon_class, proficiency, years)
+        )
+    return {label: tuple(entries) for label, entries in skills_by_category.items()}
+
+
+def rebuild_skills_by_category():
+    global _local
+    skills_by_category = build_skills_by_category()
+    version = time.time_ns()
+    cache.set_many({SKILLS_KEY: (version, skills_by_category), SKILLS_VERSION_KEY: version}, timeout=None)
+    _local = (version, skills_by_category)
+    return skills_by_category
+
+
+def get_skills_by_category():
+    global _local
+    version = cache.get(SKILLS_VERSION_KEY)
+    if version is not None:
+        if _local[0] == version:
+            return _local[1]
+        stored = cache.get(SKILLS_KEY)
+        if stored is not None and stored[0] == version:
+            _local = stored
+            return stored[1]
+    return rebuild_skills_by_category()
+
+
+def skills_changed(**kwargs):
+    # Drop the version now so readers inside this transaction rebuild, and
+    # rebuild for everyone else once the write is visible to them.
+    cache.delete(SKILLS_VERSION_KEY)
+    transaction.on_commit(rebuild_skills_by_category)
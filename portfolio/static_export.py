@@ -0,0 +1,186 @@
+"""
+Static export of the public pages.
+
+``build_static`` renders the homepage, every list page, every ``?category=``
+variant, every tag page and every study note to plain HTML files under
+``STATIC_SITE_ROOT``, next to a hashed copy of the static assets, so nginx
+can serve them without touching Python. List pages are exported unpaginated, since a cursor query
+string has no file to map to.
+
+Builds are incremental. The build manifest records a fingerprint of every
+model the pages read; on the next run only pages that depend on a model
+whose fingerprint moved are re-rendered. A change to the templates or the
+static assets invalidates every page.
+"""
+import hashlib
+import io
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.handlers.wsgi import WSGIRequest
+from django.core.management import call_command
+from django.urls import resolve, reverse
+
+from . import views
+from .cache import content_fingerprints, template_fingerprint
+from .homepage import HOMEPAGE_MODELS
+from .models import BlogPost, Book, Paper, Project, ResponsiveImage, StudyChapter, StudyNote, Tag
+
+MANIFEST_NAME = '.build-manifest.json'
+
+# Views whose normal response may come from a cache filled outside the export
+EXPORT_VIEWS = {views.home: views.render_home}
+
+
+@dataclass(frozen=True)
+class ExportPage:
+    url_name: str
+    file: str
+    depends_on: tuple
+    kwargs: tuple = ()
+    params: tuple = ()
+
+    @property
+    def path(self):
+        return reverse(f'portfolio:{self.url_name}', kwargs=dict(self.kwargs))
+
+
+def export_pages():
+    """Every public page with its output file and the models it renders"""
+    pages = [
+        ExportPage('home', 'index.html', (*HOMEPAGE_MODELS, ResponsiveImage)),
+        ExportPage('projects', 'projects/index.html', (Project, Tag, ResponsiveImage)),
+        ExportPage('books', 'books/index.html', (Book, ResponsiveImage)),
+        ExportPage('papers', 'papers/index.html', (Paper,)),
+        ExportPage('blog', 'blog/index.html', (BlogPost, Tag, ResponsiveImage)),
+        ExportPage('study_notes', 'study-notes/index.html', (StudyNote, StudyChapter)),
+    ]
+    for url_name, model, depends_on in (('books', Book, (Book, ResponsiveImage)), ('papers', Paper, (Paper,))):
+        pages += [
+            ExportPage(url_name, f'{url_name}/category/{value}.html', depends_on, params=(('category', value),))
+            for value, _ in model.CATEGORY_CHOICES
+        ]
+    for slug in Tag.objects.order_by('slug').values_list('slug', flat=True):
+        pages += [
+            ExportPage('projects_by_technology', f'projects/technology/{slug}/index.html',
+                       (Project, Tag, ResponsiveImage), kwargs=(('slug', slug),)),
+            ExportPage('blog_by_tag', f'blog/tag/{slug}/index.html', (BlogPost, Tag, ResponsiveImage),
+                       kwargs=(('slug', slug),)),
+        ]
+    pages += [
+        ExportPage('study_note', f'study-notes/{pk}/index.html', (StudyNote, StudyChapter), kwargs=(('pk', pk),))
+        for pk in StudyNote.objects.order_by('pk').values_list('pk', flat=True)
+    ]
+    return pages
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+
+
+def _request(page):
+    return WSGIRequest({
+        'REQUEST_METHOD': 'GET',
+        'SCRIPT_NAME': '',
+        'PATH_INFO': page.path,
+        'QUERY_STRING': urlencode(page.params),
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+    })
+
+
+def render_page(page):
+    request = _request(page)
+    request.resolver_match = match = resolve(request.path_info)
+    view = EXPORT_VIEWS.get(match.func, match.func)
+    response = view(request, *match.args, **match.kwargs)
+    if response.status_code != 200:
+        raise RuntimeError(f'{page.path} returned HTTP {response.status_code}')
+    return response.content
+
+
+@contextmanager
+def export_settings(static_root):
+    """
+    Render with hashed asset URLs from a manifest storage under
+    ``static_root``, and with list pages unpaginated, since there is nothing
+    to serve ?cursor= from. Restores the settings and storage afterwards.
+    """
+    # ManifestStaticFilesStorage serves unhashed names under DEBUG
+    overrides = {'DEBUG': False, 'PORTFOLIO_PAGE_SIZE': 10 ** 9}
+    saved = {name: getattr(settings, name) for name in overrides}
+    wrapped = staticfiles_storage._wrapped
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    staticfiles_storage._wrapped = ManifestStaticFilesStorage(location=static_root)
+    try:
+        yield
+    finally:
+        staticfiles_storage._wrapped = wrapped
+        for name, value in saved.items():
+            setattr(settings, name, value)
+
+
+def build(output_dir, force=False, stdout=None):
+    """
+    Render the public pages into ``output_dir``.
+
+    Returns (rendered, skipped, removed) page counts.
+    """
+    output_dir = Path(output_dir)
+    static_root = output_dir / settings.STATIC_URL.strip('/')
+    with export_settings(static_root):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        static_manifest = Path(staticfiles_storage.path(staticfiles_storage.manifest_name))
+        build_hash = hashlib.sha256(
+            (template_fingerprint() + static_manifest.read_text()).encode()
+        ).hexdigest()
+
+        manifest_path = output_dir / MANIFEST_NAME
+        previous = {}
+        if manifest_path.exists() and not force:
+            previous = json.loads(manifest_path.read_text())
+        full = previous.get('build') != build_hash
+
+        pages = export_pages()
+        models = {model for page in pages for model in page.depends_on}
+        fingerprints = json.loads(json.dumps(content_fingerprints(models), default=str))
+        changed = {label for label, fingerprint in fingerprints.items()
+                   if previous.get('models', {}).get(label) != fingerprint}
+        built_before = set(previous.get('pages', []))
+
+        rendered = skipped = 0
+        for page in pages:
+            stale = (full or page.file not in built_before
+                     or any(model._meta.label in changed for model in page.depends_on))
+            if not stale:
+                skipped += 1
+                continue
+            _write(output_dir / page.file, render_page(page))
+            rendered += 1
+            if stdout:
+                stdout.write(f'  {page.file}')
+
+        current_files = {page.file for page in pages}
+        removed = 0
+        for file in built_before - current_files:
+            (output_dir / file).unlink(missing_ok=True)
+            removed += 1
+
+        _write(manifest_path, json.dumps({
+            'build': build_hash,
+            'models': fingerprints,
+            'pages': sorted(current_files),
+        }, indent=2).encode())
+    return rendered, skipped, removed
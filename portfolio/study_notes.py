@@ -0,0 +1,44 @@
+"""
+Study notes pages with a cached fragment per note.
+
+Each note renders as one ``{% cache %}`` fragment in
+``portfolio/study_note_fragment.html``, keyed on the note's ``updated_at``
+and chapter counters and on the latest ``updated_at`` of its chapters. The
+query that lists the notes reads all of these, so the view knows which
+fragments are cached before rendering. Chapters are then prefetched, in one
+query, only for the notes whose fragment missed, and editing a chapter
+re-renders only its own note.
+"""
+from django.core.cache import InvalidCacheBackendError, caches
+from django.core.cache.utils import make_template_fragment_key
+from django.db.models import Max, prefetch_related_objects
+
+from .models import StudyNote
+
+FRAGMENT_NAME = 'study_note'
+
+
+def study_notes():
+    """Study notes annotated with everything their fragment key needs"""
+    return StudyNote.objects.annotate(chapters_updated_at=Max('chapters__updated_at'))
+
+
+def fragment_vary_on(note):
+    # Must list the same values, in the same order, as the {% cache %} tag
+    return [note.pk, note.updated_at, note.chapters_updated_at, note.total_chapters, note.completed_chapters]
+
+
+def fragment_cache():
+    # The cache the {% cache %} tag writes to
+    try:
+        return caches['template_fragments']
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+def prefetch_uncached_chapters(notes):
+    """Prefetch chapters for the notes whose rendered fragment is not cached"""
+    keys = {make_template_fragment_key(FRAGMENT_NAME, fragment_vary_on(note)): note for note in notes}
+    cached = fragment_cache().get_many(keys)
+    prefetch_related_objects([note for key, note in keys.items() if key not in cached], 'chapters')
+    return notes
@@ -0,0 +1,94 @@
+"""
+Chapter counters on StudyNote.
+
+``total_chapters`` and ``completed_chapters`` are derived from the note's
+chapters. Saving, moving, completing or deleting a chapter adjusts them with
+a relative F() update, so concurrent edits cannot lose a count and progress
+bars read two columns instead of counting chapters on every render.
+``reconcile_progress`` recounts from the chapters, for bulk writes that
+bypass the signals and as a repair tool.
+"""
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import StudyChapter, StudyNote
+
+COMPLETED = 'completed'
+
+
+def _state(instance):
+    """(study_note_id, is completed) as loaded, or None if either field is deferred"""
+    values = instance.__dict__
+    if 'study_note_id' in values and 'status' in values:
+        return values['study_note_id'], values['status'] == COMPLETED
+    return None
+
+
+def _adjust(note_id, total, completed):
+    changes = {}
+    if total:
+        changes['total_chapters'] = F('total_chapters') + total
+    if completed:
+        changes['completed_chapters'] = F('completed_chapters') + completed
+    if note_id is not None and changes:
+        StudyNote.objects.filter(pk=note_id).update(**changes)
+
+
+def _chapter_count(**filters):
+    chapters = (StudyChapter.objects.filter(study_note=OuterRef('pk'), **filters)
+                .order_by().values('study_note').annotate(count=Count('pk')).values('count'))
+    return Coalesce(Subquery(chapters), Value(0))
+
+
+def reconcile_progress(note_ids=None):
+    """
+    Recount the chapters of ``note_ids`` (default: every note).
+
+    Returns the number of notes whose counters were wrong.
+    """
+    notes = StudyNote.objects.all() if note_ids is None else StudyNote.objects.filter(pk__in=note_ids)
+    drifted = list(
+        notes.alias(actual_total=_chapter_count(), actual_completed=_chapter_count(status=COMPLETED))
+        .exclude(total_chapters=F('actual_total'), completed_chapters=F('actual_completed'))
+        .values_list('pk', flat=True)
+    )
+    if not drifted:
+        return 0
+    return StudyNote.objects.filter(pk__in=drifted).update(
+        total_chapters=_chapter_count(),
+        completed_chapters=_chapter_count(status=COMPLETED),
+    )
+
+
+def remember_state(sender, instance, **kwargs):
+    # Unsaved chapters have not been counted anywhere yet
+    instance._progress_state = None if instance.pk is None else _state(instance)
+
+
+def chapter_saved(sender, instance, created, raw, update_fields, **kwargs):
+    previous = None if created else getattr(instance, '_progress_state', None)
+    current = _state(instance)
+    if raw or current is None or update_fields is not None or (previous is None and not created):
+        # Partial or fixture writes, or a chapter whose loaded state is
+        # unknown: the row may not match the instance, so recount
+        known = {state[0] for state in (previous, current) if state}
+        reconcile_progress(None if previous is None and not created else known)
+    elif previous is not None and previous[0] == current[0]:
+        _adjust(current[0], 0, current[1] - previous[1])
+    else:
+        if previous is not None:
+            _adjust(previous[0], -1, -previous[1])
+        _adjust(current[0], 1, current[1])
+    instance._progress_state = _state(instance)
+
+
+def chapter_deleted(sender, instance, **kwargs):
+    state = getattr(instance, '_progress_state', None) or _state(instance)
+    if state is None:
+        reconcile_progress()
+    else:
+        _adjust(state[0], -1, -state[1])
+
+
+def chapters_seeded(sender, created, updated, **kwargs):
+    reconcile_progress({chapter.study_note_id for chapter in [*created, *updated]})
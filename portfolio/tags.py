@@ -0,0 +1,97 @@
+"""
+Normalised technology and tag storage.
+
+``Project.technologies`` and ``BlogPost.tags`` stay the comma-separated fields
+editors fill in, and are mirrored into ``Tag`` rows plus ordered link rows
+whenever a project or post is saved or seeded. The list pages prefetch the
+links instead of re-splitting strings, and the per-tag pages filter on the
+link tables' ``(tag, ...)`` unique index instead of scanning with LIKE.
+"""
+from django.db.models import Prefetch, Q
+from django.utils.text import slugify
+
+from .models import BlogPost, BlogPostTag, Project, ProjectTechnology, Tag
+
+# model -> (CSV field, link model, link field pointing back at the model)
+TAGGED_FIELDS = {
+    Project: ('technologies', ProjectTechnology, 'project'),
+    BlogPost: ('tags', BlogPostTag, 'post'),
+}
+
+
+def parse_tags(value):
+    """Split a comma-separated field into unique names, keeping their order"""
+    names = []
+    for name in (value or '').split(','):
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def _unique_slug(name, taken):
+    base = slugify(name)[:110] or 'tag'
+    slug, suffix = base, 2
+    while slug in taken:
+        slug, suffix = f'{base}-{suffix}', suffix + 1
+    taken.add(slug)
+    return slug
+
+
+def get_tags(names):
+    """Return {name: Tag} for ``names``, creating the missing ones"""
+    tags = {tag.name: tag for tag in Tag.objects.filter(name__in=names)}
+    missing = [name for name in names if name not in tags]
+    if missing:
+        bases = {slugify(name)[:110] or 'tag' for name in missing}
+        condition = Q()
+        for base in bases:
+            condition |= Q(slug__startswith=base)
+        taken = set(Tag.objects.filter(condition).values_list('slug', flat=True))
+        # A concurrent save may have created some of these; re-read either way
+        Tag.objects.bulk_create([Tag(name=name, slug=_unique_slug(name, taken)) for name in missing],
+                                ignore_conflicts=True)
+        tags.update((tag.name, tag) for tag in Tag.objects.filter(name__in=missing))
+    return tags
+
+
+def sync_tags(model, objects):
+    """Rewrite the link rows of ``objects`` to match their comma-separated field"""
+    field_name, link_model, link_field = TAGGED_FIELDS[model]
+    objects = [obj for obj in objects if obj.pk is not None]
+    if not objects:
+        return
+
+    wanted = {obj.pk: parse_tags(getattr(obj, field_name)) for obj in objects}
+    current = {pk: [] for pk in wanted}
+    links = (link_model.objects.filter(**{f'{link_field}__in': list(wanted)})
+             .order_by('position').values_list(f'{link_field}_id', 'tag__name'))
+    for pk, name in links:
+        current[pk].append(name)
+    stale = [pk for pk, names in wanted.items() if current[pk] != names]
+    if not stale:
+        return
+
+    tags = get_tags([name for pk in stale for name in wanted[pk]])
+    link_model.objects.filter(**{f'{link_field}__in': stale}).delete()
+    link_model.objects.bulk_create([
+        link_model(**{f'{link_field}_id': pk, 'tag': tags[name], 'position': position})
+        for pk in stale
+        for position, name in enumerate(wanted[pk])
+        if name in tags
+    ])
+
+
+def technologies_prefetch():
+    return Prefetch('technology_links', queryset=ProjectTechnology.objects.select_related('tag'))
+
+
+def tags_prefetch():
+    return Prefetch('tag_links', queryset=BlogPostTag.objects.select_related('tag'))
+
+
+def tags_changed(sender, instance=None, raw=False, created=(), updated=(), **kwargs):
+    """post_save / rows_seeded receiver for Project and BlogPost"""
+    if raw:
+        return
+    sync_tags(sender, [instance] if instance is not None else [*created, *updated])
@@ -0,0 +1,36 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.safestring import mark_safe
+
+from portfolio.bundles import asset_path, critical_css
+
+register = template.Library()
+
+
+def _url_name(context):
+    match = getattr(context.get('request'), 'resolver_match', None)
+    return match.url_name if match else None
+
+
+@register.simple_tag(takes_context=True)
+def bundle_static(context, kind):
+    """
+    URL of the ``kind`` ('css' or 'js') bundle for the current page.
+
+    Falls back to the full css/style.css or js/script.js until
+    build_bundles has written the page's bundle.
+    """
+    return static(asset_path(_url_name(context), kind))
+
+
+@register.inclusion_tag('portfolio/stylesheets.html', takes_context=True)
+def stylesheets(context):
+    """
+    The page's stylesheets: its critical CSS inline and its self-hosted
+    bundle loaded without blocking rendering, or the CDN stylesheets and
+    css/style.css until build_bundles has run.
+    """
+    return {
+        'critical_css': mark_safe(critical_css(_url_name(context))),
+        'stylesheet': static(asset_path(_url_name(context), 'css')),
+    }
@@ -0,0 +1,37 @@
+from django import template
+from django.forms.utils import flatatt
+from django.utils.html import format_html, format_html_join
+
+from portfolio.images import FORMATS, MODERN_FORMATS, derivative_name, image_variants
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(image, alt='', sizes='100vw', **attrs):
+    """
+    Render an ImageField file as a <picture> with a srcset per format.
+
+    ``sizes`` should describe the rendered width so browsers pick the
+    smallest derivative that fills it; extra keyword arguments become
+    attributes of the <img>. Until process_images has run for the file,
+    this is a plain <img> of the original.
+    """
+    if not image:
+        return ''
+    img_attrs = {'alt': alt, 'loading': 'lazy', 'decoding': 'async', **attrs}
+    record = image_variants(image.name)
+    if record is None:
+        return format_html('<img src="{}"{}>', image.url, flatatt(img_attrs))
+
+    def srcset(fmt):
+        return ', '.join(f'{image.storage.url(derivative_name(image.name, width, fmt))} {width}w'
+                         for width in record.variants[fmt])
+
+    sources = format_html_join('', '<source type="{}" srcset="{}" sizes="{}">', (
+        (FORMATS[fmt][1], srcset(fmt), sizes) for fmt in MODERN_FORMATS if fmt in record.variants
+    ))
+    fallback = next(fmt for fmt in record.variants if fmt not in MODERN_FORMATS)
+    smallest = image.storage.url(derivative_name(image.name, record.variants[fallback][0], fallback))
+    img_attrs.update(srcset=srcset(fallback), sizes=sizes, width=record.width, height=record.height)
+    return format_html('<picture>{}<img src="{}"{}></picture>', sources, smallest, flatatt(img_attrs))
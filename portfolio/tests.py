@@ -1,3 +1,1444 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import re
+import runpy
+import smtplib
+import tempfile
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont
+from PIL import Image
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core import mail
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import CommandError, call_command
+from django.db import connection, models
+from django.template import engines
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .benchmark import ROUTES, ClientTransport, run, seed_synthetic
+from .bundles import UsedNames, _is_built, prune_css, prune_js, scan_html, script_sections
+from .exports import iter_csv, iter_jsonl
+from .homepage import load_homepage
+from .idempotency import REPLAY_HEADER
+from .images import derivative_name, process_queued
+from . import outbox
+from .mail_backends import PooledSMTPEmailBackend, pool
+from .metrics import histograms, percentile
+from .models import (Appointment, AppointmentType, BlogPost, Book, ContactMessage, IdempotencyRecord,
+                     OutboundEmail, Paper, Profile, Project, ResponsiveImage, SearchDocument,
+                     SiteSettings, Skill, StudyChapter, StudyNote, Tag)
+from .pagination import InvalidCursor, KeysetPaginator
+from .ratelimit import Limit, check
+from .search import search
+from .seeding import SeedSpec, seed
+from .skills import get_skills_by_category
+from .static_export import build
+from .study_notes import FRAGMENT_NAME, fragment_vary_on, study_notes
+from .study_progress import reconcile_progress
+from .warmup import template_names, warm_templates
+from . import urls
+
+
+class HomePageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.profile = Profile.objects.create(name='Neha Pandey', bio='Original bio', email='neha@example.com')
+
+    def test_repeat_visit_is_served_without_queries(self):
+        self.client.get(reverse('portfolio:home'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('portfolio:home'))
+        self.assertContains(response, 'Original bio')
+
+    def test_profile_edit_is_visible_immediately(self):
+        self.client.get(reverse('portfolio:home'))
+        self.profile.bio = 'Updated bio'
+        self.profile.save()
+        response = self.client.get(reverse('portfolio:home'))
+        self.assertContains(response, 'Updated bio')
+
+    def test_deleting_featured_content_invalidates_page(self):
+        project = Project.objects.create(
+            title='Cached Project', description='d', github_url='https://github.com/x/y',
+            technologies='Python', featured=True,
+        )
+        self.assertContains(self.client.get(reverse('portfolio:home')), 'Cached Project')
+        project.delete()
+        self.assertNotContains(self.client.get(reverse('portfolio:home')), 'Cached Project')
+
+
+class HomepageLoaderTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Profile.objects.create(name='Neha Pandey', bio='bio', email='neha@example.com')
+        SiteSettings.objects.create(footer_text='Footer')
+        for i in range(6):
+            Project.objects.create(
+                title=f'Project {i}', description='d', github_url='https://github.com/x/y',
+                technologies='Python, Go', featured=i != 0, order=i,
+            )
+            BlogPost.objects.create(
+                title=f'Post {i}', description='d', medium_url='https://medium.com/x',
+                tags='Python', featured=True, published_date=date(2024, 1, i + 1),
+            )
+        Skill.objects.create(name='Python', category='languages')
+        Skill.objects.create(name='Django', category='frameworks')
+        Skill.objects.create(name='Cobol', category='languages', is_featured=False)
+
+    def test_single_round_trip(self):
+        # Warm the backend's one-off JSON support probe and the skills cache
+        connection.features.supports_json_field
+        get_skills_by_category()
+        with self.assertNumQueries(1):
+            load_homepage()
+
+    def test_slices_respect_featured_flag_limits_and_ordering(self):
+        snapshot = load_homepage()
+        self.assertEqual(snapshot.profile.name, 'Neha Pandey')
+        self.assertEqual(snapshot.site_settings.footer_text, 'Footer')
+        self.assertEqual([p.title for p in snapshot.projects], ['Project 1', 'Project 2', 'Project 3', 'Project 4'])
+        self.assertEqual([p.title for p in snapshot.blog_posts], ['Post 5', 'Post 4', 'Post 3'])
+        self.assertEqual(
+            {category: [s.name for s in skills] for category, skills in snapshot.skills_by_category.items()},
+            {'Frameworks & Libraries': ['Django'], 'Programming Languages': ['Python']},
+        )
+
+    def test_empty_database(self):
+        Profile.objects.all().delete()
+        SiteSettings.objects.all().delete()
+        snapshot = load_homepage()
+        self.assertIsNone(snapshot.profile)
+        self.assertIsNone(snapshot.site_settings)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Profile.objects.create(name='Neha Pandey', bio='Bio', email='neha@example.com')
+        self.book = Book.objects.create(title='DDIA', author='Martin Kleppmann',
+                                        goodreads_url='https://example.com/ddia')
+
+    def test_home_sends_validators_and_answers_304_without_rendering(self):
+        response = self.client.get(reverse('portfolio:home'))
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+        with self.assertNumQueries(0), self.assertTemplateNotUsed('portfolio/index.html'):
+            response = self.client.get(reverse('portfolio:home'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_edits_and_deletes_change_the_etag(self):
+        etag = self.client.get(reverse('portfolio:books'))['ETag']
+        self.book.review = 'Great'
+        self.book.save()
+        response = self.client.get(reverse('portfolio:books'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.book.delete()
+        self.assertNotEqual(self.client.get(reverse('portfolio:books'))['ETag'], etag)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(reverse('portfolio:books'))['Last-Modified']
+        response = self.client.get(reverse('portfolio:books'), HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_unrelated_edits_keep_list_validators(self):
+        etag = self.client.get(reverse('portfolio:books'))['ETag']
+        Paper.objects.create(title='LSM', authors="O'Neil", paper_url='https://example.com/lsm')
+        response = self.client.get(reverse('portfolio:books'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_deploys_change_the_etag_and_page_cache(self):
+        etag = self.client.get(reverse('portfolio:home'))['ETag']
+        with mock.patch('portfolio.cache.build_fingerprint', return_value='next-release'), \
+                self.assertTemplateUsed('portfolio/index.html'):
+            response = self.client.get(reverse('portfolio:home'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        # Repeated ``order`` values force the paginator onto its tie-breakers
+        for i in range(7):
+            Book.objects.create(
+                title=f'Book {i}', author='Author', goodreads_url='https://goodreads.com/x',
+                category='technical' if i % 2 else 'fiction', order=i // 3,
+            )
+        self.expected = [b.pk for b in Book.objects.all()]
+
+    def walk_forward(self, paginator):
+        pages, cursor = [], None
+        while True:
+            page = paginator.page(cursor)
+            pages.append([b.pk for b in page])
+            if not page.has_next:
+                return pages, page
+            cursor = page.next_cursor
+
+    def test_forward_walk_visits_every_row_once_in_model_order(self):
+        pages, _ = self.walk_forward(KeysetPaginator(Book.objects.all(), 3))
+        self.assertEqual([len(p) for p in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), self.expected)
+
+    def test_backward_walk_returns_the_same_pages(self):
+        paginator = KeysetPaginator(Book.objects.all(), 3)
+        forward, page = self.walk_forward(paginator)
+        backward = [[b.pk for b in page]]
+        while page.has_previous:
+            page = paginator.page(page.previous_cursor)
+            backward.append([b.pk for b in page])
+        self.assertEqual(backward[::-1], forward)
+        self.assertFalse(page.has_previous)
+
+    def test_each_page_is_a_single_query(self):
+        paginator = KeysetPaginator(Book.objects.all(), 3)
+        cursor = paginator.page().next_cursor
+        with self.assertNumQueries(1):
+            paginator.page(cursor)
+
+    def test_bad_cursor(self):
+        paginator = KeysetPaginator(Book.objects.all(), 3)
+        with self.assertRaises(InvalidCursor):
+            paginator.page('not-a-cursor')
+        self.assertEqual([b.pk for b in paginator.get_page('not-a-cursor')], self.expected[:3])
+
+    @override_settings(PORTFOLIO_PAGE_SIZE=2)
+    def test_list_view_keeps_category_in_cursor_links(self):
+        response = self.client.get(reverse('portfolio:books'), {'category': 'technical'})
+        self.assertEqual(len(response.context['books']), 2)
+        page = response.context['page']
+        self.assertContains(response, f'?category=technical&amp;cursor={page.next_cursor}')
+        response = self.client.get(reverse('portfolio:books'), {'category': 'technical', 'cursor': page.next_cursor})
+        self.assertEqual([b.category for b in response.context['books']], ['technical'])
+
+
+class AccessPathIndexTests(TestCase):
+    """The hot list and homepage queries should be answered from an index"""
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        # SQLite reports a separate sort step when no index provides the order
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_featured_slices_use_partial_indexes(self):
+        self.assertUsesIndex(Project.objects.filter(featured=True)[:4], 'project_featured_idx')
+        self.assertUsesIndex(Book.objects.filter(featured=True)[:3], 'book_featured_idx')
+        self.assertUsesIndex(Paper.objects.filter(featured=True)[:6], 'paper_featured_idx')
+        self.assertUsesIndex(BlogPost.objects.filter(featured=True)[:3], 'blogpost_featured_idx')
+        self.assertUsesIndex(Skill.objects.filter(is_featured=True), 'skill_featured_idx')
+
+    def test_list_pages_use_ordering_indexes(self):
+        self.assertUsesIndex(Project.objects.all()[:13], 'project_order_idx')
+        self.assertUsesIndex(BlogPost.objects.all()[:13], 'blogpost_order_idx')
+        self.assertUsesIndex(Book.objects.filter(category='technical')[:13], 'book_category_order_idx')
+        self.assertUsesIndex(Paper.objects.filter(category='systems')[:13], 'paper_category_order_idx')
+
+    def test_keyset_page_uses_ordering_index(self):
+        paginator = KeysetPaginator(Project.objects.all(), 12)
+        project = Project(pk=5, order=1, created_at=timezone.now())
+        _, keys = paginator.decode_cursor(paginator.encode_cursor(project, 'next'))
+        queryset = Project.objects.filter(paginator._after(keys, paginator.ordering))
+        self.assertUsesIndex(queryset.order_by('order', '-created_at', '-pk')[:13], 'project_order_idx')
+
+    def test_inbox_changelists_use_created_at_indexes(self):
+        self.assertUsesIndex(Appointment.objects.all()[:100], 'appointment_created_idx')
+        self.assertUsesIndex(ContactMessage.objects.all()[:100], 'contactmessage_created_idx')
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise smtplib.SMTPServerDisconnected('relay went away')
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        # Start every test with fresh rate-limit windows
+        cache.clear()
+
+    def post_json(self, name, data):
+        return self.client.post(reverse(name), json.dumps(data), content_type='application/json')
+
+    def test_contact_submit_queues_mail_without_sending(self):
+        response = self.post_json('portfolio:contact_submit', {
+            'sender': 'visitor@example.com', 'subject': 'Hello', 'message': 'Hi there',
+        })
+        self.assertTrue(response.json()['success'])
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        queued = OutboundEmail.objects.order_by('id')
+        self.assertEqual([m.recipients for m in queued], [['nehapandey408@gmail.com'], ['visitor@example.com']])
+
+    def test_appointment_submit_queues_notification_and_confirmation(self):
+        appointment_type = AppointmentType.objects.create(name='Consultation', description='d')
+        self.post_json('portfolio:appointment_submit', {
+            'appointment_type': appointment_type.pk, 'client_name': 'Ada',
+            'client_email': 'ada@example.com', 'purpose': 'Chat',
+        })
+        self.assertEqual(OutboundEmail.objects.filter(status='pending').count(), 2)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_header_injection_is_rejected_before_queueing(self):
+        response = self.post_json('portfolio:contact_submit', {
+            'sender': 'visitor@example.com', 'subject': 'Hello\nBcc: victim@example.com', 'message': 'Hi',
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(OutboundEmail.objects.exists())
+
+    def test_worker_delivers_queued_mail(self):
+        outbox.enqueue(mail.EmailMessage('Subject', 'Body', 'from@example.com', ['to@example.com']))
+        call_command('send_queued_mail', stdout=io.StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['to@example.com'])
+        self.assertEqual(OutboundEmail.objects.get().status, 'sent')
+
+    @override_settings(EMAIL_BACKEND='portfolio.tests.FailingEmailBackend',
+                       EMAIL_OUTBOX_MAX_ATTEMPTS=2, EMAIL_OUTBOX_RETRY_DELAY=60)
+    def test_failed_sends_back_off_then_give_up(self):
+        outbox.enqueue(mail.EmailMessage('Subject', 'Body', 'from@example.com', ['to@example.com']))
+        self.assertEqual(outbox.deliver_due(), (0, 1))
+        queued = OutboundEmail.objects.get()
+        self.assertEqual((queued.status, queued.attempts), ('pending', 1))
+        self.assertIn('relay went away', queued.last_error)
+        self.assertGreater(queued.next_attempt_at, timezone.now() + timedelta(seconds=50))
+
+        # Not due yet, so nothing is claimed
+        self.assertEqual(outbox.deliver_due(), (0, 0))
+
+        OutboundEmail.objects.update(next_attempt_at=timezone.now())
+        with self.assertLogs('portfolio.outbox', 'ERROR'):
+            outbox.deliver_due()
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('failed', 2))
+
+    def test_retry_delay_doubles_up_to_the_cap(self):
+        self.assertEqual(outbox.retry_delay(1), timedelta(seconds=60))
+        self.assertEqual(outbox.retry_delay(3), timedelta(seconds=240))
+        self.assertEqual(outbox.retry_delay(20), timedelta(hours=1))
+
+
+class FakeSMTP:
+    """Stand-in for smtplib.SMTP that records handshakes and deliveries"""
+    instances = []
+    disconnect_next_send = False
+
+    def __init__(self, host, port, **kwargs):
+        self.sock = object()
+        self.logins = 0
+        self.sent = []
+        FakeSMTP.instances.append(self)
+
+    def starttls(self, **kwargs):
+        pass
+
+    def login(self, user, password):
+        self.logins += 1
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        if FakeSMTP.disconnect_next_send:
+            FakeSMTP.disconnect_next_send = False
+            self.sock = None
+            raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        self.sent.append(to_addrs)
+
+    def quit(self):
+        self.sock = None
+
+    def close(self):
+        self.sock = None
+
+
+@override_settings(EMAIL_HOST='smtp.example.com', EMAIL_PORT=587, EMAIL_USE_TLS=True,
+                   EMAIL_HOST_USER='user', EMAIL_HOST_PASSWORD='secret',
+                   EMAIL_POOL_SIZE=2, EMAIL_POOL_MAX_IDLE=60)
+class PooledSMTPBackendTests(TestCase):
+    def setUp(self):
+        pool.clear()
+        FakeSMTP.instances = []
+        FakeSMTP.disconnect_next_send = False
+        patcher = mock.patch('smtplib.SMTP', FakeSMTP)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(pool.clear)
+
+    def message(self, to):
+        return mail.EmailMessage('Subject', 'Body', 'from@example.com', [to])
+
+    def test_connection_is_reused_across_sends_and_backends(self):
+        PooledSMTPEmailBackend().send_messages([self.message('a@example.com'), self.message('b@example.com')])
+        PooledSMTPEmailBackend().send_messages([self.message('c@example.com')])
+        self.assertEqual(len(FakeSMTP.instances), 1)
+        self.assertEqual(FakeSMTP.instances[0].logins, 1)
+        self.assertEqual(len(FakeSMTP.instances[0].sent), 3)
+
+    def test_dropped_connection_is_replaced(self):
+        PooledSMTPEmailBackend().send_messages([self.message('a@example.com')])
+        FakeSMTP.disconnect_next_send = True
+        sent = PooledSMTPEmailBackend().send_messages([self.message('b@example.com')])
+        self.assertEqual(sent, 1)
+        self.assertEqual(len(FakeSMTP.instances), 2)
+        self.assertEqual(FakeSMTP.instances[1].sent, [['b@example.com']])
+
+    @override_settings(EMAIL_POOL_MAX_IDLE=0)
+    def test_stale_connections_are_not_reused(self):
+        PooledSMTPEmailBackend().send_messages([self.message('a@example.com')])
+        PooledSMTPEmailBackend().send_messages([self.message('b@example.com')])
+        self.assertEqual(len(FakeSMTP.instances), 2)
+        self.assertIsNone(FakeSMTP.instances[0].sock)
+
+    @override_settings(EMAIL_BACKEND='portfolio.mail_backends.PooledSMTPEmailBackend')
+    def test_outbox_worker_sends_a_batch_over_one_connection(self):
+        outbox.enqueue(self.message('a@example.com'), self.message('b@example.com'))
+        self.assertEqual(outbox.deliver_due(), (2, 0))
+        self.assertEqual(len(FakeSMTP.instances), 1)
+
+
+class SeedingTests(TestCase):
+    def skill_spec(self, level=4):
+        return SeedSpec(Skill, ('name', 'category'), [
+            {'name': 'Python', 'category': 'languages', 'proficiency_level': level},
+            {'name': 'Django', 'category': 'frameworks', 'proficiency_level': 3},
+        ])
+
+    def test_creates_missing_rows_with_one_read_and_one_insert(self):
+        Skill.objects.create(name='Python', category='languages', proficiency_level=1)
+        with self.assertNumQueries(4):  # savepoint, read, insert, release
+            result, = seed([self.skill_spec()])
+        self.assertEqual([s.name for s in result.created], ['Django'])
+        # Existing rows keep their admin-edited values unless syncing
+        self.assertEqual(Skill.objects.get(name='Python').proficiency_level, 1)
+
+    def test_sync_updates_drifted_rows(self):
+        seed([self.skill_spec()])
+        python = Skill.objects.get(name='Python')
+        result, = seed([self.skill_spec(level=2)], sync=True)
+        self.assertEqual([s.name for s in result.updated], ['Python'])
+        python_after = Skill.objects.get(name='Python')
+        self.assertEqual(python_after.proficiency_level, 2)
+        self.assertGreater(python_after.updated_at, python.updated_at)
+
+    def test_seeding_invalidates_cached_pages(self):
+        cache.clear()
+        self.client.get(reverse('portfolio:home'))
+        seed([self.skill_spec()])
+        self.assertContains(self.client.get(reverse('portfolio:home')), 'Django')
+
+    def test_populate_data_is_idempotent(self):
+        call_command('populate_data', stdout=io.StringIO())
+        self.assertEqual(StudyChapter.objects.filter(study_note__book_title='CPython Internals').count(), 8)
+        counts = [model.objects.count() for model in (Profile, StudyNote, Project, Book, Paper, BlogPost, AppointmentType)]
+        call_command('populate_data', stdout=io.StringIO())
+        self.assertEqual(counts, [model.objects.count() for model in (Profile, StudyNote, Project, Book, Paper, BlogPost, AppointmentType)])
+
+
+class SkillsByCategoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Skill.objects.create(name='Python', category='languages', proficiency_level=4, years_experience=5,
+                             icon_class='devicon-python-plain')
+        Skill.objects.create(name='Go', category='languages', proficiency_level=2, order=1)
+        Skill.objects.create(name='Django', category='frameworks')
+
+    def test_structure_is_grouped_and_ordered(self):
+        skills_by_category = get_skills_by_category()
+        self.assertEqual(list(skills_by_category), ['Frameworks & Libraries', 'Programming Languages'])
+        python, go = skills_by_category['Programming Languages']
+        self.assertEqual(python, ('Python', 'devicon-python-plain', 'Expert', 5))
+        self.assertEqual(go.proficiency, 'Intermediate')
+
+    def test_reads_are_served_without_queries(self):
+        get_skills_by_category()
+        with self.assertNumQueries(0):
+            get_skills_by_category()
+
+    def test_skill_writes_rebuild_the_structure(self):
+        get_skills_by_category()
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.filter(name='Go').get().delete()
+        self.assertEqual([s.name for s in get_skills_by_category()['Programming Languages']], ['Python'])
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(name='Rust', category='languages', order=2)
+        with self.assertNumQueries(0):
+            skills = get_skills_by_category()
+        self.assertEqual([s.name for s in skills['Programming Languages']], ['Python', 'Rust'])
+
+
+class TagTests(TestCase):
+    def create_project(self, title, technologies, **kwargs):
+        return Project.objects.create(title=title, description='...', github_url='https://github.com/x',
+                                      technologies=technologies, **kwargs)
+
+    def names(self, project):
+        return [tag.name for tag in project.get_technology_tags()]
+
+    def test_saving_mirrors_the_csv_field_in_order(self):
+        project = self.create_project('Kinesis', 'Python, AWS Kinesis, Python, ')
+        self.assertEqual(self.names(project), ['Python', 'AWS Kinesis'])
+        project.technologies = 'AWS Kinesis, Go'
+        project.save()
+        self.assertEqual(self.names(project), ['AWS Kinesis', 'Go'])
+        self.assertEqual(Tag.objects.get(name='AWS Kinesis').slug, 'aws-kinesis')
+
+    def test_slugs_stay_unique_when_names_collide(self):
+        self.create_project('Native', 'C, C++')
+        self.assertEqual(sorted(Tag.objects.values_list('slug', flat=True)), ['c', 'c-2'])
+
+    def test_seeded_rows_are_linked(self):
+        seed([SeedSpec(BlogPost, ('title',), [
+            {'title': 'GC', 'description': '...', 'medium_url': 'https://medium.com/x',
+             'tags': 'Python, Memory Management', 'published_date': date(2024, 1, 1)},
+        ])])
+        post = BlogPost.objects.get()
+        self.assertEqual([tag.name for tag in post.get_tag_objects()], ['Python', 'Memory Management'])
+
+    def test_technology_page_lists_only_matching_projects(self):
+        self.create_project('Kinesis', 'Python, AWS')
+        self.create_project('Workshop', 'AWS')
+        response = self.client.get(reverse('portfolio:projects_by_technology', args=['python']))
+        self.assertEqual([p.title for p in response.context['projects']], ['Kinesis'])
+        self.assertContains(response, 'Projects using Python')
+        self.assertEqual(self.client.get(reverse('portfolio:projects_by_technology', args=['rust'])).status_code, 404)
+
+    def test_tag_lookup_uses_the_link_index(self):
+        plan = Project.objects.filter(technology_links__tag_id=1).explain()
+        self.assertIn('portfolio_projecttechnology_tag_id_project_id', plan)
+        self.assertNotIn('LIKE', str(Project.objects.filter(technology_links__tag_id=1).query))
+
+    def test_list_pages_prefetch_tags(self):
+        for i in range(3):
+            self.create_project(f'Project {i}', 'Python, AWS, Go')
+        # Three COUNT/MAX validator queries, the page, links with their tags
+        with self.assertNumQueries(5):
+            self.client.get(reverse('portfolio:projects'))
+        for i in range(3, 8):
+            self.create_project(f'Project {i}', 'Rust')
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('portfolio:projects'))
+        self.assertContains(response, reverse('portfolio:projects_by_technology', args=['rust']))
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(
+            title='Kinesis Data Tools', description='<p>Utilities for streaming analytics</p>',
+            github_url='https://github.com/x/kinesis', technologies='Python, AWS')
+        self.paper = Paper.objects.create(
+            title='The Log-Structured Merge-Tree', authors="O'Neil", paper_url='https://example.com/lsm',
+            summary='Write-optimised indexing, later used by Kinesis-style streaming stores')
+        Book.objects.create(title='Designing Data-Intensive Applications', author='Martin Kleppmann',
+                            goodreads_url='https://example.com/ddia', review='Great on streams')
+
+    def titles(self, query):
+        return [document.title for document in search(query)]
+
+    def test_title_matches_rank_first(self):
+        self.assertEqual(self.titles('kinesis'), ['Kinesis Data Tools', 'The Log-Structured Merge-Tree'])
+
+    def test_stemming_prefixes_and_html(self):
+        self.assertEqual(len(self.titles('streams')), 3)
+        self.assertEqual(self.titles('kleppm'), ['Designing Data-Intensive Applications'])
+        self.assertNotIn('<p>', SearchDocument.objects.get(kind='project').body)
+
+    def test_operators_in_user_input_are_literal(self):
+        self.assertEqual(self.titles('"kinesis" OR NEAR('), [])
+        self.assertEqual(self.titles('!!!'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.project.title = 'Firehose Toolkit'
+        self.project.save()
+        self.assertEqual(self.titles('firehose'), ['Firehose Toolkit'])
+        self.paper.delete()
+        self.assertEqual(self.titles('kinesis'), [])
+
+    def test_query_is_answered_from_the_fts_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN SELECT rowid FROM portfolio_searchdocument_fts '
+                           'WHERE portfolio_searchdocument_fts MATCH %s', ['kinesis'])
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        self.assertIn('VIRTUAL TABLE INDEX', plan)
+
+    def test_page_and_api(self):
+        response = self.client.get(reverse('portfolio:search'), {'q': 'merge tree'})
+        self.assertContains(response, 'The Log-Structured Merge-Tree')
+        data = self.client.get(reverse('portfolio:search_api'), {'q': 'kinesis'}).json()
+        self.assertEqual([r['kind'] for r in data['results']], ['project', 'paper'])
+        self.assertEqual(data['results'][0]['url'], 'https://github.com/x/kinesis')
+
+    def test_seeded_rows_are_indexed(self):
+        seed([SeedSpec(BlogPost, ('title',), [
+            {'title': 'Inside the GIL', 'description': '...', 'medium_url': 'https://medium.com/x',
+             'tags': 'CPython', 'published_date': date(2024, 1, 1)},
+        ])])
+        self.assertEqual(self.titles('cpython'), ['Inside the GIL'])
+
+    def test_rebuild_command(self):
+        SearchDocument.objects.all().delete()
+        out = io.StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('Indexed 3 document(s)', out.getvalue())
+        self.assertEqual(self.titles('kleppmann'), ['Designing Data-Intensive Applications'])
+
+
+class StaticExportTests(TestCase):
+    def setUp(self):
+        output = tempfile.TemporaryDirectory()
+        self.addCleanup(output.cleanup)
+        self.output = Path(output.name)
+        Profile.objects.create(name='Neha Pandey', bio='Bio', email='neha@example.com')
+        self.book = Book.objects.create(title='DDIA', author='Martin Kleppmann', category='technical',
+                                        goodreads_url='https://example.com/ddia')
+        self.project = Project.objects.create(title='Kinesis', description='...', github_url='https://github.com/x',
+                                              technologies='Python')
+
+    def test_renders_every_public_page_with_hashed_assets(self):
+        rendered, skipped, removed = build(self.output)
+        self.assertEqual((skipped, removed), (0, 0))
+        self.assertIn('DDIA', (self.output / 'books/category/technical.html').read_text())
+        self.assertNotIn('DDIA', (self.output / 'books/category/fiction.html').read_text())
+        self.assertIn('Kinesis', (self.output / 'projects/technology/python/index.html').read_text())
+        home = (self.output / 'index.html').read_text()
+        self.assertRegex(home, r'/static/css/style\.[0-9a-f]{12}\.css')
+        self.assertTrue(list((self.output / 'static/css').glob('style.*.css')))
+        # The export's settings and storage don't outlive the build
+        self.assertNotEqual(settings.PORTFOLIO_PAGE_SIZE, 10 ** 9)
+        self.assertNotIsInstance(staticfiles_storage._wrapped, ManifestStaticFilesStorage)
+
+    def test_rebuild_only_renders_pages_affected_by_the_change(self):
+        total, _, _ = build(self.output)
+        self.assertEqual(build(self.output), (0, total, 0))
+
+        self.book.title = 'Designing Data-Intensive Applications'
+        self.book.save()
+        rendered, skipped, _ = build(self.output)
+        # Home, the book list and one page per book category
+        self.assertEqual(rendered, 2 + len(Book.CATEGORY_CHOICES))
+        self.assertIn('Designing Data-Intensive', (self.output / 'books/index.html').read_text())
+
+        self.project.technologies = 'Go'
+        self.project.save()
+        Tag.objects.filter(name='Python').delete()
+        _, _, removed = build(self.output)
+        self.assertEqual(removed, 2)
+        self.assertFalse((self.output / 'projects/technology/python/index.html').exists())
+        self.assertTrue((self.output / 'projects/technology/go/index.html').exists())
+
+
+@override_settings(RATE_LIMITS={
+    'contact': {'ip': (3, 60), 'email': (2, 3600)},
+    'appointment': {'ip': (3, 60)},
+})
+class RateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def contact(self, sender='visitor@example.com', ip='10.0.0.1', message='Hi'):
+        return self.client.post(reverse('portfolio:contact_submit'), json.dumps({
+            'sender': sender, 'subject': 'Hello', 'message': message,
+        }), content_type='application/json', REMOTE_ADDR=ip)
+
+    def test_ip_limit_rejects_without_saving_or_mail(self):
+        for i in range(3):
+            self.assertEqual(self.contact(sender=f'v{i}@example.com').status_code, 200)
+        with mock.patch('portfolio.views.ContactMessage.objects.create') as create:
+            response = self.contact(sender='v9@example.com')
+        create.assert_not_called()
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(ContactMessage.objects.count(), 3)
+        self.assertEqual(OutboundEmail.objects.count(), 6)
+        # The rejection is not stored as the submission's response
+        self.assertEqual(self.contact(sender='v9@example.com', ip='10.0.0.2').status_code, 200)
+
+    def test_replays_do_not_use_up_the_limit(self):
+        for _ in range(5):
+            self.assertEqual(self.contact().status_code, 200)
+        self.assertEqual(self.contact(sender='other@example.com').status_code, 200)
+        self.assertEqual(ContactMessage.objects.count(), 2)
+
+    def test_email_limit_applies_across_addresses(self):
+        self.contact(ip='10.0.0.1')
+        self.contact(sender='Visitor@Example.com ', ip='10.0.0.2')
+        response = self.contact(ip='10.0.0.3', message='Hi again')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(OutboundEmail.objects.count(), 4)
+
+    def test_limits_are_per_endpoint(self):
+        for _ in range(3):
+            self.contact(sender=f'{_}@example.com')
+        response = self.client.post(reverse('portfolio:appointment_submit'), '{}',
+                                    content_type='application/json', REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, 400)
+
+    def test_window_slides(self):
+        limits = [Limit('test', 'ip', '10.0.0.1', 4, 60)]
+        for second in (0, 10, 20, 30):
+            self.assertEqual(check(limits, now=6000 + second), 0)
+        # The full window must decay to 3/4 weight: 10s to roll over, then 15s
+        self.assertEqual(check(limits, now=6050), 25)
+        self.assertGreater(check(limits, now=6074), 0)
+        self.assertEqual(check(limits, now=6075), 0)
+        # Halfway through the new window, half of the previous count still weighs in
+        self.assertEqual(check(limits, now=6076), 14)
+        self.assertEqual(check(limits, now=6090), 0)
+
+    def test_concurrent_requests_cannot_share_the_last_slot(self):
+        # Two workers handling requests for the same client at once
+        first, second = (Limit('test', 'ip', '10.0.0.1', 1, 60) for _ in range(2))
+        self.assertEqual(first.hit(6000), 0)
+        self.assertGreater(second.hit(6000), 0)
+        second.release(6000)
+        self.assertEqual(cache.get(first._key(100)), 1)
+
+    @override_settings(RATE_LIMIT_IP_META='HTTP_X_FORWARDED_FOR')
+    def test_forged_forwarded_for_entries_are_ignored(self):
+        for i in range(4):
+            response = self.client.post(reverse('portfolio:contact_submit'), json.dumps({
+                'sender': f'v{i}@example.com', 'subject': 'Hello', 'message': 'Hi',
+            }), content_type='application/json', HTTP_X_FORWARDED_FOR=f'192.0.2.{i}, 10.0.0.1')
+        self.assertEqual(response.status_code, 429)
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.appointment_type = AppointmentType.objects.create(name='Consultation', description='d')
+
+    def post(self, name, data, **headers):
+        return self.client.post(reverse(name), json.dumps(data), content_type='application/json', **headers)
+
+    def contact(self, message='Hi', **headers):
+        return self.post('portfolio:contact_submit', {
+            'sender': 'visitor@example.com', 'subject': 'Hello', 'message': message,
+        }, **headers)
+
+    def test_repeated_contact_replays_without_inserts_or_mail(self):
+        first = self.contact()
+        with self.assertNumQueries(4):  # savepoint, purge, lookup, release
+            second = self.contact()
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second[REPLAY_HEADER], 'true')
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertEqual(OutboundEmail.objects.count(), 2)
+        self.assertEqual(self.contact(message='Something else').status_code, 200)
+        self.assertEqual(ContactMessage.objects.count(), 2)
+
+    def test_idempotency_key_header(self):
+        self.contact(HTTP_IDEMPOTENCY_KEY='abc')
+        # Same key replays even if a retry garbles the body
+        response = self.contact(message='Hi!', HTTP_IDEMPOTENCY_KEY='abc')
+        self.assertTrue(response.has_header(REPLAY_HEADER))
+        # A fresh key doesn't hide an identical resubmission from another handler
+        self.assertTrue(self.contact(HTTP_IDEMPOTENCY_KEY='def').has_header(REPLAY_HEADER))
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+    def test_repeated_appointment_is_booked_once(self):
+        data = {'appointment_type': self.appointment_type.pk, 'client_name': 'Ada',
+                'client_email': 'ada@example.com', 'purpose': 'Chat'}
+        self.post('portfolio:appointment_submit', data)
+        self.post('portfolio:appointment_submit', data)
+        self.assertEqual(Appointment.objects.count(), 1)
+        self.assertEqual(OutboundEmail.objects.count(), 2)
+
+    def test_content_matches_expire_after_the_window(self):
+        self.contact()
+        IdempotencyRecord.objects.update(expires_at=timezone.now())
+        self.assertFalse(self.contact().has_header(REPLAY_HEADER))
+        self.assertEqual(ContactMessage.objects.count(), 2)
+        self.assertEqual(IdempotencyRecord.objects.count(), 1)
+
+    def test_server_errors_are_not_stored(self):
+        with mock.patch('portfolio.views.ContactMessage.objects.create', side_effect=RuntimeError):
+            self.assertEqual(self.contact().status_code, 500)
+        self.assertFalse(IdempotencyRecord.objects.exists())
+        self.assertEqual(self.contact().status_code, 200)
+
+    def test_rejected_submission_can_be_corrected(self):
+        data = {'appointment_type': self.appointment_type.pk,
+                'client_email': 'ada@example.com', 'purpose': 'Chat'}
+        response = self.post('portfolio:appointment_submit', data, HTTP_IDEMPOTENCY_KEY='abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(IdempotencyRecord.objects.exists())
+        data['client_name'] = 'Ada'
+        response = self.post('portfolio:appointment_submit', data, HTTP_IDEMPOTENCY_KEY='def')
+        self.assertFalse(response.has_header(REPLAY_HEADER))
+        self.assertEqual(Appointment.objects.count(), 1)
+
+
+class InboxExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        for i in range(3):
+            appointment_type = AppointmentType.objects.create(name=f'Type {i}', description='d', duration=30)
+            Appointment.objects.create(appointment_type=appointment_type, client_name=f'Client {i}',
+                                       client_email=f'c{i}@example.com', purpose='Chat, "quoted"\nline')
+        ContactMessage.objects.create(sender_email='a@example.com', subject='Hi', message='Hello')
+
+    def run_action(self, model_name, action):
+        self.client.force_login(self.user)
+        ids = [str(pk) for pk in Appointment.objects.values_list('pk', flat=True)]
+        response = self.client.post(reverse(f'admin:portfolio_{model_name}_changelist'), {
+            'action': action, '_selected_action': ids,
+        })
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_admin_csv_action_streams_selected_rows(self):
+        content = self.run_action('appointment', 'export_csv')
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(rows[0][:4], ['id', 'created_at', 'status', 'appointment_type'])
+        self.assertEqual(sorted(row[3] for row in rows[1:]), ['Type 0', 'Type 1', 'Type 2'])
+        self.assertEqual(rows[1][9], 'Chat, "quoted"\nline')
+
+    def test_csv_cells_that_look_like_formulas_are_escaped(self):
+        ContactMessage.objects.create(sender_email='b@example.com', subject='=HYPERLINK("http://x")',
+                                      message='-2+3')
+        messages = ContactMessage.objects.filter(sender_email='b@example.com')
+        rows = list(csv.reader(iter_csv(messages)))
+        self.assertEqual(rows[1][3:5], ['\'=HYPERLINK("http://x")', "'-2+3"])
+        # JSONL is not opened by spreadsheets and keeps the raw value
+        self.assertEqual(json.loads(next(iter_jsonl(messages)))['subject'], '=HYPERLINK("http://x")')
+
+    def test_appointment_types_are_joined_not_fetched_per_row(self):
+        with self.assertNumQueries(1):
+            lines = list(iter_jsonl(Appointment.objects.all()))
+        self.assertEqual(json.loads(lines[0])['duration'], 30)
+
+    def test_command_writes_jsonl(self):
+        out = io.StringIO()
+        call_command('export_inbox', 'contact', '--format', 'jsonl', stdout=out)
+        self.assertEqual(json.loads(out.getvalue())['subject'], 'Hi')
+        out = io.StringIO()
+        call_command('export_inbox', 'appointment', '--since', '2999-01-01', stdout=out)
+        self.assertEqual(out.getvalue().count('\n'), 1)
+
+
+def build_rows(model, count, offset=0):
+    """Unsaved rows with every required field filled, each with its own parent rows"""
+    parents = {
+        field.name: field.related_model.objects.bulk_create(build_rows(field.related_model, count, offset))
+        for field in model._meta.concrete_fields
+        if field.many_to_one and not field.null
+    }
+    rows = []
+    for i in range(offset, offset + count):
+        values = {name: objects[i - offset] for name, objects in parents.items()}
+        for field in model._meta.concrete_fields:
+            if field.name in values or field.primary_key or field.has_default() or field.blank or field.null:
+                continue
+            if field.choices:
+                values[field.name] = field.choices[0][0]
+            elif isinstance(field, models.DateTimeField):
+                values[field.name] = timezone.now()
+            elif isinstance(field, models.DateField):
+                values[field.name] = date.today()
+            elif isinstance(field, (models.IntegerField, models.DecimalField)):
+                values[field.name] = i
+            else:
+                values[field.name] = f'{field.name}-{i}'
+        rows.append(model(**values))
+    return rows
+
+
+class AdminChangelistQueryTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+
+    def changelist_queries(self, model):
+        url = reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        registered = [model for model in admin.site._registry if model._meta.app_label == 'portfolio']
+        for model in registered:
+            with self.subTest(model=model.__name__):
+                model.objects.bulk_create(build_rows(model, 10))
+                small = self.changelist_queries(model)
+                model.objects.bulk_create(build_rows(model, 990, offset=10))
+                self.assertEqual(self.changelist_queries(model), small)
+
+    def test_tag_usage_counts_are_annotated(self):
+        for i in range(2):
+            Project.objects.create(title=f'P{i}', description='d', github_url='https://example.com',
+                                   technologies='Django, Python')
+        for i in range(3):
+            BlogPost.objects.create(title=f'B{i}', description='d', medium_url='https://example.com',
+                                    tags='Django', published_date=date.today())
+        response = self.client.get(reverse('admin:portfolio_tag_changelist'))
+        tags = {tag.name: (tag.project_count, tag.post_count) for tag in response.context['cl'].result_list}
+        self.assertEqual(tags, {'Django': (2, 3), 'Python': (2, 0)})
+        self.assertNotIn('JOIN', str(response.context['cl'].result_list.query))
+
+
+class StudyProgressTests(TestCase):
+    def setUp(self):
+        self.note = StudyNote.objects.create(book_title='CPython Internals', book_author='Anthony Shaw')
+        self.chapters = [
+            StudyChapter.objects.create(study_note=self.note, chapter_number=i, title=f'Chapter {i}', status=status)
+            for i, status in enumerate(['completed', 'in_progress', 'planned'], start=1)
+        ]
+
+    def counters(self, note=None):
+        note = note or self.note
+        note.refresh_from_db()
+        return note.total_chapters, note.completed_chapters
+
+    def test_counters_follow_chapter_saves(self):
+        self.assertEqual(self.counters(), (3, 1))
+        chapter = StudyChapter.objects.get(pk=self.chapters[1].pk)
+        chapter.status = 'completed'
+        chapter.save()
+        self.assertEqual(self.counters(), (3, 2))
+        chapter.title = 'Renamed'
+        chapter.save()
+        self.assertEqual(self.counters(), (3, 2))
+        chapter.delete()
+        self.assertEqual(self.counters(), (2, 1))
+
+    def test_moving_a_chapter_updates_both_notes(self):
+        other = StudyNote.objects.create(book_title='Fluent Python', book_author='Luciano Ramalho')
+        chapter = StudyChapter.objects.get(pk=self.chapters[0].pk)
+        chapter.study_note = other
+        chapter.save()
+        self.assertEqual(self.counters(), (2, 0))
+        self.assertEqual(self.counters(other), (1, 1))
+
+    def test_saving_a_stale_note_keeps_the_counters(self):
+        stale = StudyNote.objects.get(pk=self.note.pk)
+        StudyChapter.objects.create(study_note=self.note, chapter_number=4, title='Chapter 4')
+        stale.featured = True
+        stale.save()
+        self.assertEqual(self.counters(), (4, 1))
+        self.assertTrue(self.note.featured)
+
+    def test_reconcile_repairs_bulk_writes(self):
+        StudyChapter.objects.update(status='completed')
+        self.assertEqual(reconcile_progress(), 1)
+        self.assertEqual(self.counters(), (3, 3))
+        self.assertEqual(reconcile_progress(), 0)
+        StudyNote.objects.update(total_chapters=0)
+        out = io.StringIO()
+        call_command('reconcile_study_progress', stdout=out)
+        self.assertIn('Corrected 1 study note(s)', out.getvalue())
+        self.assertEqual(self.counters(), (3, 3))
+
+    def test_seeded_chapters_are_counted(self):
+        seed([SeedSpec(StudyChapter, ('study_note', 'chapter_number'), [
+            {'study_note': self.note, 'chapter_number': 4, 'title': 'Chapter 4', 'status': 'completed'},
+        ])])
+        self.assertEqual(self.counters(), (4, 2))
+
+    def test_progress_bar_reads_no_chapters(self):
+        note = StudyNote.objects.get(pk=self.note.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(note.get_progress_percentage(), 33)
+
+
+class StudyNotePageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.notes = [
+            StudyNote.objects.create(book_title=title, book_author='Author')
+            for title in ('CPython Internals', 'Fluent Python')
+        ]
+        for note in self.notes:
+            for i in range(1, 4):
+                StudyChapter.objects.create(study_note=note, chapter_number=i, title=f'{note.book_title} {i}')
+
+    def fragment_key(self, note):
+        return make_template_fragment_key(FRAGMENT_NAME, fragment_vary_on(study_notes().get(pk=note.pk)))
+
+    def test_list_fetches_notes_and_chapters_in_two_queries(self):
+        url = reverse('portfolio:study_notes')
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertContains(response, 'Fluent Python 3')
+        with self.assertNumQueries(1):
+            self.assertContains(self.client.get(url), 'Fluent Python 3')
+
+    def test_chapter_edit_rerenders_only_its_note(self):
+        self.client.get(reverse('portfolio:study_notes'))
+        untouched = self.fragment_key(self.notes[1])
+        chapter = StudyChapter.objects.get(study_note=self.notes[0], chapter_number=2)
+        chapter.status = 'completed'
+        chapter.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('portfolio:study_notes'))
+        self.assertContains(response, '1 of 3 chapters completed')
+        self.assertEqual(self.fragment_key(self.notes[1]), untouched)
+        chapter_query = queries.captured_queries[1]['sql']
+        self.assertIn(f'IN ({self.notes[0].pk})', chapter_query)
+
+    def test_detail_page(self):
+        response = self.client.get(reverse('portfolio:study_note', args=[self.notes[1].pk]))
+        self.assertContains(response, 'Fluent Python 2')
+        self.assertNotContains(response, 'CPython Internals 1')
+        self.assertEqual(self.client.get(reverse('portfolio:study_note', args=[999])).status_code, 404)
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        Book.objects.create(title='DDIA', author='Martin Kleppmann', goodreads_url='https://example.com/ddia')
+
+    def test_off_by_default(self):
+        response = self.client.get(reverse('portfolio:books'))
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertEqual(histograms(), {})
+
+    @override_settings(REQUEST_METRICS_SAMPLE_RATE=1.0)
+    def test_sampled_requests_are_timed_per_view(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('portfolio:books'))
+        timing = response['Server-Timing']
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+        self.assertRegex(timing, r'tpl;dur=\d+\.\d, total;dur=\d+\.\d')
+        self.client.get(reverse('portfolio:books'))
+        self.client.get('/no-such-page/')
+
+        data = histograms()
+        self.assertEqual(set(data), {'portfolio:books', '<other>'})
+        self.assertEqual(sum(data['portfolio:books']['total_ms']), 2)
+        self.assertIsNotNone(percentile('queries', data['portfolio:books']['queries'], 0.5))
+
+        out = io.StringIO()
+        call_command('request_metrics', 'portfolio:books', stdout=out)
+        self.assertRegex(out.getvalue(), r'portfolio:books\s+2\s')
+        call_command('request_metrics', '--reset', stdout=io.StringIO())
+        self.assertEqual(histograms(), {})
+
+    def test_percentiles_use_bucket_upper_bounds(self):
+        counts = [0] * 11
+        counts[2], counts[10] = 9, 1
+        self.assertEqual(percentile('total_ms', counts, 0.5), 25)
+        self.assertIsNone(percentile('total_ms', counts, 0.99))
+
+
+class BenchmarkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_every_route_is_benchmarked(self):
+        self.assertEqual({route.name for route in ROUTES}, {pattern.name for pattern in urls.urlpatterns})
+
+    def test_runs_every_route_without_errors(self):
+        counts = seed_synthetic(3)
+        self.assertEqual(counts['Project'], 3)
+        self.assertEqual(StudyNote.objects.get(book_title='Study 0').total_chapters, 1)
+        report = run(ClientTransport(), requests=2, warmup=0)
+        self.assertEqual(set(report['routes']), {route.name for route in ROUTES})
+        for name, result in report['routes'].items():
+            with self.subTest(route=name):
+                self.assertEqual(result['errors'], 0, result['status'])
+                self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+        self.assertEqual(ContactMessage.objects.count(), 5)
+
+    def test_requests_must_be_positive(self):
+        with self.assertRaisesMessage(CommandError, '--requests'):
+            call_command('benchmark', requests=0, stdout=io.StringIO())
+
+    def test_offline_run_leaves_the_configured_cache_alone(self):
+        cache.set('portfolio:sentinel', 'live')
+        command = 'portfolio.management.commands.benchmark'
+        # The test runner has already set up the environment and database
+        with mock.patch(f'{command}.setup_test_environment'), mock.patch(f'{command}.teardown_test_environment'), \
+                mock.patch(f'{command}.setup_databases'), mock.patch(f'{command}.teardown_databases'):
+            call_command('benchmark', scale=1, requests=1, warmup=0, routes=['home'], stdout=io.StringIO())
+        self.assertEqual(cache.get('portfolio:sentinel'), 'live')
+
+
+class ResponsiveImageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media = Path(media.name)
+        settings_override = override_settings(MEDIA_ROOT=media.name, IMAGE_DERIVATIVE_WIDTHS=(320, 640, 1280))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (1000, 500), 'navy').save(buffer, 'JPEG')
+        self.project = Project.objects.create(
+            title='Kinesis', description='...', github_url='https://github.com/x', technologies='Python',
+            image=SimpleUploadedFile('kinesis.jpg', buffer.getvalue(), content_type='image/jpeg'),
+        )
+
+    def test_uploads_are_queued_and_served_as_originals_until_processed(self):
+        record = ResponsiveImage.objects.get()
+        self.assertEqual((record.source, record.status), (self.project.image.name, 'pending'))
+        response = self.client.get(reverse('portfolio:projects'))
+        self.assertContains(response, f'src="{self.project.image.url}"')
+        self.assertNotContains(response, '<picture>')
+
+    def test_process_images_writes_derivatives_and_srcset(self):
+        call_command('process_images', stdout=io.StringIO())
+        record = ResponsiveImage.objects.get()
+        self.assertEqual(record.status, 'ready')
+        self.assertEqual((record.width, record.height), (1000, 500))
+        self.assertEqual(record.variants['webp'], [320, 640, 1000])
+        self.assertEqual(record.variants['jpeg'], [320, 640, 1000])
+        small = self.media / derivative_name(record.source, 320, 'webp')
+        self.assertEqual(Image.open(small).size, (320, 160))
+
+        response = self.client.get(reverse('portfolio:projects'))
+        content = response.content.decode()
+        self.assertIn('<source type="image/webp"', content)
+        self.assertIn(f"{derivative_name(self.project.image.url, 640, 'webp')} 640w", content)
+        self.assertNotIn(f'"{self.project.image.url}"', content)
+
+    def test_sources_differing_only_in_extension_keep_separate_derivatives(self):
+        for ext, fmt in (('jpg', 'JPEG'), ('png', 'PNG')):
+            buffer = io.BytesIO()
+            Image.new('RGB', (400, 200), 'navy' if ext == 'jpg' else 'teal').save(buffer, fmt)
+            Project.objects.create(
+                title=ext, description='...', github_url='https://github.com/x', technologies='Python',
+                image=SimpleUploadedFile(f'same.{ext}', buffer.getvalue()),
+            )
+        call_command('process_images', stdout=io.StringIO())
+        jpg, png = (ResponsiveImage.objects.get(source=f'projects/same.{ext}') for ext in ('jpg', 'png'))
+        self.assertNotEqual(derivative_name(jpg.source, 320, 'webp'), derivative_name(png.source, 320, 'webp'))
+        for record, colour in ((jpg, (0, 0, 128)), (png, (0, 128, 128))):
+            with Image.open(self.media / derivative_name(record.source, 320, 'webp')) as image:
+                pixel = image.convert('RGB').getpixel((0, 0))
+            self.assertTrue(all(abs(a - b) < 8 for a, b in zip(pixel, colour)), pixel)
+
+    def test_processing_changes_the_etag(self):
+        for name in ('portfolio:home', 'portfolio:projects'):
+            with self.subTest(page=name):
+                etag = self.client.get(reverse(name))['ETag']
+                ResponsiveImage.objects.update(status='pending')
+                process_queued()
+                response = self.client.get(reverse(name), HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response['ETag'], etag)
+
+    def test_process_images_warns_when_web_workers_cannot_see_the_bump(self):
+        stderr = io.StringIO()
+        call_command('process_images', stdout=io.StringIO(), stderr=stderr)
+        self.assertIn('DJANGO_CACHE_URL', stderr.getvalue())
+        with mock.patch('portfolio.management.commands.process_images.process_local_cache', return_value=False):
+            stderr = io.StringIO()
+            call_command('process_images', stdout=io.StringIO(), stderr=stderr)
+        self.assertEqual(stderr.getvalue(), '')
+
+    def test_saving_without_a_new_upload_does_not_requeue(self):
+        call_command('process_images', stdout=io.StringIO())
+        self.project.title = 'Kinesis v2'
+        self.project.save()
+        self.assertEqual(ResponsiveImage.objects.get().status, 'ready')
+
+
+class StaticAssetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        static_root = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(static_root.cleanup)
+        cls.static_root = Path(static_root.name)
+        settings_override = override_settings(
+            DEBUG=False,
+            STATIC_ROOT=static_root.name,
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+            },
+        )
+        settings_override.enable()
+        cls.addClassCleanup(settings_override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def test_collectstatic_writes_hashed_and_compressed_assets(self):
+        hashed = [path for path in (self.static_root / 'css').glob('style.*.css') if path.suffix == '.css']
+        self.assertEqual(len(hashed), 1)
+        self.assertTrue(hashed[0].with_name(hashed[0].name + '.gz').exists())
+        self.assertTrue(hashed[0].with_name(hashed[0].name + '.br').exists())
+
+    def test_pages_link_hashed_assets_served_as_immutable(self):
+        content = self.client.get(reverse('portfolio:books')).content.decode()
+        stylesheet = re.search(r'href="(/static/css/style\.[0-9a-f]{12}\.css)"', content).group(1)
+        response = self.client.get(stylesheet, HTTP_ACCEPT_ENCODING='br, gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn('immutable', response['Cache-Control'])
+        response.close()
+
+
+def build_font(codepoints, wght=None):
+    """A WOFF2 font with a square glyph per code point; variable along ``wght`` if given"""
+    names = ['.notdef', *(f'uni{codepoint:04X}' for codepoint in codepoints)]
+    builder = FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(names)
+    builder.setupCharacterMap({codepoint: f'uni{codepoint:04X}' for codepoint in codepoints})
+    glyphs = {}
+    for name in names:
+        pen = TTGlyphPen(None)
+        pen.moveTo((0, 0))
+        pen.lineTo((0, 500))
+        pen.lineTo((500, 500))
+        pen.closePath()
+        glyphs[name] = pen.glyph()
+    builder.setupGlyf(glyphs)
+    builder.setupHorizontalMetrics({name: (600, 0) for name in names})
+    builder.setupHorizontalHeader(ascent=800, descent=-200)
+    builder.setupNameTable({'familyName': 'Test', 'styleName': 'Regular'})
+    builder.setupOS2()
+    builder.setupPost()
+    if wght:
+        builder.setupFvar(axes=[('wght', wght[0], 400, wght[1], 'Weight')], instances=[])
+    builder.font.flavor = 'woff2'
+    output = io.BytesIO()
+    builder.save(output)
+    return output.getvalue()
+
+
+class StaticBundleTests(TestCase):
+    def test_prune_css_keeps_only_rules_the_page_can_match(self):
+        used = scan_html(
+            '<div class="card {% if featured %}featured{% endif %} badge-{{ category }}">'
+            '<a href="#top">Top</a></div>',
+            UsedNames(),
+        )
+        css = """
+            /* layout */
+            .card, .unused { color: red; }
+            .card:hover > a[href] { content: "a  b"; }
+            .badge-fiction { animation: fade 1s; }
+            .missing a { color: blue; }
+            input[type="text"] { border: 0; }
+            @media (max-width: 600px) { .unused { display: none; } .featured { margin: 0; } }
+            @media print { .unused { display: none; } }
+            @keyframes fade { from { opacity: 0; } to { opacity: 1; } }
+            @keyframes spin { to { transform: rotate(1turn); } }
+        """
+        self.assertEqual(prune_css(css, used), (
+            '.card{color:red}.card:hover>a[href]{content:"a  b"}.badge-fiction{animation:fade 1s}'
+            '@media (max-width: 600px){.featured{margin:0}}'
+            '@keyframes fade{from{opacity:0}to{opacity:1}}'
+        ))
+
+    def test_prune_css_drops_the_rule_after_a_stray_brace_like_browsers(self):
+        self.assertEqual(prune_css('.card { color: red; } } .card { color: blue; }', scan_html(
+            '<div class="card"></div>', UsedNames())), '.card{color:red}')
+
+    def test_prune_js_keeps_sections_whose_selector_can_match(self):
+        js = (
+            'init();\n'
+            '    // @requires #contactForm\n'
+            '    sendForm();\n'
+            '    // @end\n'
+            '    // Footer year\n'
+            '    year();\n'
+        )
+        self.assertEqual(prune_js(js, scan_html('<div></div>', UsedNames())), 'init();\nyear();\n')
+        self.assertIn('sendForm();', prune_js(js, scan_html('<form id="contactForm"></form>', UsedNames())))
+
+    def test_script_sections_must_cover_the_handler_and_pair_up(self):
+        script = Path(finders.find('js/script.js')).read_text()
+        self.assertIn('#contactForm', [selector for selector, _ in script_sections(script)])
+        for js in (
+            "document.addEventListener('DOMContentLoaded', () => {\n    setUp();\n});\n",
+            "// @requires .card\ncards();\n",
+            "// @requires .card\n// @requires .modal\n// @end\n",
+            "// @end\n",
+            "// @requires\n// @end\n",
+        ):
+            with self.subTest(js=js), self.assertRaises(ValueError):
+                script_sections(js)
+
+    def test_templates_link_local_scripts_only_through_the_bundle(self):
+        templates = Path(settings.TEMPLATES[0]['DIRS'][0])
+        for path in templates.rglob('*.html'):
+            with self.subTest(template=path.name):
+                self.assertNotRegex(path.read_text(), r'<script[^>]*src="[^"]*{%\s*static')
+
+    def test_pages_link_their_bundle_once_built(self):
+        with self.built_bundles() as bundles:
+            home_js = (bundles / 'home.min.js').read_text()
+            self.assertIn('contactForm', home_js)
+            self.assertNotIn('contactForm', (bundles / 'appointments.min.js').read_text())
+            self.assertIn('.contact-form-compact', (bundles / 'home.min.css').read_text())
+            self.assertNotIn('.contact-form-compact', (bundles / 'appointments.min.css').read_text())
+            self.assertLess((bundles / 'lists.min.css').stat().st_size,
+                            (Path(__file__).resolve().parent.parent / 'static/css/style.css').stat().st_size / 2)
+
+            content = self.client.get(reverse('portfolio:papers')).content.decode()
+            self.assertIn('/static/bundles/lists.min.css', content)
+            self.assertIn('/static/bundles/lists.min.js', content)
+            content = self.client.get(reverse('portfolio:appointments')).content.decode()
+            self.assertIn('/static/bundles/appointments.min.css', content)
+            cache.clear()
+            with mock.patch.object(staticfiles_storage, 'exists') as exists:
+                self.client.get(reverse('portfolio:appointments'))
+            exists.assert_not_called()
+
+    # A stand-in for the four CDN stylesheets base.html links and their fonts
+    CDN = {
+        'https://fonts.googleapis.com/css?family=Inter:400,700&display=swap': (
+            "@font-face { font-family: 'Inter'; font-weight: 400; "
+            "src: url(https://fonts.gstatic.com/s/inter/v13/cyrillic.woff2) format('woff2'); "
+            "unicode-range: U+0301, U+0400-045F; }"
+            "@font-face { font-family: 'Inter'; font-weight: 400; "
+            "src: url(https://fonts.gstatic.com/s/inter/v13/latin.woff2) format('woff2'); "
+            "unicode-range: U+0000-00FF, U+2000-206F; }"
+            "@font-face { font-family: 'Inter'; font-weight: 700; "
+            "src: url(https://fonts.gstatic.com/s/inter/v13/latin.woff2) format('woff2'); "
+            "unicode-range: U+0000-00FF, U+2000-206F; }"
+        ),
+        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css': (
+            '@font-face{font-family:"Font Awesome 6 Brands";src:url(../webfonts/fa-brands-400.woff2) '
+            'format("woff2"),url(../webfonts/fa-brands-400.ttf) format("truetype")}'
+            '.fab{font-family:"Font Awesome 6 Brands"}.fa-github:before{content:"\\f09b"}'
+            '.fa-snapchat:before{content:"\\f2ab"}'
+        ),
+        'https://cdn.jsdelivr.net/gh/devicons/devicon@v2.15.1/devicon.min.css': (
+            '.devicon-python-plain:before{content:"\\e63c"}.devicon-cobol-plain:before{content:"\\e6a8"}'
+        ),
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css': (
+            '.container{max-width:1140px}.modal-backdrop{opacity:.5}'
+        ),
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.CDN = {
+            **cls.CDN,
+            # Inter ships one variable font per script
+            'https://fonts.gstatic.com/s/inter/v13/latin.woff2': build_font([0x41, 0x42, 0x3a9], wght=(100, 900)),
+            'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/webfonts/fa-brands-400.woff2':
+                build_font([0xf09b, 0xf2ab]),
+        }
+
+    @contextmanager
+    def built_bundles(self):
+        """Build the bundles from self.CDN into a temporary STATIC_ROOT; yields the bundle directory"""
+        cache.clear()
+        with tempfile.TemporaryDirectory() as static_root, override_settings(
+            STATIC_ROOT=static_root,
+            VENDOR_ASSET_CACHE=str(Path(static_root) / 'vendor'),
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+            },
+        ), mock.patch('portfolio.vendor_assets.download', side_effect=lambda url: (
+            self.CDN[url] if isinstance(self.CDN[url], bytes) else self.CDN[url].encode()
+        )):
+            bundles = Path(static_root) / 'bundles'
+            # Every script section is used by some page
+            with self.assertNoLogs('portfolio.bundles', 'WARNING'):
+                call_command('build_bundles', output=str(bundles), stdout=io.StringIO())
+            # Stands in for the worker restart a deploy brings
+            _is_built.cache_clear()
+            self.addCleanup(_is_built.cache_clear)
+            yield bundles
+
+    def test_build_fails_without_fonttools(self):
+        with mock.patch('portfolio.vendor_assets.font_subset', None), \
+                self.assertRaisesMessage(CommandError, 'fontTools'):
+            call_command('build_bundles', stdout=io.StringIO())
+
+    def test_pages_load_cdn_stylesheets_until_bundles_are_built(self):
+        cache.clear()
+        content = self.client.get(reverse('portfolio:papers')).content.decode()
+        self.assertIn('/static/css/style.css', content)
+        self.assertIn('https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css', content)
+
+    def test_vendor_stylesheets_are_self_hosted_and_pruned(self):
+        Skill.objects.create(name='Python', category='languages', proficiency_level=4, years_experience=5,
+                             icon_class='devicon-python-plain colored')
+        with self.built_bundles() as bundles:
+            css = (bundles / 'home.min.css').read_text()
+            self.assertIn('.fa-github:before', css)
+            self.assertIn('.devicon-python-plain:before', css)
+            self.assertIn('.container{', css)
+            self.assertIn('src:url(fonts/font-awesome/fa-brands-400.woff2) format("woff2");font-display:swap', css)
+            for unused in ('.fa-snapchat', '.devicon-cobol-plain', '.modal-backdrop', 'fa-brands-400.ttf',
+                           'fonts.googleapis.com'):
+                self.assertNotIn(unused, css)
+            with TTFont(bundles / 'fonts/font-awesome/fa-brands-400.woff2') as font:
+                self.assertEqual(set(font.getBestCmap()), {0xf09b})
+            # Latin only, and only the weights the @font-face rules declare
+            self.assertFalse((bundles / 'fonts/inter/cyrillic.woff2').exists())
+            self.assertNotIn('cyrillic', css)
+            with TTFont(bundles / 'fonts/inter/latin.woff2') as font:
+                self.assertEqual(set(font.getBestCmap()), {0x41, 0x42})
+                axis = font['fvar'].axes[0]
+                self.assertEqual((axis.minValue, axis.maxValue), (400, 700))
+
+            content = self.client.get(reverse('portfolio:papers')).content.decode()
+            self.assertNotIn('cdnjs.cloudflare.com', content)
+            self.assertNotIn('fonts.googleapis.com', content)
+            critical = re.search(r'<style>(.*?)</style>', content).group(1)
+            self.assertIn('.header{', critical)
+            self.assertIn('url(/static/bundles/fonts/inter/latin.woff2)', critical)
+            self.assertNotIn('.contact-form-compact', (bundles / 'home.critical.css').read_text())
+            self.assertIn('<link rel="preload" href="/static/bundles/lists.min.css" as="style"', content)
+
+
+class TemplateWarmupTests(TestCase):
+    def test_warmup_compiles_every_portfolio_template_into_the_cached_loader(self):
+        loader = engines['django'].engine.template_loaders[0]
+        loader.reset()
+        names = warm_templates()
+        self.assertEqual(names, list(template_names()))
+        self.assertIn('portfolio/index.html', names)
+        self.assertIn('portfolio/pagination.html', names)
+        self.assertTrue(all(name in loader.get_template_cache for name in names))
+
+
+class SettingsProfileTests(TestCase):
+    def load(self, **environ):
+        with mock.patch.dict('os.environ', environ):
+            # A fresh copy; the settings already loaded are left alone
+            return runpy.run_module('portfolio_project.settings')
+
+    def test_production_requires_a_shared_cache(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, 'DJANGO_CACHE_URL'):
+            self.load(DJANGO_ENV='production', DJANGO_CACHE_URL='')
+        caches = self.load(DJANGO_ENV='production', DJANGO_CACHE_URL='redis://cache:6379/1',
+                           DJANGO_CLIENT_IP_HEADER='X-Real-IP')['CACHES']
+        self.assertEqual(caches['default']['BACKEND'], 'django.core.cache.backends.redis.RedisCache')
+        self.assertEqual(caches['default']['LOCATION'], 'redis://cache:6379/1')
+        caches = self.load(DJANGO_ENV='production', DJANGO_CACHE_URL='memcached://cache:11211',
+                           DJANGO_CLIENT_IP_HEADER='X-Real-IP')['CACHES']
+        self.assertEqual(caches['default']['LOCATION'], 'cache:11211')
+
+    def test_production_requires_the_client_ip_header(self):
+        environ = {'DJANGO_ENV': 'production', 'DJANGO_CACHE_URL': 'redis://cache:6379/1'}
+        with self.assertRaisesMessage(ImproperlyConfigured, 'DJANGO_CLIENT_IP_HEADER'):
+            self.load(**environ, DJANGO_CLIENT_IP_HEADER='')
+        self.assertEqual(self.load(**environ, DJANGO_CLIENT_IP_HEADER='X-Real-IP')['RATE_LIMIT_IP_META'],
+                         'HTTP_X_REAL_IP')
+        self.assertEqual(self.load(**environ, DJANGO_CLIENT_IP_HEADER='REMOTE_ADDR')['RATE_LIMIT_IP_META'],
+                         'REMOTE_ADDR')
+
+    def test_development_falls_back_to_local_memory(self):
+        caches = self.load(DJANGO_ENV='development', DJANGO_CACHE_URL='')['CACHES']
+        self.assertEqual(caches['default']['BACKEND'], 'django.core.cache.backends.locmem.LocMemCache')
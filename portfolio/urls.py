@@ -6,9 +6,15 @@ app_name = 'portfolio'
 urlpatterns = [
     path('', views.home, name='home'),
     path('projects/', views.projects_list, name='projects'),
+    path('projects/technology/<slug:slug>/', views.projects_by_technology, name='projects_by_technology'),
     path('books/', views.books_list, name='books'),
     path('papers/', views.papers_list, name='papers'),
     path('blog/', views.blog_list, name='blog'),
+    path('blog/tag/<slug:slug>/', views.blog_by_tag, name='blog_by_tag'),
+    path('study-notes/', views.study_notes_list, name='study_notes'),
+    path('study-notes/<int:pk>/', views.study_note_detail, name='study_note'),
+    path('search/', views.search_page, name='search'),
+    path('api/search/', views.search_api, name='search_api'),
     path('appointments/', views.appointments, name='appointments'),
     path('appointment-submit/', views.appointment_submit, name='appointment_submit'),
     path('contact/', views.contact_submit, name='contact_submit'),
@@ -0,0 +1,186 @@
+"""
+Self-hosted copies of the third-party stylesheets base.html links.
+
+``fetch()`` downloads each stylesheet in ``VENDOR_STYLESHEETS`` into
+``VENDOR_ASSET_CACHE``, along with the one font file per ``@font-face`` that
+modern browsers need (WOFF2 where offered). It rewrites the ``src`` to point
+at the copy. This is the only step that needs the network, so the cache can
+be committed or kept between CI builds. ``build_bundles`` then prunes these
+stylesheets together with ``css/style.css`` into each page's bundle.
+
+``subset_fonts()`` cuts the icon fonts down to the glyphs the bundles still
+reference, and the text fonts down to ``TEXT_CHARSETS`` and the weights
+their ``@font-face`` rules declare. It needs fontTools, which is in
+requirements.txt; the import is deferred so the web workers don't pay for it.
+"""
+import io
+import re
+import shutil
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    from fontTools import subset as font_subset
+    from fontTools.varLib import instancer
+except ImportError:
+    font_subset = instancer = None
+
+# name -> stylesheet, in the order base.html loads them
+VENDOR_STYLESHEETS = {
+    'inter': 'https://fonts.googleapis.com/css?family=Inter:400,700&display=swap',
+    'font-awesome': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css',
+    'devicon': 'https://cdn.jsdelivr.net/gh/devicons/devicon@v2.15.1/devicon.min.css',
+    'bootstrap': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+}
+# Google Fonts serves WOFF2 only to browsers it recognises
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+              'Chrome/120.0.0.0 Safari/537.36')
+# Most compact first
+FONT_FORMATS = ('woff2', 'woff', 'truetype', 'opentype')
+FONT_DIR = 'fonts'
+
+# Printable ASCII and Latin-1, plus the typographic punctuation admin-entered
+# copy tends to contain
+LATIN = frozenset([*range(0x20, 0x7f), *range(0xa0, 0x100),
+                   0x2013, 0x2014, 0x2018, 0x2019, 0x201c, 0x201d, 0x2022, 0x2026, 0x20ac, 0x2122])
+# Text fonts, subset to a fixed character set rather than the icons in use
+TEXT_CHARSETS = {'inter': LATIN}
+
+FONT_FACE = re.compile(r'@font-face\s*{[^}]*}')
+FONT_SOURCE = re.compile(r'url\(\s*["\']?([^"\')]+)["\']?\s*\)\s*format\(\s*["\']?([\w-]+)["\']?\s*\)')
+ICON_CONTENT = re.compile(r'content:\s*["\']\\([0-9a-fA-F]{1,6})["\']')
+UNICODE_RANGE = re.compile(r'unicode-range:\s*([^;}]+)')
+FONT_WEIGHT = re.compile(r'font-weight:\s*(\d+)(?:\s+(\d+))?')
+
+
+def cache_dir():
+    return Path(settings.VENDOR_ASSET_CACHE)
+
+
+def download(url):
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def _covers(unicode_range, codepoints):
+    """Whether a unicode-range descriptor overlaps ``codepoints``"""
+    for part in unicode_range.split(','):
+        first, _, last = part.strip().upper().removeprefix('U+').partition('-')
+        if '?' in first:
+            first, last = first.replace('?', '0'), first.replace('?', 'F')
+        first = int(first, 16)
+        last = int(last, 16) if last else first
+        if any(first <= codepoint <= last for codepoint in codepoints):
+            return True
+    return False
+
+
+def _localise_font_face(name, base_url, block, root, downloaded):
+    unicode_range = UNICODE_RANGE.search(block)
+    if name in TEXT_CHARSETS and unicode_range and not _covers(unicode_range.group(1), TEXT_CHARSETS[name]):
+        # Google Fonts splits a family by script; skip the ones the site doesn't write in
+        return ''
+    sources = [(url, fmt) for url, fmt in FONT_SOURCE.findall(block) if fmt in FONT_FORMATS]
+    if not sources:
+        return block
+    url, fmt = min(sources, key=lambda source: FONT_FORMATS.index(source[1]))
+    url = urllib.parse.urljoin(base_url, url)
+    file = f'{FONT_DIR}/{name}/{Path(urllib.parse.urlsplit(url).path).name}'
+    if file not in downloaded:
+        # Google Fonts reuses one variable font file across weights
+        (root / file).parent.mkdir(parents=True, exist_ok=True)
+        (root / file).write_bytes(download(url))
+        downloaded.add(file)
+    declarations = [d for d in block[block.index('{') + 1:-1].split(';') if d.strip()
+                    and not d.strip().startswith(('src', 'font-display'))]
+    declarations += [f'src:url({file}) format("{fmt}")', 'font-display:swap']
+    return '@font-face{' + ';'.join(declarations) + '}'
+
+
+def fetch(force=False):
+    """Download the stylesheets not cached yet, with ``force`` all of them; returns the names fetched"""
+    root = cache_dir()
+    root.mkdir(parents=True, exist_ok=True)
+    fetched, downloaded = [], set()
+    for name, url in VENDOR_STYLESHEETS.items():
+        path = root / f'{name}.css'
+        if path.exists() and not force:
+            continue
+        css = FONT_FACE.sub(lambda match: _localise_font_face(name, url, match.group(), root, downloaded),
+                            download(url).decode())
+        path.write_text(css)
+        fetched.append(name)
+    return fetched
+
+
+def stylesheets():
+    """{name: css} of the cached stylesheets; fonts are referenced relative to the cache"""
+    root = cache_dir()
+    missing = [name for name in VENDOR_STYLESHEETS if not (root / f'{name}.css').exists()]
+    if missing:
+        raise FileNotFoundError(f'Vendor stylesheets not fetched: {", ".join(missing)}')
+    return {name: (root / f'{name}.css').read_text() for name in VENDOR_STYLESHEETS}
+
+
+def icon_codepoints(css):
+    """Code points of the icons ``css`` still draws with ``content: "\\f09b"``"""
+    return {int(value, 16) for value in ICON_CONTENT.findall(css)}
+
+
+def font_weights(css):
+    """(lightest, boldest) weight the ``@font-face`` rules in ``css`` declare, or None"""
+    weights = [int(weight) for block in FONT_FACE.findall(css)
+               for match in FONT_WEIGHT.findall(block) for weight in match if weight]
+    return (min(weights), max(weights)) if weights else None
+
+
+def _subset(data, codepoints, flavor, weights=None):
+    options = font_subset.Options()
+    options.flavor = flavor
+    font = font_subset.load_font(io.BytesIO(data), options)
+    if weights and 'fvar' in font:
+        # A variable font only needs the part of its weight axis the rules ask for
+        axis = next((axis for axis in font['fvar'].axes if axis.axisTag == 'wght'), None)
+        if axis is not None:
+            low, high = (min(max(weight, axis.minValue), axis.maxValue) for weight in weights)
+            font = instancer.instantiateVariableFont(font, {'wght': (low, high) if low != high else low})
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    output = io.BytesIO()
+    font_subset.save_font(font, output, options)
+    return output.getvalue()
+
+
+def subset_fonts(output_dir, codepoints):
+    """
+    Copy the cached fonts into ``output_dir``, cutting each icon font down to
+    ``codepoints[name]`` when that set is not empty, and each text font down
+    to its ``TEXT_CHARSETS`` entry and declared weights.
+
+    Returns {font file: (cached bytes, written bytes)}.
+    """
+    if font_subset is None:
+        raise ImproperlyConfigured('Font subsetting needs fontTools; pip install -r requirements.txt')
+    root, output_dir = cache_dir(), Path(output_dir)
+    shutil.rmtree(output_dir / FONT_DIR, ignore_errors=True)
+    sizes = {}
+    for name in VENDOR_STYLESHEETS:
+        wanted = TEXT_CHARSETS.get(name) or codepoints.get(name)
+        weights = font_weights((root / f'{name}.css').read_text()) if name in TEXT_CHARSETS else None
+        for path in sorted((root / FONT_DIR / name).glob('*')):
+            file = f'{FONT_DIR}/{name}/{path.name}'
+            data = path.read_bytes()
+            if wanted:
+                flavor = {'.woff2': 'woff2', '.woff': 'woff'}.get(path.suffix)
+                data = _subset(data, wanted, flavor, weights)
+            (output_dir / file).parent.mkdir(parents=True, exist_ok=True)
+            (output_dir / file).write_bytes(data)
+            sizes[file] = (path.stat().st_size, len(data))
+    return sizes
@@ -1,65 +1,75 @@
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from django.core.cache import cache
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from django.contrib import messages
-from django.core.mail import send_mail, BadHeaderError
+from django.core.mail import EmailMessage, BadHeaderError
 from django.conf import settings
 from .models import (Profile, Project, Book, Paper, BlogPost, ContactMessage, 
-                     SiteSettings, AppointmentType, Appointment, Skill)
+                     AppointmentType, Appointment, ResponsiveImage, Tag)
+from . import outbox
+from .cache import cache_page_content, conditional_page, page_cache_key
+from .homepage import HOMEPAGE_MODELS, load_homepage
+from .idempotency import idempotent
+from .pagination import KeysetPaginator
+from .ratelimit import rate_limit
+from .search import search
+from .study_notes import prefetch_uncached_chapters, study_notes
+from .tags import tags_prefetch, technologies_prefetch
 import json
 
 
+@conditional_page('home', *HOMEPAGE_MODELS, ResponsiveImage)
 def home(request):
-    """Main portfolio page"""
-    try:
-        profile = Profile.objects.first()
-    except Profile.DoesNotExist:
-        profile = None
-    
-    try:
-        site_settings = SiteSettings.objects.first()
-    except SiteSettings.DoesNotExist:
-        site_settings = None
-    
-    # Get featured and recent content
-    projects = Project.objects.filter(featured=True)[:4]
-    books = Book.objects.filter(featured=True)[:3]
-    papers = Paper.objects.filter(featured=True)[:6]
-    blog_posts = BlogPost.objects.filter(featured=True)[:3]
-    
-    # Get skills grouped by category
-    skills_by_category = {}
-    skills = Skill.objects.filter(is_featured=True).order_by('category', 'order', 'name')
-    for skill in skills:
-        category = skill.get_category_display()
-        if category not in skills_by_category:
-            skills_by_category[category] = []
-        skills_by_category[category].append(skill)
-    
-    context = {
-        'profile': profile,
-        'site_settings': site_settings,
-        'projects': projects,
-        'books': books,
-        'papers': papers,
-        'blog_posts': blog_posts,
-        'skills_by_category': skills_by_category,
-    }
-    
-    return render(request, 'portfolio/index.html', context)
+    """Main portfolio page, served from the content-versioned page cache"""
+    cacheable = request.method in ('GET', 'HEAD') and not request.GET
+    if cacheable:
+        cache_key = page_cache_key('home')
+        content = cache.get(cache_key)
+        if content is not None:
+            return HttpResponse(content)
+
+    response = render_home(request)
+    if cacheable:
+        cache_page_content(cache_key, response.content)
+    return response
 
 
+def render_home(request):
+    """Render the main portfolio page from the database"""
+    snapshot = load_homepage()
+    return render(request, 'portfolio/index.html', snapshot.as_context())
+
+
+@conditional_page('projects', Project, Tag, ResponsiveImage)
 def projects_list(request):
     """All projects page"""
-    projects = Project.objects.all()
+    projects = Project.objects.prefetch_related(technologies_prefetch())
+    projects = KeysetPaginator(projects, settings.PORTFOLIO_PAGE_SIZE).get_page(request.GET.get('cursor'))
     context = {
         'projects': projects,
+        'page': projects,
         'page_title': 'All Projects'
     }
     return render(request, 'portfolio/projects.html', context)
 
 
+@conditional_page('projects_by_technology', Project, Tag, ResponsiveImage)
+def projects_by_technology(request, slug):
+    """Projects using one technology"""
+    tag = get_object_or_404(Tag, slug=slug)
+    projects = Project.objects.filter(technology_links__tag=tag).prefetch_related(technologies_prefetch())
+    projects = KeysetPaginator(projects, settings.PORTFOLIO_PAGE_SIZE).get_page(request.GET.get('cursor'))
+    context = {
+        'projects': projects,
+        'page': projects,
+        'tag': tag,
+        'page_title': f'Projects using {tag.name}'
+    }
+    return render(request, 'portfolio/projects.html', context)
+
+
+@conditional_page('books', Book, ResponsiveImage)
 def books_list(request):
     """All books page"""
     books = Book.objects.all()
@@ -69,9 +79,11 @@ def books_list(request):
     category = request.GET.get('category')
     if category:
         books = books.filter(category=category)
+    books = KeysetPaginator(books, settings.PORTFOLIO_PAGE_SIZE).get_page(request.GET.get('cursor'))
     
     context = {
         'books': books,
+        'page': books,
         'categories': categories,
         'selected_category': category,
         'page_title': 'My Bookshelf'
@@ -79,6 +91,7 @@ def books_list(request):
     return render(request, 'portfolio/books.html', context)
 
 
+@conditional_page('papers', Paper)
 def papers_list(request):
     """All papers page"""
     papers = Paper.objects.all()
@@ -88,9 +101,11 @@ def papers_list(request):
     category = request.GET.get('category')
     if category:
         papers = papers.filter(category=category)
+    papers = KeysetPaginator(papers, settings.PORTFOLIO_PAGE_SIZE).get_page(request.GET.get('cursor'))
     
     context = {
         'papers': papers,
+        'page': papers,
         'categories': categories,
         'selected_category': category,
         'page_title': 'Research Papers'
@@ -98,16 +113,84 @@ def papers_list(request):
     return render(request, 'portfolio/papers.html', context)
 
 
+@conditional_page('blog', BlogPost, Tag, ResponsiveImage)
 def blog_list(request):
     """All blog posts page"""
-    blog_posts = BlogPost.objects.all()
+    blog_posts = BlogPost.objects.prefetch_related(tags_prefetch())
+    blog_posts = KeysetPaginator(blog_posts, settings.PORTFOLIO_PAGE_SIZE).get_page(request.GET.get('cursor'))
     context = {
         'blog_posts': blog_posts,
+        'page': blog_posts,
         'page_title': 'Blog Posts'
     }
     return render(request, 'portfolio/blog.html', context)
 
 
+@conditional_page('blog_by_tag', BlogPost, Tag, ResponsiveImage)
+def blog_by_tag(request, slug):
+    """Blog posts with one tag"""
+    tag = get_object_or_404(Tag, slug=slug)
+    blog_posts = BlogPost.objects.filter(tag_links__tag=tag).prefetch_related(tags_prefetch())
+    blog_posts = KeysetPaginator(blog_posts, settings.PORTFOLIO_PAGE_SIZE).get_page(request.GET.get('cursor'))
+    context = {
+        'blog_posts': blog_posts,
+        'page': blog_posts,
+        'tag': tag,
+        'page_title': f'Posts tagged {tag.name}'
+    }
+    return render(request, 'portfolio/blog.html', context)
+
+
+def study_notes_list(request):
+    """All study notes, each rendered from its cached fragment"""
+    context = {
+        'notes': prefetch_uncached_chapters(list(study_notes())),
+        'fragment_timeout': settings.PAGE_CACHE_TIMEOUT,
+        'page_title': 'Study Notes'
+    }
+    return render(request, 'portfolio/study_notes.html', context)
+
+
+def study_note_detail(request, pk):
+    """One study note with its chapters"""
+    note = get_object_or_404(study_notes(), pk=pk)
+    context = {
+        'note': prefetch_uncached_chapters([note])[0],
+        'fragment_timeout': settings.PAGE_CACHE_TIMEOUT,
+        'page_title': note.book_title
+    }
+    return render(request, 'portfolio/study_note.html', context)
+
+
+def search_page(request):
+    """Full-text search across projects, books, papers and blog posts"""
+    query = request.GET.get('q', '').strip()
+    context = {
+        'query': query,
+        'results': search(query, limit=settings.SEARCH_RESULTS_LIMIT) if query else [],
+        'page_title': 'Search'
+    }
+    return render(request, 'portfolio/search.html', context)
+
+
+def search_api(request):
+    """JSON search endpoint"""
+    query = request.GET.get('q', '').strip()
+    results = search(query, limit=settings.SEARCH_RESULTS_LIMIT) if query else []
+    return JsonResponse({
+        'query': query,
+        'results': [
+            {
+                'kind': document.kind,
+                'id': document.object_id,
+                'title': document.title,
+                'url': document.url,
+            }
+            for document in results
+        ],
+    })
+
+
 def appointments(request):
     """Appointments booking page"""
     try:
@@ -127,6 +210,9 @@ def appointments(request):
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@idempotent('appointment', ['appointment_type', 'client_name', 'client_email', 'client_phone',
+                            'company', 'purpose', 'preferred_date'])
+@rate_limit('appointment', email_field='client_email')
 def appointment_submit(request):
     """Handle appointment booking form submission"""
     try:
@@ -178,7 +264,7 @@ def appointment_submit(request):
             status='pending'
         )
         
-        # Send email notification
+        # Queue email notification
         try:
             # Email to you (Neha)
             email_subject = f"New Appointment Request: {appointment_type.name}"
@@ -199,12 +285,11 @@ You can manage this appointment in your admin panel.
 Appointment ID: {appointment.id}
 """
             
-            send_mail(
+            notification = EmailMessage(
                 subject=email_subject,
-                message=email_message,
+                body=email_message,
                 from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[settings.CONTACT_EMAIL],
-                fail_silently=False,
+                to=[settings.CONTACT_EMAIL],
             )
             
             # Confirmation email to client
@@ -229,21 +314,23 @@ Senior Software Engineer
 This is an automated confirmation. You can reply to this email if you have any questions.
 """
             
-            send_mail(
+            confirmation = EmailMessage(
                 subject=confirmation_subject,
-                message=confirmation_message,
+                body=confirmation_message,
                 from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[client_email],
-                fail_silently=True,
+                to=[client_email],
             )
             
+            # Both emails go out from the send_queued_mail worker
+            outbox.enqueue(notification, confirmation)
+            
             return JsonResponse({
                 'success': True,
                 'message': 'Thank you! Your appointment request has been submitted successfully. I\'ll get back to you within 24 hours to confirm the details.'
             })
             
         except Exception as e:
-            # If email fails, still save the appointment
+            # If queueing the email fails, still save the appointment
             return JsonResponse({
                 'success': True,
                 'message': 'Your appointment request has been saved. I\'ll get back to you soon to confirm the details.'
@@ -263,6 +350,8 @@ This is an automated confirmation. You can reply to this email if you have any q
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@idempotent('contact', ['sender', 'subject', 'message'])
+@rate_limit('contact', email_field='sender')
 def contact_submit(request):
     """Handle contact form submission with email sending"""
     try:
@@ -284,7 +373,7 @@ def contact_submit(request):
             message=message
         )
         
-        # Send email notification
+        # Queue email notification
         try:
             # Email to you (Neha)
             email_subject = f"Portfolio Contact: {subject}"
@@ -302,12 +391,11 @@ This message was sent from your portfolio contact form.
 You can reply directly to {sender_email}
 """
             
-            send_mail(
+            notification = EmailMessage(
                 subject=email_subject,
-                message=email_message,
+                body=email_message,
                 from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[settings.CONTACT_EMAIL],
-                fail_silently=False,
+                to=[settings.CONTACT_EMAIL],
             )
             
             # Optional: Send confirmation email to sender
@@ -325,14 +413,16 @@ Senior Software Engineer
 This is an automated confirmation. Please do not reply to this email.
 """
             
-            send_mail(
+            confirmation = EmailMessage(
                 subject=confirmation_subject,
-                message=confirmation_message,
+                body=confirmation_message,
                 from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[sender_email],
-                fail_silently=True,  # Don't fail if confirmation email fails
+                to=[sender_email],
             )
             
+            # Both emails go out from the send_queued_mail worker
+            outbox.enqueue(notification, confirmation)
+            
             return JsonResponse({
                 'success': True,
                 'message': 'Thank you! Your message has been sent successfully. I\'ll get back to you soon.'
@@ -345,7 +435,7 @@ This is an automated confirmation. Please do not reply to this email.
             }, status=400)
             
         except Exception as e:
-            # If email fails, still save the message but inform user
+            # If queueing the email fails, still save the message but inform user
             return JsonResponse({
                 'success': True,
                 'message': 'Your message has been saved. I\'ll get back to you soon.'
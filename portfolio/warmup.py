@@ -0,0 +1,54 @@
+"""
+Worker boot warmup.
+
+With the cached template loader, a worker reads and compiles each template
+the first time a request renders it, so the first hit on every page after a
+gunicorn restart pays for parsing ``index.html`` and the rest. wsgi.py calls
+``warm_up()`` outside DEBUG so that work happens while the worker boots, or
+once in the master with ``gunicorn --preload`` and is shared by every forked
+worker.
+"""
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+# Subdirectory of each TEMPLATES DIRS entry whose templates are compiled
+TEMPLATE_PREFIX = 'portfolio'
+
+
+def template_names():
+    for template_dir in settings.TEMPLATES[0]['DIRS']:
+        root = Path(template_dir)
+        for path in sorted((root / TEMPLATE_PREFIX).rglob('*.html')):
+            yield path.relative_to(root).as_posix()
+
+
+def warm_templates():
+    """Compile every portfolio template into the cached loader; returns the names compiled"""
+    engine = engines['django']
+    compiled = []
+    for name in template_names():
+        try:
+            engine.get_template(name)
+        except TemplateSyntaxError:
+            # Leave it for the request that renders it to report
+            logger.exception('Could not compile template %s', name)
+            continue
+        compiled.append(name)
+    return compiled
+
+
+def warm_up():
+    start = time.perf_counter()
+    # Importing the URLconf and building the reverse lookup is the other
+    # one-off cost of a first request
+    get_resolver().reverse_dict
+    compiled = warm_templates()
+    logger.info('Compiled %d templates in %.0f ms', len(compiled), (time.perf_counter() - start) * 1000)
+    return compiled
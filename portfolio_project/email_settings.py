@@ -8,9 +8,12 @@ DEVELOPMENT_EMAIL_CONFIG = {
     'EMAIL_BACKEND': 'django.core.mail.backends.console.EmailBackend',
 }
 
-# For production - sends real emails via Gmail SMTP
+# For production - sends real emails via Gmail SMTP, reusing warm
+# authenticated connections between sends
 PRODUCTION_EMAIL_CONFIG = {
-    'EMAIL_BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+    'EMAIL_BACKEND': 'portfolio.mail_backends.PooledSMTPEmailBackend',
+    'EMAIL_POOL_SIZE': 2,  # idle connections kept per worker process
+    'EMAIL_POOL_MAX_IDLE': 60,  # seconds before an idle connection is dropped
     'EMAIL_HOST': 'smtp.gmail.com',
     'EMAIL_PORT': 587,
     'EMAIL_USE_TLS': True,
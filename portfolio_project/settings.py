@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 from pathlib import Path
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -23,10 +25,19 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = 'django-insecure-your-secret-key-here-change-in-production'
 
+# Settings profile: 'development' (the default) or 'production'. Production
+# turns DEBUG off, serves hashed static files, keeps compiled templates in
+# memory and compiles them all when a worker boots (portfolio/warmup.py). It
+# also requires a shared cache (DJANGO_CACHE_URL) and the client address
+# header for rate limits (DJANGO_CLIENT_IP_HEADER).
+DJANGO_ENV = os.environ.get('DJANGO_ENV', 'development')
+if DJANGO_ENV not in ('development', 'production'):
+    raise ImproperlyConfigured(f"DJANGO_ENV must be 'development' or 'production', not {DJANGO_ENV!r}")
+
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = DJANGO_ENV == 'development'
 
-ALLOWED_HOSTS = ['localhost', '127.0.0.1']
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
 
 
 # Application definition
@@ -48,7 +59,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'portfolio.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -75,6 +88,17 @@ TEMPLATES = [
     },
 ]
 
+if not DEBUG:
+    # Django already wraps the default loaders in the cached loader; spelled
+    # out here so production never re-reads templates whatever the default
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
 WSGI_APPLICATION = 'portfolio_project.wsgi.application'
 
 
@@ -129,6 +153,25 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Outside DEBUG, collectstatic names every file by its content hash, rewrites
+# the references between them and writes .gz / .br siblings. WhiteNoise
+# serves the hashed names with a one-year immutable Cache-Control, so repeat
+# visits never re-request CSS or JS.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': ('django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+                    else 'whitenoise.storage.CompressedManifestStaticFilesStorage'),
+    },
+}
+
+# Output directory of the build_static command
+STATIC_SITE_ROOT = BASE_DIR / 'static_site'
+
+# Downloaded copies of the CDN stylesheets and fonts that build_bundles
+# self-hosts; keep it between builds so only the first one needs the network
+VENDOR_ASSET_CACHE = BASE_DIR / 'vendor_assets'
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -138,6 +181,88 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The content version, the rendered pages, their validators and the rate
+# limit counters all live here, and every process must share them: a version
+# bumped by an admin save in one gunicorn worker, or by process_images or
+# build_bundles, has to reach the others. DJANGO_CACHE_URL selects the backend:
+#   redis://host:6379/0       Redis (needs the redis package)
+#   memcached://host:11211    Memcached (needs pymemcache)
+#   db://portfolio_cache      a database table (run createcachetable first)
+# Without it only development falls back to per-process local memory.
+CACHE_URL = os.environ.get('DJANGO_CACHE_URL', '')
+CACHE_SCHEME, _, CACHE_LOCATION = CACHE_URL.partition('://')
+CACHE_BACKENDS = {
+    'redis': ('django.core.cache.backends.redis.RedisCache', CACHE_URL),
+    'rediss': ('django.core.cache.backends.redis.RedisCache', CACHE_URL),
+    'memcached': ('django.core.cache.backends.memcached.PyMemcacheCache', CACHE_LOCATION),
+    'db': ('django.core.cache.backends.db.DatabaseCache', CACHE_LOCATION),
+}
+if CACHE_URL:
+    if CACHE_SCHEME not in CACHE_BACKENDS or not CACHE_LOCATION:
+        raise ImproperlyConfigured(f'DJANGO_CACHE_URL must be redis://, memcached:// or db://, not {CACHE_URL!r}')
+    CACHE_BACKEND, CACHE_LOCATION = CACHE_BACKENDS[CACHE_SCHEME]
+elif DEBUG:
+    CACHE_BACKEND, CACHE_LOCATION = 'django.core.cache.backends.locmem.LocMemCache', 'portfolio'
+else:
+    raise ImproperlyConfigured('Set DJANGO_CACHE_URL to a cache shared by every process outside development')
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': CACHE_LOCATION,
+    }
+}
+
+# Rendered public pages are keyed by content version, so this timeout only
+# bounds memory use; with a shared cache, edits invalidate cached pages in
+# every process immediately.
+PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Rows per page on the public list pages (projects, books, papers, blog)
+PORTFOLIO_PAGE_SIZE = 12
+
+# Maximum number of hits returned by /search/ and /api/search/
+SEARCH_RESULTS_LIMIT = 20
+
+# Form submission limits, as {endpoint: {key: (max requests, window in seconds)}}.
+# 'ip' counts per client address, 'email' per submitted email address.
+RATE_LIMITS = {
+    'contact': {'ip': (5, 60 * 10), 'email': (3, 60 * 60)},
+    'appointment': {'ip': (5, 60 * 10), 'email': (3, 60 * 60)},
+}
+
+# request.META key holding the client address, from DJANGO_CLIENT_IP_HEADER:
+# a header the proxy sets, such as X-Real-IP (nginx: proxy_set_header X-Real-IP
+# $remote_addr), or REMOTE_ADDR when nothing sits in front of Django. Behind a
+# proxy REMOTE_ADDR is the proxy for every visitor, so production has to say
+# which one applies. With X-Forwarded-For only the last entry, the one the
+# proxy appended, is trusted.
+CLIENT_IP_HEADER = os.environ.get('DJANGO_CLIENT_IP_HEADER', 'REMOTE_ADDR' if DEBUG else '')
+if not CLIENT_IP_HEADER:
+    raise ImproperlyConfigured('Set DJANGO_CLIENT_IP_HEADER to the header your proxy puts the client address '
+                               'in, or to REMOTE_ADDR without a proxy')
+if CLIENT_IP_HEADER == 'REMOTE_ADDR':
+    RATE_LIMIT_IP_META = CLIENT_IP_HEADER
+else:
+    RATE_LIMIT_IP_META = 'HTTP_' + CLIENT_IP_HEADER.upper().replace('-', '_')
+
+# Repeated form submissions replay the first response. Without an
+# Idempotency-Key header, identical content within this many seconds counts
+# as a repeat; header keys are remembered for IDEMPOTENCY_KEY_TTL seconds.
+IDEMPOTENCY_WINDOW = 60 * 10
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24
+
+# Fraction of requests timed by portfolio.metrics.RequestMetricsMiddleware
+# (Server-Timing header plus per-view histograms; `manage.py request_metrics`).
+# 0 disables it entirely.
+REQUEST_METRICS_SAMPLE_RATE = 0.0
+
+# Uploaded images get WebP/AVIF/JPEG copies at these widths (`manage.py process_images`)
+IMAGE_DERIVATIVE_WIDTHS = (320, 640, 960, 1280, 1920)
+IMAGE_DERIVATIVE_QUALITY = 80
+
 # Crispy Forms
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
@@ -155,7 +280,15 @@ EMAIL_PORT = EMAIL_CONFIG.get('EMAIL_PORT', 587)
 EMAIL_USE_TLS = EMAIL_CONFIG.get('EMAIL_USE_TLS', True)
 EMAIL_HOST_USER = EMAIL_CONFIG.get('EMAIL_HOST_USER', 'nehapandey408@gmail.com')
 EMAIL_HOST_PASSWORD = EMAIL_CONFIG.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_POOL_SIZE = EMAIL_CONFIG.get('EMAIL_POOL_SIZE', 2)
+EMAIL_POOL_MAX_IDLE = EMAIL_CONFIG.get('EMAIL_POOL_MAX_IDLE', 60)
 
 # Contact form settings
 CONTACT_EMAIL = EMAIL_CONFIG.get('CONTACT_EMAIL', 'nehapandey408@gmail.com')
-DEFAULT_FROM_EMAIL = EMAIL_CONFIG.get('DEFAULT_FROM_EMAIL', 'nehapandey408@gmail.com')
\ No newline at end of file
+DEFAULT_FROM_EMAIL = EMAIL_CONFIG.get('DEFAULT_FROM_EMAIL', 'nehapandey408@gmail.com')
+
+# Outbound email queue (drained by `python manage.py send_queued_mail`)
+EMAIL_OUTBOX_MAX_ATTEMPTS = 6
+EMAIL_OUTBOX_RETRY_DELAY = 60  # seconds before the first retry, doubled after each failure
+EMAIL_OUTBOX_MAX_RETRY_DELAY = 60 * 60
+EMAIL_OUTBOX_LEASE = 5 * 60  # seconds a worker holds a claimed message
\ No newline at end of file
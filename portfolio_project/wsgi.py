@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_project.settings')
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if not settings.DEBUG:
+    # Compile the templates now instead of on each page's first request
+    from portfolio.warmup import warm_up  # noqa: E402
+
+    warm_up()
@@ -1,7 +1,10 @@
 #!/usr/bin/env python
 """
 Comprehensive data seeding script for portfolio
-Run this after setting up the database to populate with sample data
+Run this after setting up the database to populate with sample data.
+
+Rows that already exist are left alone so admin edits survive deploys;
+pass --sync to reset every seeded field to the values below.
 """
 import os
 import sys
@@ -16,31 +19,28 @@ from portfolio.models import (
     Profile, Skill, AppointmentType, Project, Book, Paper, 
     BlogPost, SiteSettings, StudyNote, StudyChapter
 )
+from portfolio.seeding import SeedSpec, seed
 
 def create_profile():
-    """Create or update profile"""
-    profile, created = Profile.objects.get_or_create(
-        name="Neha Pandey",
-        defaults={
-            'title': "Senior Software Engineer",
-            'bio': """Senior Software Engineer with 5+ years of experience designing and delivering scalable backend systems and cloud-native architectures. Proven expertise in building secure APIs, optimizing distributed systems, and leading teams to deliver high-impact solutions.
+    """Profile"""
+    return SeedSpec(Profile, ('name',), [{
+        'name': "Neha Pandey",
+        'title': "Senior Software Engineer",
+        'bio': """Senior Software Engineer with 5+ years of experience designing and delivering scalable backend systems and cloud-native architectures. Proven expertise in building secure APIs, optimizing distributed systems, and leading teams to deliver high-impact solutions.
 
 Passionate about system design, performance optimization, and mentoring the next generation of engineers. I love diving deep into technical papers, exploring new technologies, and sharing insights through writing and speaking.""",
-            'email': 'nehapandey408@gmail.com',
-            'github_url': 'https://github.com/Pneha1234',
-            'linkedin_url': 'https://www.linkedin.com/in/neha-pandey-profile/',
-            'medium_url': 'https://medium.com/@nehapandey408',
-            'newsletter_url': 'https://www.linkedin.com/newsletters/7338893393860657152/',
-            'newsletter_title': 'Tech Insights Weekly',
-            'newsletter_description': 'Weekly deep dives into software engineering, system design patterns, and career growth strategies. Join 500+ tech professionals staying ahead of industry trends.',
-            'calendly_url': 'https://calendly.com/nehapandey408',
-        }
-    )
-    print(f"{'Created' if created else 'Updated'} profile: {profile.name}")
-    return profile
+        'email': 'nehapandey408@gmail.com',
+        'github_url': 'https://github.com/Pneha1234',
+        'linkedin_url': 'https://www.linkedin.com/in/neha-pandey-profile/',
+        'medium_url': 'https://medium.com/@nehapandey408',
+        'newsletter_url': 'https://www.linkedin.com/newsletters/7338893393860657152/',
+        'newsletter_title': 'Tech Insights Weekly',
+        'newsletter_description': 'Weekly deep dives into software engineering, system design patterns, and career growth strategies. Join 500+ tech professionals staying ahead of industry trends.',
+        'calendly_url': 'https://calendly.com/nehapandey408',
+    }])
 
 def create_skills():
-    """Create technical skills with icons"""
+    """Technical skills with icons"""
     skills_data = [
         # Programming Languages
         {'name': 'Python', 'category': 'languages', 'icon_class': 'devicon-python-plain', 'proficiency_level': 4, 'years_experience': 5, 'order': 1},
@@ -78,20 +78,10 @@ def create_skills():
         {'name': 'GraphQL', 'category': 'tools', 'icon_class': 'devicon-graphql-plain', 'proficiency_level': 2, 'years_experience': 1, 'order': 4},
     ]
     
-    created_count = 0
-    for skill_data in skills_data:
-        skill, created = Skill.objects.get_or_create(
-            name=skill_data['name'],
-            category=skill_data['category'],
-            defaults=skill_data
-        )
-        if created:
-            created_count += 1
-    
-    print(f"Created {created_count} skills, total: {Skill.objects.count()}")
+    return SeedSpec(Skill, ('name', 'category'), skills_data)
 
 def create_appointment_types():
-    """Create appointment types"""
+    """Appointment types"""
     appointment_types = [
         {
             'name': 'Technical Consultation',
@@ -135,19 +125,10 @@ def create_appointment_types():
         }
     ]
     
-    created_count = 0
-    for apt_data in appointment_types:
-        apt_type, created = AppointmentType.objects.get_or_create(
-            name=apt_data['name'],
-            defaults=apt_data
-        )
-        if created:
-            created_count += 1
-    
-    print(f"Created {created_count} appointment types, total: {AppointmentType.objects.count()}")
+    return SeedSpec(AppointmentType, ('name',), appointment_types)
 
 def create_projects():
-    """Create sample projects"""
+    """Sample projects"""
     projects = [
         {
             'title': 'AWS Kinesis Data Tools',
@@ -183,19 +164,10 @@ def create_projects():
         }
     ]
     
-    created_count = 0
-    for project_data in projects:
-        project, created = Project.objects.get_or_create(
-            title=project_data['title'],
-            defaults=project_data
-        )
-        if created:
-            created_count += 1
-    
-    print(f"Created {created_count} projects, total: {Project.objects.count()}")
+    return SeedSpec(Project, ('title',), projects)
 
 def create_books():
-    """Create sample books"""
+    """Sample books"""
     books = [
         {
             'title': 'CPython Internals',
@@ -230,19 +202,10 @@ def create_books():
         }
     ]
     
-    created_count = 0
-    for book_data in books:
-        book, created = Book.objects.get_or_create(
-            title=book_data['title'],
-            defaults=book_data
-        )
-        if created:
-            created_count += 1
-    
-    print(f"Created {created_count} books, total: {Book.objects.count()}")
+    return SeedSpec(Book, ('title',), books)
 
 def create_papers():
-    """Create sample research papers"""
+    """Sample research papers"""
     papers = [
         {
             'title': 'Bigtable: A Distributed Storage System for Structured Data',
@@ -273,19 +236,10 @@ def create_papers():
         }
     ]
     
-    created_count = 0
-    for paper_data in papers:
-        paper, created = Paper.objects.get_or_create(
-            title=paper_data['title'],
-            defaults=paper_data
-        )
-        if created:
-            created_count += 1
-    
-    print(f"Created {created_count} papers, total: {Paper.objects.count()}")
+    return SeedSpec(Paper, ('title',), papers)
 
 def create_blog_posts():
-    """Create sample blog posts"""
+    """Sample blog posts"""
     blog_posts = [
         {
             'title': 'CPython Interpreter: From Source Code to Execution',
@@ -316,54 +270,39 @@ def create_blog_posts():
         }
     ]
     
-    created_count = 0
-    for post_data in blog_posts:
-        post, created = BlogPost.objects.get_or_create(
-            title=post_data['title'],
-            defaults=post_data
-        )
-        if created:
-            created_count += 1
-    
-    print(f"Created {created_count} blog posts, total: {BlogPost.objects.count()}")
+    return SeedSpec(BlogPost, ('title',), blog_posts)
 
 def create_site_settings():
-    """Create site settings"""
-    settings, created = SiteSettings.objects.get_or_create(
-        site_title="Neha Pandey | Senior Software Engineer",
-        defaults={
-            'meta_description': 'Senior Software Engineer with 5+ years of experience in Python, Django, AWS, and distributed systems. Passionate about system design and mentoring.',
-            'footer_text': 'Built with Django and passion for clean code.',
-            'google_analytics_id': '',  # Add your GA ID here
-        }
-    )
-    print(f"{'Created' if created else 'Updated'} site settings")
+    """Site settings"""
+    return SeedSpec(SiteSettings, ('site_title',), [{
+        'site_title': "Neha Pandey | Senior Software Engineer",
+        'meta_description': 'Senior Software Engineer with 5+ years of experience in Python, Django, AWS, and distributed systems. Passionate about system design and mentoring.',
+        'footer_text': 'Built with Django and passion for clean code.',
+        'google_analytics_id': '',  # Add your GA ID here
+    }])
 
 def main():
-    """Run all data seeding functions"""
+    """Run all data seeding in a single transaction"""
+    sync = '--sync' in sys.argv[1:]
     print("🌱 Starting data seeding...")
     print("=" * 50)
     
-    create_profile()
-    create_skills()
-    create_appointment_types()
-    create_projects()
-    create_books()
-    create_papers()
-    create_blog_posts()
-    create_site_settings()
+    results = seed([
+        create_profile(),
+        create_skills(),
+        create_appointment_types(),
+        create_projects(),
+        create_books(),
+        create_papers(),
+        create_blog_posts(),
+        create_site_settings(),
+    ], sync=sync)
     
     print("=" * 50)
     print("✅ Data seeding completed successfully!")
     print("\n📊 Summary:")
-    print(f"   • Profile: {Profile.objects.count()}")
-    print(f"   • Skills: {Skill.objects.count()}")
-    print(f"   • Appointment Types: {AppointmentType.objects.count()}")
-    print(f"   • Projects: {Project.objects.count()}")
-    print(f"   • Books: {Book.objects.count()}")
-    print(f"   • Papers: {Paper.objects.count()}")
-    print(f"   • Blog Posts: {BlogPost.objects.count()}")
-    print(f"   • Site Settings: {SiteSettings.objects.count()}")
+    for result in results:
+        print(f"   • {result.label.title()}: {len(result.created)} created, {len(result.updated)} updated")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
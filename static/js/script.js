@@ -1,5 +1,6 @@
 document.addEventListener('DOMContentLoaded', () => {
     // Smooth scrolling for navigation links
+    // @requires a[href]
     document.querySelectorAll('a[href^="#"]').forEach(anchor => {
         anchor.addEventListener('click', function (e) {
             e.preventDefault();
@@ -10,13 +11,18 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     });
     
+    // @end
+
     // Update current year in footer
+    // @requires #current-year
     const currentYearElement = document.getElementById('current-year');
     if (currentYearElement) {
         currentYearElement.textContent = new Date().getFullYear();
     }
-    
+    // @end
+
     // Contact form handler
+    // @requires #contactForm
     const contactForm = document.getElementById('contactForm');
     if (contactForm) {
         contactForm.addEventListener('submit', function(e) {
@@ -76,17 +82,10 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
     
-    // Mobile menu toggle (if needed)
-    const mobileMenuToggle = document.querySelector('.mobile-menu-toggle');
-    const mainNav = document.querySelector('.main-nav');
-    
-    if (mobileMenuToggle && mainNav) {
-        mobileMenuToggle.addEventListener('click', function() {
-            mainNav.classList.toggle('mobile-nav-open');
-        });
-    }
-    
+    // @end
+
     // Add loading animation for images
+    // @requires img
     const images = document.querySelectorAll('img');
     images.forEach(img => {
         img.addEventListener('load', function() {
@@ -99,23 +98,5 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     });
     
-    // Lazy loading for images (simple implementation)
-    if ('IntersectionObserver' in window) {
-        const imageObserver = new IntersectionObserver((entries, observer) => {
-            entries.forEach(entry => {
-                if (entry.isIntersecting) {
-                    const img = entry.target;
-                    if (img.dataset.src) {
-                        img.src = img.dataset.src;
-                        img.removeAttribute('data-src');
-                        observer.unobserve(img);
-                    }
-                }
-            });
-        });
-        
-        document.querySelectorAll('img[data-src]').forEach(img => {
-            imageObserver.observe(img);
-        });
-    }
+    // @end
 });
\ No newline at end of file